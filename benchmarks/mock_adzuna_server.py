@@ -0,0 +1,150 @@
+"""
+Servidor HTTP local que imita la API de búsqueda de Adzuna
+
+Sirve páginas sintéticas generadas con ``synthetic_data`` con latencia configurable
+e inyección de respuestas 429, para medir el scraper sin consumir cuota de la API.
+
+Uso independiente:
+    python benchmarks/mock_adzuna_server.py --port 8765 --latency-ms 80 --error-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from synthetic_data import generate_page
+
+SEARCH_PATH = re.compile(r'/(?P<country>[a-z]{2})/search/(?P<page>\d+)$')
+
+
+class MockAdzunaServer:
+    """Servidor mock de Adzuna ejecutándose en un hilo en segundo plano"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, error_rate: float = 0.0, retry_after: float = 0.0,
+                 pool_size: int = 10_000, results_per_query: int = 250, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.pool_size = pool_size
+        self.results_per_query = results_per_query
+        self.seed = seed
+        self.requests_served = 0
+        self.errors_injected = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """URL base para ``ADZUNA_BASE_URL``"""
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/v1/api/jobs'
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                match = SEARCH_PATH.search(parsed.path)
+                if not match:
+                    self._send(404, {'exception': 'NOT_FOUND'})
+                    return
+
+                delay, inject_error = server._next_behaviour()
+                if delay:
+                    time.sleep(delay)
+
+                if inject_error:
+                    self._send(429, {'exception': 'RATE_LIMITED'},
+                               headers={'Retry-After': str(server.retry_after)})
+                    return
+
+                params = parse_qs(parsed.query)
+                page = generate_page(
+                    what=params.get('what', [''])[0],
+                    where=params.get('where', [''])[0],
+                    page=int(match.group('page')),
+                    results_per_page=int(params.get('results_per_page', ['50'])[0]),
+                    pool_size=server.pool_size,
+                    results_per_query=server.results_per_query,
+                    seed=server.seed,
+                )
+                self._send(200, page)
+
+            def _send(self, status, payload, headers=None):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _next_behaviour(self):
+        with self._lock:
+            self.requests_served += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            inject_error = self._rng.random() < self.error_rate
+            if inject_error:
+                self.errors_injected += 1
+        return delay, inject_error
+
+    def start(self) -> 'MockAdzunaServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor mock de la API de Adzuna')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probabilidad de responder 429')
+    parser.add_argument('--pool-size', type=int, default=10_000)
+    parser.add_argument('--results-per-query', type=int, default=250)
+    args = parser.parse_args()
+
+    server = MockAdzunaServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                              pool_size=args.pool_size, results_per_query=args.results_per_query)
+    print(f"🧪 Mock de Adzuna escuchando en {server.base_url}")
+    print(f"💡 Usar con: ADZUNA_BASE_URL={server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server._httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
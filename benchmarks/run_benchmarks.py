@@ -0,0 +1,229 @@
+"""
+Suite de benchmarks del scraper y del pipeline de procesamiento
+
+Genera empleos sintéticos con el formato de Adzuna, levanta un servidor mock local
+y mide el rendimiento de:
+    - AdzunaJobScraper.scrape_big_tech_jobs_jalisco (contra el mock)
+    - AdzunaJobScraper.extract_job_details
+    - JobDataProcessor.clean_data
+    - JobDataProcessor.prepare_for_modeling
+    - JobDataProcessor.create_time_series_set (frecuencias y dimensiones de config.py)
+
+Uso:
+    python benchmarks/run_benchmarks.py --jobs 100000
+    python benchmarks/run_benchmarks.py --jobs 100000 --save-baseline
+    python benchmarks/run_benchmarks.py --jobs 100000 --latency-ms 50 --error-rate 0.05
+    python benchmarks/run_benchmarks.py --jobs 5000000 --chunk-size 200000
+
+Los empleos sintéticos se generan y procesan por bloques de ``--chunk-size`` para que la
+memoria no crezca con ``--jobs``; los tiempos de cada etapa se suman entre bloques.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCHMARK_DIR)
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+sys.path.insert(0, BENCHMARK_DIR)
+sys.path.insert(0, os.path.join(PROJECT_DIR, 'src'))
+
+from synthetic_data import generate_jobs
+from mock_adzuna_server import MockAdzunaServer
+
+
+def configure_environment(base_url: str, work_dir: str):
+    """Configura el entorno antes de importar los módulos del proyecto (config.py lee el entorno al importarse)"""
+    os.environ['ADZUNA_BASE_URL'] = base_url
+    os.environ['DELAY_BETWEEN_REQUESTS'] = '0'
+    os.environ['MAX_REQUESTS_PER_MINUTE'] = str(10 ** 9)
+    os.environ['QUERY_STATS_FILE'] = os.path.join(work_dir, 'query_stats.json')
+    os.environ['DATA_OUTPUT_DIR'] = os.path.join(work_dir, 'raw')
+    os.environ['PROCESSED_DATA_DIR'] = os.path.join(work_dir, 'processed')
+
+
+class StageTotals:
+    """Acumula tiempo y filas de cada etapa a lo largo de los bloques"""
+
+    def __init__(self):
+        self.totals = {}
+
+    def timed(self, name: str, rows: int, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        total = self.totals.setdefault(name, {'seconds': 0.0, 'rows': 0, 'chunks': 0})
+        total['seconds'] += time.perf_counter() - start
+        total['rows'] += rows
+        total['chunks'] += 1
+        return result
+
+    def report(self) -> dict:
+        results = {}
+        for name, total in self.totals.items():
+            seconds = total['seconds']
+            results[name] = {**total, 'rows_per_second': total['rows'] / seconds if seconds > 0 else None}
+            print(f"   ⏱️  {name}: {seconds:.3f}s ({results[name]['rows_per_second'] or 0:,.0f} filas/s)")
+        return results
+
+
+def benchmark_scraper(server: MockAdzunaServer) -> dict:
+    from scraper import AdzunaJobScraper
+    from query_planner import QueryPlanner
+
+    scraper = AdzunaJobScraper(planner=QueryPlanner(min_runs=10 ** 9))
+    start = time.perf_counter()
+    df = scraper.scrape_big_tech_jobs_jalisco()
+    seconds = time.perf_counter() - start
+
+    report = {
+        'seconds': seconds,
+        'rows': len(df),
+        'rows_per_second': len(df) / seconds if seconds > 0 else None,
+        'requests': scraper.total_requests,
+        'requests_per_second': scraper.total_requests / seconds if seconds > 0 else None,
+        'unique_jobs_per_request': len(df) / scraper.total_requests if scraper.total_requests else 0,
+        'errors_injected': server.errors_injected,
+    }
+    print(f"   ⏱️  scraper: {seconds:.3f}s, {scraper.total_requests} requests, "
+          f"{len(df)} empleos únicos ({report['requests_per_second'] or 0:,.1f} req/s)")
+    return report
+
+
+def run(args) -> dict:
+    results = {}
+
+    with tempfile.TemporaryDirectory() as work_dir, \
+            MockAdzunaServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                             error_rate=args.error_rate, pool_size=max(args.jobs, 1000),
+                             results_per_query=args.results_per_query) as server:
+        configure_environment(server.base_url, work_dir)
+
+        import pandas as pd
+        from scraper import AdzunaJobScraper
+        from data_processor import JobDataProcessor
+        from config import TIME_SERIES_FREQUENCIES, TIME_SERIES_DIMENSIONS
+
+        if not args.skip_scraper:
+            print("\n📡 Scraper contra servidor mock...")
+            results['scraper'] = benchmark_scraper(server)
+
+        print(f"\n🧪 Procesando {args.jobs:,} empleos sintéticos en bloques de {args.chunk_size:,}...")
+        stages = StageTotals()
+        extractor = AdzunaJobScraper()
+        jobs = generate_jobs(args.jobs, seed=args.seed)
+        processed = 0
+
+        while processed < args.jobs:
+            size = min(args.chunk_size, args.jobs - processed)
+            raw_jobs = stages.timed('generate_payloads', size, list, itertools.islice(jobs, size))
+
+            rows = stages.timed('extract_job_details', len(raw_jobs),
+                                lambda: [extractor.extract_job_details(job) for job in raw_jobs])
+            del raw_jobs
+            df = pd.DataFrame(rows)
+            del rows
+
+            processor = JobDataProcessor(df)
+            stages.timed('clean_data', len(df), processor.clean_data)
+            processor.create_time_features()
+            stages.timed('prepare_for_modeling', len(df), processor.prepare_for_modeling)
+            stages.timed('create_time_series_set', len(df), processor.create_time_series_set,
+                         TIME_SERIES_FREQUENCIES, TIME_SERIES_DIMENSIONS)
+
+            processed += size
+            del df, processor
+            if args.jobs > args.chunk_size:
+                print(f"   ... {processed:,}/{args.jobs:,} empleos")
+
+        print("\n🔧 Pipeline de procesamiento (totales de todos los bloques)...")
+        results.update(stages.report())
+
+    return {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'params': vars(args),
+        'results': results,
+    }
+
+
+def compare_with_baseline(report: dict, baseline: dict, tolerance: float) -> bool:
+    """Compara el rendimiento (filas/s) con la línea base. Devuelve False si hay regresiones"""
+    print(f"\n📊 COMPARACIÓN CON LÍNEA BASE (tolerancia {tolerance:.0%})")
+    print("=" * 60)
+
+    if baseline.get('params', {}).get('jobs') != report['params']['jobs']:
+        print("⚠️  La línea base se generó con otra escala; las diferencias pueden no ser comparables")
+
+    ok = True
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or not previous.get('rows_per_second') or not current.get('rows_per_second'):
+            continue
+
+        ratio = current['rows_per_second'] / previous['rows_per_second']
+        status = '✅'
+        if ratio < 1 - tolerance:
+            status = '❌'
+            ok = False
+        print(f"   {status} {name}: {ratio:.2f}x ({previous['rows_per_second']:,.0f} -> "
+              f"{current['rows_per_second']:,.0f} filas/s)")
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks del pipeline de empleos Big Tech Jalisco')
+    parser.add_argument('--jobs', type=int, default=10_000, help='Número de empleos sintéticos (10k-10M)')
+    parser.add_argument('--chunk-size', type=int, default=100_000,
+                        help='Empleos generados y procesados por bloque (acota la memoria)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latencia simulada del mock por request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probabilidad de respuestas 429 en el mock')
+    parser.add_argument('--results-per-query', type=int, default=250,
+                        help='Resultados totales que devuelve el mock para cada consulta')
+    parser.add_argument('--skip-scraper', action='store_true', help='Omitir el benchmark del scraper')
+    parser.add_argument('--output', default=None, help='Ruta del reporte JSON de resultados')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Ruta de la línea base')
+    parser.add_argument('--save-baseline', action='store_true', help='Guardar los resultados como línea base')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Caída de rendimiento tolerada')
+    args = parser.parse_args()
+
+    print("🏁 BENCHMARKS DEL SISTEMA DE EMPLEOS BIG TECH JALISCO")
+    print("=" * 60)
+
+    report = run(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Reporte guardado: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Línea base guardada: {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare_with_baseline(report, baseline, args.tolerance):
+            print("\n❌ Se detectaron regresiones de rendimiento")
+            sys.exit(1)
+        print("\n🎉 Sin regresiones de rendimiento")
+    else:
+        print(f"\n💡 No hay línea base en {args.baseline}. Generarla con --save-baseline")
+
+
+if __name__ == '__main__':
+    main()
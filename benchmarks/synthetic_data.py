@@ -0,0 +1,139 @@
+"""
+Generador de payloads sintéticos con el formato de la API de Adzuna
+
+Los empleos se generan de forma determinista a partir de su índice dentro de un
+"pool" global, por lo que se pueden producir millones de empleos sin mantenerlos
+en memoria y distintas consultas pueden compartir empleos (solapamiento realista).
+"""
+
+import hashlib
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+COMPANIES = [
+    'Oracle', 'Intel', 'IBM', 'Microsoft', 'Google', 'Amazon', 'HP', 'Dell', 'Cisco', 'SAP',
+    'Accenture', 'Softtek', 'Wizeline', 'Globant', 'EPAM', 'Bosch', 'Continental', 'Flex',
+    'Jabil', 'Kueski', 'Konfio', 'Tata Consultancy Services', 'Capgemini', 'Encora', 'Unosquare'
+]
+
+LOCATIONS = [
+    ('Guadalajara', 20.6767, -103.3475), ('Zapopan', 20.7214, -103.3918),
+    ('Tlaquepaque', 20.6409, -103.2933), ('Tonalá', 20.6244, -103.2343),
+    ('Tlajomulco de Zúñiga', 20.4737, -103.4439), ('El Salto', 20.5193, -103.1812),
+]
+
+SENIORITY = ['Senior', 'Sr.', 'Junior', 'Jr.', 'Lead', 'Mid', 'Principal', '', '', '']
+
+ROLES = [
+    'Software Engineer', 'Data Scientist', 'Machine Learning Engineer', 'Cloud Engineer',
+    'DevOps Engineer', 'Full Stack Developer', 'Backend Developer', 'Frontend Developer',
+    'Mobile Developer', 'Data Analyst', 'Product Manager', 'Scrum Master', 'QA Engineer',
+    'Python Developer', 'Java Developer', 'JavaScript Developer', 'React Developer',
+    'Network Engineer', 'Database Administrator', 'System Administrator'
+]
+
+VOCABULARY = (
+    'python java javascript react angular node.js sql mysql postgresql aws azure gcp cloud docker '
+    'kubernetes agile scrum kanban machine learning ml ai remote remoto híbrido presencial oficina '
+    'equipo desarrollo experiencia años inglés avanzado conocimientos en sistemas distribuidos '
+    'microservicios apis rest pruebas unitarias integración continua clientes proyectos '
+    'ofrecemos prestaciones superiores a las de ley seguro de gastos médicos vales de despensa '
+    'buscamos talento apasionado por la tecnología responsabilidades incluyen diseñar implementar '
+    'mantener soluciones escalables colaborar con equipos multidisciplinarios'
+).split()
+
+CONTRACT_TYPES = ['permanent', 'contract', '']
+CONTRACT_TIMES = ['full_time', 'part_time', '']
+
+BASE_DATE = datetime(2025, 1, 1)
+
+
+def _job_rng(seed: int, index: int) -> random.Random:
+    return random.Random(seed * 1_000_003 + index)
+
+
+def _description(rng: random.Random) -> str:
+    # Longitud log-normal: la mayoría de 300-800 caracteres con cola larga (como los snippets de Adzuna)
+    target = min(int(rng.lognormvariate(6.2, 0.5)), 4000)
+    words = []
+    length = 0
+    while length < target:
+        word = rng.choice(VOCABULARY)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)
+
+
+def generate_job(index: int, seed: int = 42, days: int = 365) -> Dict:
+    """Genera un empleo con la estructura de un resultado de la API de Adzuna"""
+    rng = _job_rng(seed, index)
+    company = rng.choice(COMPANIES)
+    location, lat, lon = rng.choice(LOCATIONS)
+    title = f"{rng.choice(SENIORITY)} {rng.choice(ROLES)}".strip()
+    created = BASE_DATE + timedelta(seconds=rng.randint(0, days * 86400))
+
+    salary_min = salary_max = None
+    if rng.random() < 0.6:
+        salary_min = float(rng.randint(15, 90) * 1000)
+        salary_max = salary_min + float(rng.randint(0, 40) * 1000)
+
+    return {
+        '__CLASS__': 'Adzuna::API::Response::Job',
+        'id': str(4_000_000_000 + index),
+        'adref': hashlib.md5(f'{seed}-{index}'.encode()).hexdigest(),
+        'title': title,
+        'description': _description(rng),
+        'created': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'redirect_url': f'https://www.adzuna.com.mx/details/{4_000_000_000 + index}',
+        'company': {'__CLASS__': 'Adzuna::API::Response::Company', 'display_name': company},
+        'location': {
+            '__CLASS__': 'Adzuna::API::Response::Location',
+            'display_name': f'{location}, Jalisco',
+            'area': ['México', 'Jalisco', location],
+        },
+        'category': {'__CLASS__': 'Adzuna::API::Response::Category', 'label': 'Empleos de TI', 'tag': 'it-jobs'},
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'salary_is_predicted': '1' if salary_min is not None and rng.random() < 0.5 else '0',
+        'contract_type': rng.choice(CONTRACT_TYPES),
+        'contract_time': rng.choice(CONTRACT_TIMES),
+        'latitude': lat + rng.uniform(-0.05, 0.05),
+        'longitude': lon + rng.uniform(-0.05, 0.05),
+    }
+
+
+def generate_jobs(count: int, seed: int = 42, start: int = 0) -> Iterator[Dict]:
+    """Genera ``count`` empleos de forma perezosa"""
+    for index in range(start, start + count):
+        yield generate_job(index, seed)
+
+
+def query_window(what: str, where: str, pool_size: int, results_per_query: int) -> int:
+    """Índice inicial (estable) de la ventana del pool que devuelve una consulta.
+
+    Las ventanas de distintas consultas se solapan, simulando que Adzuna devuelve
+    los mismos empleos para búsquedas parecidas.
+    """
+    digest = hashlib.md5(f'{what.lower()}|{where.lower()}'.encode()).digest()
+    span = max(pool_size - results_per_query, 1)
+    return int.from_bytes(digest[:8], 'big') % span
+
+
+def generate_page(what: str, where: str, page: int, results_per_page: int = 50,
+                  pool_size: int = 10_000, results_per_query: int = 250, seed: int = 42) -> Dict:
+    """Genera una página de resultados de búsqueda con el formato de Adzuna"""
+    results_per_query = min(results_per_query, pool_size)
+    start = query_window(what, where, pool_size, results_per_query)
+    offset = (page - 1) * results_per_page
+    count = max(0, min(results_per_page, results_per_query - offset))
+
+    results: List[Dict] = [generate_job(start + offset + i, seed) for i in range(count)]
+    salaries = [job['salary_min'] for job in results if job['salary_min'] is not None]
+
+    return {
+        '__CLASS__': 'Adzuna::API::Response::JobSearchResults',
+        'count': results_per_query,
+        'mean': sum(salaries) / len(salaries) if salaries else 0,
+        'results': results,
+    }
@@ -1,152 +1,375 @@
 """
 Script principal para ejecutar el scraping y análisis inicial de empleos Big Tech en Jalisco
+
+Uso:
+    python main.py                      Pipeline completo (scraping, procesamiento y estadísticas)
+    python main.py scrape               Solo scraping; guarda el CSV raw
+    python main.py process [archivo]    Procesa un CSV raw (por defecto el más reciente)
+    python main.py replay [--since F]   Reprocesa las respuestas crudas archivadas sin volver a descargar
+    python main.py stats [archivo]      Estadísticas rápidas de un dataset existente
+    python main.py timeseries [archivo] --freq D W M --by total company tech
+    python main.py report [archivo]     Reporte estático de gráficas del EDA (PNG + HTML)
+    python main.py serve [--port 8000]  API HTTP local de consultas (stats, series, top, empleos)
+
+Cada subcomando importa solo los módulos que necesita, para que las invocaciones
+cortas (cron, health checks) arranquen rápido.
 """
 
+import argparse
 import os
 import sys
-import pandas as pd
-from datetime import datetime
 import logging
+from datetime import datetime
 
 # Agregar el directorio src al path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.scraper import AdzunaJobScraper
-from src.data_processor import JobDataProcessor, save_processed_data, load_and_process_data
-
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('jalisco_bigtech_analysis.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+TIME_SERIES_NAMES = {'D': 'daily', 'W': 'weekly', 'M': 'monthly', 'Q': 'quarterly', 'Y': 'yearly'}
+
+
+def setup_logging():
+    """Configura el logging de la aplicación (solo al ejecutar el CLI, no al importar)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('jalisco_bigtech_analysis.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def find_latest_file(directory: str, prefix: str = '') -> str:
+    """Devuelve el CSV más reciente de un directorio (por nombre con timestamp), o None"""
+    if not os.path.exists(directory):
+        return None
+
+    files = [f for f in os.listdir(directory) if f.endswith('.csv') and f.startswith(prefix)]
+    if not files:
+        return None
+
+    files.sort(reverse=True)
+    return os.path.join(directory, files[0])
+
+
+def scrape_data(timestamp: str, metrics):
+    """Paso 1: extrae los empleos de la API y guarda el CSV raw"""
+    from src.config import RAW_ARCHIVE_ENABLED
+    from src.scraper import AdzunaJobScraper
+
+    print("\n📡 PASO 1: Extrayendo datos de empleos...")
+    archive = None
+    if RAW_ARCHIVE_ENABLED:
+        from src.raw_archive import RawPageArchive
+        archive = RawPageArchive()
+
+    scraper = AdzunaJobScraper(metrics=metrics, archive=archive)
+    try:
+        with metrics.timer('scraping'):
+            raw_df = scraper.scrape_big_tech_jobs_jalisco()
+    finally:
+        if archive is not None:
+            archive.close()
+            logger.info(f"Archivo crudo: {archive.pages_written} páginas, "
+                        f"{archive.bytes_written / 1024:.1f} KB comprimidos en {archive.archive_dir}")
+
+    if raw_df.empty:
+        print("❌ No se pudieron extraer datos. Verifica la configuración de la API.")
+        return raw_df, None
+
+    # Guardar datos raw
+    raw_filename = f"jalisco_bigtech_jobs_raw_{timestamp}.csv"
+    raw_filepath = scraper.save_data(raw_df, raw_filename)
+
+    print(f"✅ Datos extraídos exitosamente: {len(raw_df)} empleos")
+    update_lifecycle(raw_df, metrics, crawled_queries=scraper.completed_queries)
+    return raw_df, raw_filepath
+
+
+def update_lifecycle(raw_df, metrics, crawled_queries=None):
+    """Compara el crawl con el anterior y actualiza la tabla de ciclo de vida de las vacantes.
+
+    ``crawled_queries`` son las consultas que agotaron sus resultados; las vacantes de
+    consultas omitidas, cortadas o con más páginas por recorrer no cuentan como ausentes.
+    """
+    from src.config import LIFECYCLE_ENABLED, LIFECYCLE_FILE
+    if not LIFECYCLE_ENABLED:
+        return None
+
+    from src.lifecycle import PostingLifecycle
+
+    lifecycle = PostingLifecycle.load(LIFECYCLE_FILE)
+    with metrics.timer('lifecycle_diff', rows=len(raw_df)):
+        summary = lifecycle.update_from_dataframe(raw_df, crawled_queries)
+    for key in ('new', 'reopened', 'closed', 'unverified'):
+        metrics.increment(f'postings_{key}_total', summary[key])
+    lifecycle.save(LIFECYCLE_FILE)
+
+    print(f"🔁 Ciclo de vida: {summary['new']} vacantes nuevas, {summary['closed']} cerradas, "
+          f"{summary['reopened']} reabiertas ({summary['open']} abiertas)")
+    return lifecycle
+
+
+def load_lifecycle():
+    """Tabla de ciclo de vida guardada, o None si está deshabilitada o aún no existe"""
+    from src.config import LIFECYCLE_ENABLED, LIFECYCLE_FILE
+    if not LIFECYCLE_ENABLED or not os.path.exists(LIFECYCLE_FILE):
+        return None
+
+    from src.lifecycle import PostingLifecycle
+    return PostingLifecycle.load(LIFECYCLE_FILE)
+
+
+def print_time_to_fill(lifecycle):
+    """Muestra el tiempo que las vacantes permanecieron publicadas"""
+    stats = lifecycle.time_to_fill()
+    print(f"\n⏳ CICLO DE VIDA DE LAS VACANTES:")
+    print(f"   📌 Vacantes rastreadas: {stats['tracked_postings']:,} "
+          f"({stats['open_postings']:,} abiertas, {stats['closed_postings']:,} cerradas)")
+    if stats['closed_postings']:
+        print(f"   ⏱️  Tiempo publicado: promedio {stats['mean_days']:.1f} días, "
+              f"mediana {stats['median_days']:.1f}, p90 {stats['p90_days']:.1f}")
+
+
+def process_data(raw_df, timestamp: str, metrics, cleaned: bool = False):
+    """Paso 2: limpia los datos, crea características y guarda los datasets procesados.
+
+    Con ``cleaned`` los datos ya pasaron por la limpieza y las características temporales
+    (``replay`` las calcula en los procesos que leen cada segmento).
+    """
+    from src.data_processor import JobDataProcessor, save_processed_data
+
+    print("\n🔧 PASO 2: Procesando y limpiando datos...")
+    processor = JobDataProcessor(raw_df, metrics=metrics)
+
+    if cleaned:
+        processed_df = processor.df
+    else:
+        # Limpiar datos
+        processor.clean_data()
+
+        # Crear características temporales
+        processed_df = processor.create_time_features()
+
+    # Preparar para modelado
+    model_ready_df, encoders = processor.prepare_for_modeling()
+
+    # Guardar datos procesados
+    processed_filename = f"jalisco_bigtech_jobs_processed_{timestamp}.csv"
+    processed_filepath = save_processed_data(processed_df, processed_filename, metrics=metrics)
+
+    model_ready_filename = f"jalisco_bigtech_jobs_model_ready_{timestamp}.csv"
+    model_ready_filepath = save_processed_data(model_ready_df, model_ready_filename, metrics=metrics)
+
+    # Características de texto dispersas junto al dataset procesado
+    from src.config import TEXT_FEATURES_ENABLED, TEXT_FEATURES_USE_IDF, TEXT_IDF_FILE
+    if TEXT_FEATURES_ENABLED:
+        from src.text_features import save_text_features
+
+        text_matrix = processor.extract_text_features(use_idf=TEXT_FEATURES_USE_IDF, idf_file=TEXT_IDF_FILE)
+        save_text_features(text_matrix, processed_df['id'], f"jalisco_bigtech_text_features_{timestamp}.npz",
+                           os.path.dirname(processed_filepath))
+        update_similarity_index(processor, text_matrix, metrics)
+
+    # Acumular estadísticas entre ejecuciones
+    update_running_stats(processor)
+
+    print(f"✅ Datos procesados exitosamente")
+    return processor, processed_filepath, model_ready_filepath
+
+
+def update_similarity_index(processor, text_matrix, metrics):
+    """Inserta los empleos nuevos en el índice persistente de empleos similares"""
+    from src.config import SIMILARITY_INDEX_ENABLED, SIMILARITY_INDEX_FILE, SIMILARITY_TABLES, SIMILARITY_BITS
+    if not SIMILARITY_INDEX_ENABLED:
+        return None
+
+    from src.similarity_index import JobSimilarityIndex
+
+    vectors = processor.build_job_vectors(text_matrix)
+    index = None
+    if os.path.exists(SIMILARITY_INDEX_FILE):
+        index = JobSimilarityIndex.load(SIMILARITY_INDEX_FILE)
+        if index.dim != vectors.shape[1]:
+            logger.warning("Las características cambiaron; se reconstruye el índice de similitud")
+            index = None
+        elif (index.n_tables, index.n_bits) != (SIMILARITY_TABLES, SIMILARITY_BITS):
+            logger.info(f"Configuración del LSH cambiada ({index.n_tables}x{index.n_bits} -> "
+                        f"{SIMILARITY_TABLES}x{SIMILARITY_BITS}); se recalculan las tablas hash")
+            index = index.rehash(SIMILARITY_TABLES, SIMILARITY_BITS)
+    if index is None:
+        index = JobSimilarityIndex(vectors.shape[1])
+
+    with metrics.timer('similarity_index_insert', rows=len(vectors)):
+        added = index.add(processor.df['id'], vectors)
+    logger.info(f"Índice de similitud: {added} empleos nuevos, {len(index)} en total")
+
+    for key, value in index.evaluate().items():
+        metrics.set_gauge(f'similarity_{key}', value)
+    index.save(SIMILARITY_INDEX_FILE)
+    return index
+
+
+def update_running_stats(processor):
+    """Agrega el lote procesado a las estadísticas acumuladas entre ejecuciones"""
+    from src.config import STATS_SKETCH_FILE
+    from src.sketches import SummaryStatsAccumulator
+
+    accumulator = SummaryStatsAccumulator.load(STATS_SKETCH_FILE)
+    processor.update_summary_sketch(accumulator)
+    accumulator.save(STATS_SKETCH_FILE)
+    return accumulator
+
+
+def print_summary(stats: dict, processed_df=None):
+    """Paso 3: muestra el resumen estadístico del dataset"""
+    print("\n" + "="*60)
+    print("📈 RESUMEN ESTADÍSTICO DEL DATASET")
+    print("="*60)
+    print(f"📊 Total de empleos analizados: {stats['total_jobs']:,}")
+    if 'unique_jobs' in stats:
+        print(f"🆔 Empleos únicos (aprox.): {stats['unique_jobs']:,}")
+    print(f"🏢 Empresas únicas: {stats['unique_companies']:,}")
+    print(f"🌍 Ubicaciones únicas: {stats['unique_locations']:,}")
+    print(f"🏆 Empleos Big Tech: {stats['big_tech_jobs']:,} ({stats['big_tech_percentage']:.1f}%)")
+    print(f"💰 Empleos con información salarial: {stats['jobs_with_salary']:,}")
+
+    if stats['avg_salary'] > 0:
+        print(f"💵 Salario promedio: ${stats['avg_salary']:,.0f}")
+        print(f"💵 Salario mediano: ${stats['median_salary']:,.0f}")
+
+    if stats.get('salary_quantiles'):
+        quantiles = ', '.join(f"p{int(q * 100)}=${value:,.0f}" for q, value in stats['salary_quantiles'].items())
+        print(f"📐 Percentiles de salario (aprox.): {quantiles}")
+
+    if stats['date_range']['start']:
+        print(f"📅 Rango de fechas: {stats['date_range']['start'].date()} a {stats['date_range']['end'].date()}")
+
+    if processed_df is None:
+        return
+
+    # Análisis por empresas
+    print(f"\n🔝 TOP 10 EMPRESAS CON MÁS OFERTAS:")
+    if len(processed_df) > 0:
+        top_companies = processed_df['company'].value_counts().head(10)
+        for i, (company, count) in enumerate(top_companies.items(), 1):
+            emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i:2d}."
+            print(f"   {emoji} {company}: {count} ofertas")
+
+    # Análisis por ubicaciones
+    print(f"\n🌍 DISTRIBUCIÓN POR UBICACIONES:")
+    if len(processed_df) > 0:
+        top_locations = processed_df['location'].value_counts().head(5)
+        for location, count in top_locations.items():
+            percentage = (count / len(processed_df)) * 100
+            print(f"   📍 {location}: {count} empleos ({percentage:.1f}%)")
+
+    # Análisis de niveles de experiencia
+    if 'experience_level' in processed_df.columns:
+        print(f"\n🎯 DISTRIBUCIÓN POR NIVEL DE EXPERIENCIA:")
+        exp_levels = processed_df['experience_level'].value_counts()
+        for level, count in exp_levels.items():
+            percentage = (count / len(processed_df)) * 100
+            print(f"   👨‍💻 {level}: {count} empleos ({percentage:.1f}%)")
+
+    # Tecnologías más demandadas
+    print(f"\n💻 TECNOLOGÍAS MÁS MENCIONADAS:")
+    tech_columns = [col for col in processed_df.columns if col.startswith('mentions_')]
+    if tech_columns:
+        tech_counts = {}
+        for col in tech_columns:
+            tech_name = col.replace('mentions_', '').replace('_', ' ').title()
+            tech_counts[tech_name] = processed_df[col].sum()
+
+        # Ordenar por frecuencia
+        sorted_tech = sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)
+        for tech, count in sorted_tech[:10]:
+            if count > 0:
+                percentage = (count / len(processed_df)) * 100
+                print(f"   ⚡ {tech}: {count} menciones ({percentage:.1f}%)")
+
+
+def save_time_series(processor, freqs, dimensions, timestamp: str, metrics, lifecycle=None) -> dict:
+    """Crea en una sola pasada y guarda las series de tiempo. Devuelve {nombre: ruta}
+
+    Con ``lifecycle`` las series totales incluyen la columna ``open_postings``.
+    """
+    from src.data_processor import save_processed_data
+    from src.time_series import TOTAL, period_frequency, to_tidy
+
+    print(f"\n📈 CREANDO DATOS PARA ANÁLISIS TEMPORAL...")
+    series = processor.create_time_series_set(freqs, dimensions)
+    saved = {}
+
+    # Series totales: un archivo por frecuencia
+    for freq in freqs:
+        time_series = series.get((freq, TOTAL))
+        if time_series is not None and not time_series.empty:
+            if lifecycle is not None:
+                from src.lifecycle import add_open_postings
+                time_series = add_open_postings(time_series, lifecycle, freq)
+            # 'ME', 'QE' y 'YE' son los alias de pandas 2.2 para 'M', 'Q' y 'Y'; 'MS', 'QS' y 'YS'
+            # son los mismos periodos etiquetados con su inicio
+            period_freq, label_start = period_frequency(freq)
+            name = TIME_SERIES_NAMES.get(period_freq, freq.lower()) + ('_start' if label_start else '')
+            ts_filename = f"jalisco_bigtech_timeseries_{name}_{timestamp}.csv"
+            saved[name] = save_processed_data(time_series.reset_index(), ts_filename, metrics=metrics)
+            print(f"✅ Series de tiempo ({name}) guardadas")
+
+    # Desgloses por dimensión: una sola tabla larga
+    breakdowns = {key: frame for key, frame in series.items() if key[1] != TOTAL}
+    if breakdowns:
+        ts_filename = f"jalisco_bigtech_timeseries_breakdown_{timestamp}.csv"
+        saved['breakdown'] = save_processed_data(to_tidy(breakdowns), ts_filename, metrics=metrics)
+        print(f"✅ Desgloses de series de tiempo guardados ({len(breakdowns)} combinaciones)")
+
+    return saved
+
+
+def export_metrics(metrics):
+    """Escribe el resumen de métricas en el log y exporta el reporte de la ejecución"""
+    from src.config import METRICS_DIR, METRICS_FORMAT
+
+    metrics.log_summary()
+    for metrics_path in metrics.export(METRICS_DIR, METRICS_FORMAT):
+        print(f"   📄 Métricas de rendimiento: {metrics_path}")
+
 
 def main():
     """Función principal que ejecuta todo el pipeline"""
+    from src.metrics import PipelineMetrics
+    from src.config import TIME_SERIES_FREQUENCIES, TIME_SERIES_DIMENSIONS
+
     print("🚀 ANÁLISIS DE EMPLEOS BIG TECH EN JALISCO")
     print("=" * 50)
-    
+
+    metrics = PipelineMetrics("pipeline")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
     try:
         # Paso 1: Scraping de datos
-        print("\n📡 PASO 1: Extrayendo datos de empleos...")
-        scraper = AdzunaJobScraper()
-        raw_df = scraper.scrape_big_tech_jobs_jalisco()
-        
+        raw_df, raw_filepath = scrape_data(timestamp, metrics)
         if raw_df.empty:
-            print("❌ No se pudieron extraer datos. Verifica la configuración de la API.")
             return
-        
-        # Guardar datos raw
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        raw_filename = f"jalisco_bigtech_jobs_raw_{timestamp}.csv"
-        raw_filepath = scraper.save_data(raw_df, raw_filename)
-        
-        print(f"✅ Datos extraídos exitosamente: {len(raw_df)} empleos")
-        
+
         # Paso 2: Procesamiento de datos
-        print("\n🔧 PASO 2: Procesando y limpiando datos...")
-        processor = JobDataProcessor(raw_df)
-        
-        # Limpiar datos
-        cleaned_df = processor.clean_data()
-        
-        # Crear características temporales
-        processed_df = processor.create_time_features()
-        
-        # Preparar para modelado
-        model_ready_df, encoders = processor.prepare_for_modeling()
-        
-        # Guardar datos procesados
-        processed_filename = f"jalisco_bigtech_jobs_processed_{timestamp}.csv"
-        processed_filepath = save_processed_data(processed_df, processed_filename)
-        
-        model_ready_filename = f"jalisco_bigtech_jobs_model_ready_{timestamp}.csv"
-        model_ready_filepath = save_processed_data(model_ready_df, model_ready_filename)
-        
-        print(f"✅ Datos procesados exitosamente")
-        
+        processor, processed_filepath, model_ready_filepath = process_data(raw_df, timestamp, metrics)
+        processed_df = processor.df
+
         # Paso 3: Análisis inicial
         print("\n📊 PASO 3: Generando estadísticas iniciales...")
         stats = processor.get_summary_stats()
-        
-        # Mostrar resumen detallado
-        print("\n" + "="*60)
-        print("📈 RESUMEN ESTADÍSTICO DEL DATASET")
-        print("="*60)
-        print(f"📊 Total de empleos analizados: {stats['total_jobs']:,}")
-        print(f"🏢 Empresas únicas: {stats['unique_companies']:,}")
-        print(f"🌍 Ubicaciones únicas: {stats['unique_locations']:,}")
-        print(f"🏆 Empleos Big Tech: {stats['big_tech_jobs']:,} ({stats['big_tech_percentage']:.1f}%)")
-        print(f"💰 Empleos con información salarial: {stats['jobs_with_salary']:,}")
-        
-        if stats['avg_salary'] > 0:
-            print(f"💵 Salario promedio: ${stats['avg_salary']:,.0f}")
-            print(f"💵 Salario mediano: ${stats['median_salary']:,.0f}")
-        
-        if stats['date_range']['start']:
-            print(f"📅 Rango de fechas: {stats['date_range']['start'].date()} a {stats['date_range']['end'].date()}")
-        
-        # Análisis por empresas
-        print(f"\n🔝 TOP 10 EMPRESAS CON MÁS OFERTAS:")
-        if len(processed_df) > 0:
-            top_companies = processed_df['company'].value_counts().head(10)
-            for i, (company, count) in enumerate(top_companies.items(), 1):
-                emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i:2d}."
-                print(f"   {emoji} {company}: {count} ofertas")
-        
-        # Análisis por ubicaciones
-        print(f"\n🌍 DISTRIBUCIÓN POR UBICACIONES:")
-        if len(processed_df) > 0:
-            top_locations = processed_df['location'].value_counts().head(5)
-            for location, count in top_locations.items():
-                percentage = (count / len(processed_df)) * 100
-                print(f"   📍 {location}: {count} empleos ({percentage:.1f}%)")
-        
-        # Análisis de niveles de experiencia
-        if 'experience_level' in processed_df.columns:
-            print(f"\n🎯 DISTRIBUCIÓN POR NIVEL DE EXPERIENCIA:")
-            exp_levels = processed_df['experience_level'].value_counts()
-            for level, count in exp_levels.items():
-                percentage = (count / len(processed_df)) * 100
-                print(f"   👨‍💻 {level}: {count} empleos ({percentage:.1f}%)")
-        
-        # Tecnologías más demandadas
-        print(f"\n💻 TECNOLOGÍAS MÁS MENCIONADAS:")
-        tech_columns = [col for col in processed_df.columns if col.startswith('mentions_')]
-        if tech_columns:
-            tech_counts = {}
-            for col in tech_columns:
-                tech_name = col.replace('mentions_', '').replace('_', ' ').title()
-                tech_counts[tech_name] = processed_df[col].sum()
-            
-            # Ordenar por frecuencia
-            sorted_tech = sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)
-            for tech, count in sorted_tech[:10]:
-                if count > 0:
-                    percentage = (count / len(processed_df)) * 100
-                    print(f"   ⚡ {tech}: {count} menciones ({percentage:.1f}%)")
-        
+        print_summary(stats, processed_df)
+        lifecycle = load_lifecycle()
+        if lifecycle is not None:
+            print_time_to_fill(lifecycle)
+
         # Series de tiempo básicas
-        print(f"\n📈 CREANDO DATOS PARA ANÁLISIS TEMPORAL...")
-        time_series_daily = processor.create_time_series_data('D')
-        time_series_weekly = processor.create_time_series_data('W')
-        
-        # Guardar series de tiempo
-        if not time_series_daily.empty:
-            ts_daily_filename = f"jalisco_bigtech_timeseries_daily_{timestamp}.csv"
-            save_processed_data(time_series_daily, ts_daily_filename)
-            print(f"✅ Series de tiempo diarias guardadas")
-        
-        if not time_series_weekly.empty:
-            ts_weekly_filename = f"jalisco_bigtech_timeseries_weekly_{timestamp}.csv"
-            save_processed_data(time_series_weekly, ts_weekly_filename)
-            print(f"✅ Series de tiempo semanales guardadas")
-        
+        time_series_files = save_time_series(processor, TIME_SERIES_FREQUENCIES, TIME_SERIES_DIMENSIONS,
+                                             timestamp, metrics, lifecycle)
+
         # Resumen final
         print("\n" + "="*60)
         print("🎉 PIPELINE DE SCRAPING COMPLETADO EXITOSAMENTE")
@@ -155,18 +378,20 @@ def main():
         print(f"   📄 Datos raw: {raw_filepath}")
         print(f"   📄 Datos procesados: {processed_filepath}")
         print(f"   📄 Datos para ML: {model_ready_filepath}")
-        if not time_series_daily.empty:
+        if time_series_files:
             print(f"   📄 Series de tiempo: data/processed/jalisco_bigtech_timeseries_*.csv")
-        
+
+        export_metrics(metrics)
+
         print(f"\n🔄 Próximos pasos recomendados:")
         print(f"   1. 📊 Ejecutar análisis exploratorio completo (EDA)")
         print(f"   2. 🔍 Aplicar técnicas de reducción de dimensionalidad")
         print(f"   3. 📈 Implementar modelos de series de tiempo")
         print(f"   4. 🤖 Desarrollar modelos predictivos")
         print(f"   5. 📋 Generar visualizaciones para el informe")
-        
+
         return processed_df, stats
-        
+
     except Exception as e:
         logger.error(f"Error en el pipeline principal: {e}")
         print(f"❌ Error durante la ejecución: {e}")
@@ -175,24 +400,23 @@ def main():
 
 def quick_analysis(filepath: str = None):
     """Análisis rápido de datos ya extraídos"""
+    from src.config import DATA_OUTPUT_DIR
+
     if filepath is None:
         # Buscar el archivo más reciente
-        data_dir = "data/raw"
-        if os.path.exists(data_dir):
-            files = [f for f in os.listdir(data_dir) if f.endswith('.csv')]
-            if files:
-                files.sort(reverse=True)
-                filepath = os.path.join(data_dir, files[0])
-            else:
-                print("❌ No se encontraron archivos de datos.")
-                return
-        else:
+        if not os.path.exists(DATA_OUTPUT_DIR):
             print("❌ Directorio de datos no encontrado.")
             return
-    
+        filepath = find_latest_file(DATA_OUTPUT_DIR)
+        if filepath is None:
+            print("❌ No se encontraron archivos de datos.")
+            return
+
     print(f"📊 Analizando datos desde: {filepath}")
-    
+
     try:
+        from src.data_processor import load_and_process_data
+
         processed_df, stats = load_and_process_data(filepath)
         print("✅ Análisis completado")
         return processed_df, stats
@@ -201,12 +425,257 @@ def quick_analysis(filepath: str = None):
         return None, None
 
 
+def load_dataset(filepath: str = None):
+    """Carga un dataset procesado si existe; si no, procesa el CSV raw más reciente.
+
+    Devuelve un JobDataProcessor listo para consultar, o None si no hay datos.
+    """
+    from src.config import PROCESSED_DATA_DIR
+
+    if filepath is None:
+        filepath = find_latest_file(PROCESSED_DATA_DIR, 'jalisco_bigtech_jobs_processed_')
+
+    if filepath is None:
+        result = quick_analysis()
+        if not result or result[0] is None:
+            return None
+        processed_df = result[0]
+        from src.data_processor import JobDataProcessor
+        return JobDataProcessor(processed_df)
+
+    from src.data_processor import JobDataProcessor, load_processed_data
+
+    print(f"📊 Analizando datos desde: {filepath}")
+    df = load_processed_data(filepath)
+    processor = JobDataProcessor(df)
+    if 'experience_level' not in df.columns:
+        # Es un CSV raw: limpiar y crear características
+        processor.clean_data()
+        processor.create_time_features()
+    return processor
+
+
+def cmd_all(args):
+    main()
+
+
+def cmd_scrape(args):
+    from src.metrics import PipelineMetrics
+
+    metrics = PipelineMetrics("scrape")
+    raw_df, raw_filepath = scrape_data(datetime.now().strftime("%Y%m%d_%H%M%S"), metrics)
+    if raw_filepath:
+        export_metrics(metrics)
+
+
+def cmd_process(args):
+    from src.config import DATA_OUTPUT_DIR
+    from src.metrics import PipelineMetrics
+    import pandas as pd
+
+    filepath = args.file or find_latest_file(DATA_OUTPUT_DIR)
+    if filepath is None:
+        print("❌ No se encontraron archivos de datos.")
+        return
+
+    print(f"📊 Procesando datos desde: {filepath}")
+    metrics = PipelineMetrics("process")
+    with metrics.timer('csv_read'):
+        raw_df = pd.read_csv(filepath)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    _, processed_filepath, model_ready_filepath = process_data(raw_df, timestamp, metrics)
+    print(f"   📄 Datos procesados: {processed_filepath}")
+    print(f"   📄 Datos para ML: {model_ready_filepath}")
+    export_metrics(metrics)
+
+
+def cmd_replay(args):
+    from src.config import RAW_ARCHIVE_DIR
+    from src.metrics import PipelineMetrics
+    from src.raw_archive import replay_archive
+
+    archive_dir = args.archive_dir or RAW_ARCHIVE_DIR
+    print(f"♻️  Reprocesando respuestas archivadas desde: {archive_dir}")
+    metrics = PipelineMetrics("replay")
+    with metrics.timer('replay'):
+        replayed_df = replay_archive(archive_dir, since=args.since, n_jobs=args.jobs)
+    if replayed_df.empty:
+        print("❌ No hay páginas archivadas que reprocesar.")
+        return
+
+    metrics.add_rows('replay', len(replayed_df))
+    print(f"✅ {len(replayed_df)} empleos únicos reconstruidos desde el archivo")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    _, processed_filepath, model_ready_filepath = process_data(replayed_df, timestamp, metrics, cleaned=True)
+    print(f"   📄 Datos procesados: {processed_filepath}")
+    print(f"   📄 Datos para ML: {model_ready_filepath}")
+    export_metrics(metrics)
+
+
+def cmd_stats(args):
+    if args.running:
+        from src.config import STATS_SKETCH_FILE
+        from src.sketches import SummaryStatsAccumulator
+
+        if not os.path.exists(STATS_SKETCH_FILE):
+            print("❌ No hay estadísticas acumuladas. Ejecutar primero: python main.py process")
+            return
+        print(f"📊 Estadísticas acumuladas desde: {STATS_SKETCH_FILE}")
+        print_summary(SummaryStatsAccumulator.load(STATS_SKETCH_FILE).to_stats())
+        return
+
+    if args.lifecycle:
+        lifecycle = load_lifecycle()
+        if lifecycle is None:
+            print("❌ No hay tabla de ciclo de vida. Ejecutar primero: python main.py scrape")
+            return
+        print_time_to_fill(lifecycle)
+        by_company = lifecycle.time_to_fill(by='company').head(10)
+        if not by_company.empty:
+            print(f"\n🏢 TIEMPO PUBLICADO POR EMPRESA (vacantes cerradas):")
+            for company, row in by_company.iterrows():
+                print(f"   {company}: {int(row['closed_postings'])} vacantes, mediana {row['median_days']:.1f} días")
+        return
+
+    processor = load_dataset(args.file)
+    if processor is None:
+        return
+    print_summary(processor.get_summary_stats(), processor.df)
+
+
+def cmd_report(args):
+    processor = load_dataset(args.file)
+    if processor is None:
+        return
+    from src.config import REPORT_DIR
+    from src.reporting import generate_report
+
+    print(f"\n🖼️  Generando reporte de gráficas...")
+    index_path = generate_report(processor.df, args.output or REPORT_DIR, n_jobs=args.jobs,
+                                 metrics=processor.metrics)
+    print(f"✅ Reporte generado: {index_path}")
+    export_metrics(processor.metrics)
+
+
+def cmd_serve(args):
+    from src.config import API_HOST, API_PORT, PROCESSED_DATA_DIR
+    from src.api_server import serve
+
+    host, port = args.host or API_HOST, args.port or API_PORT
+    print(f"🌐 API de consultas en http://{host}:{port} (Ctrl+C para detener)")
+    serve(host, port, args.data_dir or PROCESSED_DATA_DIR)
+
+
+def cmd_similar(args):
+    from src.config import SIMILARITY_INDEX_FILE
+    from src.similarity_index import JobSimilarityIndex
+
+    if not os.path.exists(SIMILARITY_INDEX_FILE):
+        print("❌ No hay índice de similitud. Ejecutar primero: python main.py process")
+        return
+
+    index = JobSimilarityIndex.load(SIMILARITY_INDEX_FILE)
+    try:
+        neighbours = index.query_id(args.job_id, k=args.k)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return
+
+    # Títulos y empresas del dataset procesado más reciente (si están disponibles)
+    processor = load_dataset(args.file)
+    details = {}
+    if processor is not None:
+        details = processor.df.assign(id=processor.df['id'].astype(str)).set_index('id')[['title', 'company']]
+        details = details[~details.index.duplicated()].to_dict('index')
+
+    job = details.get(str(args.job_id), {})
+    print(f"\n🔎 Empleos similares a {args.job_id}: {job.get('title', '')} ({job.get('company', '')})")
+    for job_id, score in neighbours:
+        job = details.get(job_id, {})
+        print(f"   {score:.3f}  {job_id}  {job.get('title', '')} — {job.get('company', '')}")
+
+
+def cmd_timeseries(args):
+    from src.config import TIME_SERIES_FREQUENCIES, TIME_SERIES_DIMENSIONS
+    from src.time_series import period_frequency
+
+    freqs = args.freq or TIME_SERIES_FREQUENCIES
+    try:
+        for freq in freqs:
+            period_frequency(freq)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    processor = load_dataset(args.file)
+    if processor is None:
+        return
+
+    save_time_series(processor, freqs, args.by or TIME_SERIES_DIMENSIONS,
+                     datetime.now().strftime("%Y%m%d_%H%M%S"), processor.metrics, load_lifecycle())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Análisis de empleos Big Tech en Jalisco")
+    subparsers = parser.add_subparsers(dest='command')
+    parser.set_defaults(func=cmd_all)
+
+    subparsers.add_parser('all', help='Pipeline completo (opción por defecto)').set_defaults(func=cmd_all)
+    subparsers.add_parser('scrape', help='Extraer empleos de la API de Adzuna').set_defaults(func=cmd_scrape)
+
+    process_parser = subparsers.add_parser('process', help='Procesar un CSV raw')
+    process_parser.add_argument('file', nargs='?', help='CSV raw (por defecto el más reciente)')
+    process_parser.set_defaults(func=cmd_process)
+
+    replay_parser = subparsers.add_parser('replay', help='Reprocesar las respuestas crudas archivadas')
+    replay_parser.add_argument('--since', help='Solo páginas descargadas desde esta fecha ISO (p. ej. 2024-01-31)')
+    replay_parser.add_argument('--jobs', type=int, help='Procesos en paralelo (por defecto, uno por núcleo)')
+    replay_parser.add_argument('--archive-dir', help='Directorio del archivo (por defecto RAW_ARCHIVE_DIR)')
+    replay_parser.set_defaults(func=cmd_replay)
+
+    stats_parser = subparsers.add_parser('stats', aliases=['analyze'], help='Estadísticas rápidas de un dataset')
+    stats_parser.add_argument('file', nargs='?', help='CSV procesado o raw (por defecto el más reciente)')
+    stats_parser.add_argument('--running', action='store_true',
+                              help='Mostrar las estadísticas acumuladas de todas las ejecuciones')
+    stats_parser.add_argument('--lifecycle', action='store_true',
+                              help='Mostrar el tiempo que las vacantes permanecen publicadas')
+    stats_parser.set_defaults(func=cmd_stats)
+
+    ts_parser = subparsers.add_parser('timeseries', help='Generar series de tiempo')
+    ts_parser.add_argument('file', nargs='?', help='CSV procesado o raw (por defecto el más reciente)')
+    ts_parser.add_argument('--freq', nargs='+', help='Frecuencias de pandas (D, W, ME/M, MS, QE/Q, QS, YE/Y, YS)')
+    ts_parser.add_argument('--by', nargs='+',
+                           help='Dimensiones: total, company, location, experience_level, tech, ...')
+    ts_parser.set_defaults(func=cmd_timeseries)
+
+    report_parser = subparsers.add_parser('report', help='Generar el reporte estático de gráficas (PNG + HTML)')
+    report_parser.add_argument('file', nargs='?', help='CSV procesado o raw (por defecto el más reciente)')
+    report_parser.add_argument('--output', help='Directorio del reporte (por defecto REPORT_DIR)')
+    report_parser.add_argument('--jobs', type=int, help='Procesos para dibujar (por defecto, uno por núcleo)')
+    report_parser.set_defaults(func=cmd_report)
+
+    serve_parser = subparsers.add_parser('serve', help='API HTTP local de consultas sobre el dataset procesado')
+    serve_parser.add_argument('--host', help='Interfaz (por defecto API_HOST)')
+    serve_parser.add_argument('--port', type=int, help='Puerto (por defecto API_PORT)')
+    serve_parser.add_argument('--data-dir', help='Directorio de datasets procesados (por defecto PROCESSED_DATA_DIR)')
+    serve_parser.set_defaults(func=cmd_serve)
+
+    similar_parser = subparsers.add_parser('similar', help='Buscar empleos similares a uno indexado')
+    similar_parser.add_argument('job_id', help='ID del empleo de Adzuna')
+    similar_parser.add_argument('-k', type=int, default=10, help='Número de empleos similares')
+    similar_parser.add_argument('--file', help='CSV procesado para mostrar títulos y empresas')
+    similar_parser.set_defaults(func=cmd_similar)
+
+    return parser
+
+
+def cli(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging()
+    args.func(args)
+
+
 if __name__ == "__main__":
-    # Verificar argumentos de línea de comandos
-    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
-        # Solo análisis de datos existentes
-        filepath = sys.argv[2] if len(sys.argv) > 2 else None
-        quick_analysis(filepath)
-    else:
-        # Pipeline completo de scraping y análisis
-        main()
+    cli()
@@ -0,0 +1,428 @@
+"""
+API HTTP local de consultas sobre el dataset procesado
+
+Carga una sola vez el dataset procesado más reciente y lo mantiene en memoria. Las
+respuestas se guardan ya serializadas en una caché LRU indexada por endpoint y
+parámetros. La caché se invalida cuando se publica un dataset nuevo en el directorio
+de datos procesados (otro archivo o cambio de fecha de modificación). Cada request se
+atiende en su propio hilo (``ThreadingHTTPServer``), sin dependencias externas.
+
+Endpoints (GET, respuestas JSON):
+    /stats                                   Estadísticas resumidas
+    /timeseries?freq=W&by=company            Series de tiempo por frecuencia y dimensión
+    /top?field=tech&n=10                     Top de empresas, ubicaciones, tecnologías, ...
+    /jobs?company=...&tech=python&limit=50   Lista filtrada de empleos
+    /health                                  Dataset cargado y estado de la caché
+    /metrics                                 Métricas en formato de texto de Prometheus
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from config import PROCESSED_DATA_DIR, API_HOST, API_PORT, API_CACHE_SIZE, API_RELOAD_CHECK_SECONDS
+from data_processor import JobDataProcessor, load_processed_data
+from metrics import PipelineMetrics
+
+logger = logging.getLogger(__name__)
+
+DATASET_PREFIX = 'jalisco_bigtech_jobs_processed_'
+TOP_FIELDS = ('company', 'location', 'experience_level', 'category', 'tech')
+JOB_COLUMNS = ['id', 'title', 'company', 'location', 'category', 'created', 'salary_min', 'salary_max',
+               'salary_avg', 'experience_level', 'is_big_tech', 'is_remote', 'is_hybrid', 'is_onsite',
+               'redirect_url']
+MAX_LIMIT = 500
+
+# Buckets (en segundos) del histograma de latencia de las respuestas del API
+API_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class QueryError(ValueError):
+    """Parámetros de consulta inválidos (se responde con 400)"""
+
+
+def _to_builtin(value):
+    """Convierte tipos de numpy/pandas a tipos serializables en JSON (NaN -> null)"""
+    if isinstance(value, dict):
+        return {str(key): _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(item) for item in value]
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return None if pd.isna(value) else value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is pd.NaT:
+        return None
+    return value
+
+
+def _records(frame: pd.DataFrame) -> List[Dict]:
+    return json.loads(frame.to_json(orient='records', date_format='iso'))
+
+
+class LRUCache:
+    """Caché LRU segura entre hilos"""
+
+    def __init__(self, maxsize: int = API_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'size': len(self._items), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+
+class DatasetStore:
+    """Mantiene en memoria el dataset procesado más reciente y lo recarga cuando se publica uno nuevo"""
+
+    def __init__(self, data_dir: str = PROCESSED_DATA_DIR, prefix: str = DATASET_PREFIX,
+                 check_seconds: float = API_RELOAD_CHECK_SECONDS, metrics: Optional[PipelineMetrics] = None):
+        self.data_dir = data_dir
+        self.prefix = prefix
+        self.check_seconds = check_seconds
+        self.metrics = metrics if metrics is not None else PipelineMetrics("api")
+        self.processor: Optional[JobDataProcessor] = None
+        self.version: Optional[Tuple[str, int]] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def _latest(self) -> Optional[Tuple[str, int]]:
+        """Ruta y fecha de modificación del dataset procesado más reciente"""
+        if not os.path.exists(self.data_dir):
+            return None
+        files = sorted(f for f in os.listdir(self.data_dir) if f.startswith(self.prefix) and f.endswith('.csv'))
+        if not files:
+            return None
+        filepath = os.path.join(self.data_dir, files[-1])
+        return filepath, os.stat(filepath).st_mtime_ns
+
+    def get(self) -> Tuple[Optional[Tuple[str, int]], Optional[JobDataProcessor]]:
+        """Versión y procesador vigentes; revisa el directorio como máximo cada ``check_seconds``"""
+        now = time.monotonic()
+        if self.processor is not None and now - self._last_check < self.check_seconds:
+            return self.version, self.processor
+
+        with self._lock:
+            if self.processor is None or now - self._last_check >= self.check_seconds:
+                self._last_check = now
+                latest = self._latest()
+                if latest is not None and latest != self.version:
+                    self._load(latest)
+        return self.version, self.processor
+
+    def _load(self, version: Tuple[str, int]):
+        filepath = version[0]
+        with self.metrics.timer('api_dataset_load'):
+            df = load_processed_data(filepath)
+        self.metrics.add_rows('api_dataset_load', len(df))
+        self.processor = JobDataProcessor(df, metrics=self.metrics)
+        self.version = version
+        self.metrics.increment('api_dataset_reloads_total')
+        logger.info(f"Dataset cargado en el API: {filepath} ({len(df)} empleos)")
+
+
+def _param(params: Dict[str, List[str]], name: str, default=None) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def _int_param(params: Dict[str, List[str]], name: str, default: int, maximum: int) -> int:
+    value = _param(params, name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise QueryError(f"'{name}' debe ser un entero")
+    if value < 0:
+        raise QueryError(f"'{name}' no puede ser negativo")
+    return min(value, maximum)
+
+
+def _bool_param(params: Dict[str, List[str]], name: str) -> Optional[bool]:
+    value = _param(params, name)
+    if value is None:
+        return None
+    if value.lower() in ('1', 'true', 'yes', 'si', 'sí'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise QueryError(f"'{name}' debe ser true o false")
+
+
+def query_stats(processor: JobDataProcessor, params: Dict) -> Dict:
+    return processor.get_summary_stats()
+
+
+def query_timeseries(processor: JobDataProcessor, params: Dict) -> Dict:
+    freq = _param(params, 'freq', 'D')
+    dimension = _param(params, 'by', 'total')
+    if dimension != 'total' and dimension != 'tech' and dimension not in processor.df.columns:
+        raise QueryError(f"Dimensión desconocida: '{dimension}'")
+
+    try:
+        series = processor.create_time_series_set([freq], [dimension])
+    except ValueError:
+        raise QueryError(f"Frecuencia inválida: '{freq}'")
+
+    frame = series.get((freq, dimension)) if series else None
+    if frame is None:
+        return {'freq': freq, 'by': dimension, 'series': []}
+    if dimension == 'total':
+        frame = frame.reset_index()
+    return {'freq': freq, 'by': dimension, 'series': _records(frame)}
+
+
+def query_top(processor: JobDataProcessor, params: Dict) -> Dict:
+    df = processor.df
+    field = _param(params, 'field', 'company')
+    n = _int_param(params, 'n', 10, 100)
+    if field not in TOP_FIELDS or (field != 'tech' and field not in df.columns):
+        raise QueryError(f"'field' debe ser uno de: {', '.join(TOP_FIELDS)}")
+
+    if field == 'tech':
+        tech_columns = [col for col in df.columns if col.startswith('mentions_')]
+        counts = df[tech_columns].fillna(False).astype(int).sum()
+        counts.index = counts.index.str.replace('mentions_', '', regex=False)
+        counts = counts.sort_values(ascending=False, kind='stable').head(n)
+    else:
+        counts = df[field].value_counts().head(n)
+
+    total = len(df)
+    return {
+        'field': field,
+        'total_jobs': total,
+        'top': [{'value': value, 'jobs': int(count), 'percentage': count / total * 100 if total else 0}
+                for value, count in counts.items()],
+    }
+
+
+def query_jobs(processor: JobDataProcessor, params: Dict) -> Dict:
+    df = processor.df
+    mask = np.ones(len(df), dtype=bool)
+
+    company = _param(params, 'company')
+    if company and 'company' in df.columns:
+        mask &= (df['company'].str.lower() == company.lower()).to_numpy()
+
+    for name in ('location', 'title'):
+        value = _param(params, name)
+        if value and name in df.columns:
+            mask &= df[name].str.contains(value, case=False, regex=False, na=False).to_numpy()
+
+    experience = _param(params, 'experience_level')
+    if experience and 'experience_level' in df.columns:
+        mask &= (df['experience_level'] == experience).to_numpy()
+
+    techs = _param(params, 'tech')
+    if techs:
+        for tech in techs.split(','):
+            column = f"mentions_{tech.strip().lower()}"
+            if column not in df.columns:
+                raise QueryError(f"Tecnología desconocida: '{tech.strip()}'")
+            mask &= df[column].fillna(False).astype(bool).to_numpy()
+
+    for name, column in (('remote', 'is_remote'), ('hybrid', 'is_hybrid'), ('onsite', 'is_onsite'),
+                         ('big_tech', 'is_big_tech')):
+        value = _bool_param(params, name)
+        if value is not None and column in df.columns:
+            mask &= (df[column].fillna(False).astype(bool) == value).to_numpy()
+
+    min_salary = _param(params, 'min_salary')
+    if min_salary and 'salary_avg' in df.columns:
+        try:
+            mask &= (df['salary_avg'] >= float(min_salary)).to_numpy()
+        except ValueError:
+            raise QueryError("'min_salary' debe ser numérico")
+
+    since = _param(params, 'since')
+    if since and 'created' in df.columns:
+        try:
+            since = pd.Timestamp(since)
+        except ValueError:
+            raise QueryError("'since' debe ser una fecha ISO")
+        created = df['created']
+        if created.dt.tz is not None and since.tzinfo is None:
+            since = since.tz_localize(created.dt.tz)
+        mask &= (created >= since).to_numpy()
+
+    limit = _int_param(params, 'limit', 50, MAX_LIMIT)
+    offset = _int_param(params, 'offset', 0, len(df))
+
+    matches = df.loc[mask, [col for col in JOB_COLUMNS if col in df.columns]]
+    if 'created' in matches.columns:
+        matches = matches.sort_values('created', ascending=False, kind='stable')
+    return {
+        'total': len(matches),
+        'offset': offset,
+        'limit': limit,
+        'jobs': _records(matches.iloc[offset:offset + limit]),
+    }
+
+
+class JobQueryService:
+    """Resuelve las consultas del API con caché LRU de respuestas serializadas"""
+
+    ENDPOINTS: Dict[str, Callable[[JobDataProcessor, Dict], Dict]] = {
+        '/stats': query_stats,
+        '/timeseries': query_timeseries,
+        '/top': query_top,
+        '/jobs': query_jobs,
+    }
+
+    def __init__(self, store: DatasetStore, cache_size: int = API_CACHE_SIZE):
+        self.store = store
+        self.metrics = store.metrics
+        self.cache = LRUCache(cache_size)
+        self._version = None
+        self._inflight: Dict[Tuple, threading.Lock] = {}
+        self._inflight_lock = threading.Lock()
+
+    def handle(self, path: str, params: Dict[str, List[str]]) -> Tuple[int, str, bytes]:
+        """Devuelve (código HTTP, content-type, cuerpo)"""
+        if path == '/metrics':
+            return 200, 'text/plain; version=0.0.4', self.metrics.to_prometheus().encode('utf-8')
+
+        version, processor = self.store.get()
+        if version != self._version:
+            # Dataset nuevo publicado: las respuestas anteriores ya no son válidas
+            self.cache.clear()
+            self._version = version
+
+        if path == '/health':
+            return self._json(200, {
+                'dataset': version[0] if version else None,
+                'jobs': len(processor.df) if processor is not None else 0,
+                'cache': self.cache.stats(),
+            })
+
+        endpoint = self.ENDPOINTS.get(path)
+        if endpoint is None:
+            return self._json(404, {'error': f"Endpoint desconocido: {path}",
+                                    'endpoints': sorted(self.ENDPOINTS) + ['/health', '/metrics']})
+        if processor is None:
+            return self._json(503, {'error': f"No hay datasets procesados en {self.store.data_dir}"})
+
+        key = (version, path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.metrics.increment('api_cache_hits_total')
+            return cached
+
+        # Consultas idénticas simultáneas esperan a la primera en vez de recalcular
+        with self._inflight_lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.metrics.increment('api_cache_hits_total')
+                    return cached
+
+                self.metrics.increment('api_cache_misses_total')
+                try:
+                    response = self._json(200, endpoint(processor, params))
+                except QueryError as e:
+                    response = self._json(400, {'error': str(e)})
+                self.cache.put(key, response)
+                return response
+        finally:
+            # También si el endpoint falla: la entrada no debe quedarse en _inflight
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    @staticmethod
+    def _json(status: int, payload) -> Tuple[int, str, bytes]:
+        body = json.dumps(_to_builtin(payload), ensure_ascii=False).encode('utf-8')
+        return status, 'application/json; charset=utf-8', body
+
+
+def _make_handler(service: JobQueryService):
+    class JobQueryHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            start = time.perf_counter()
+            url = urlparse(self.path)
+            try:
+                status, content_type, body = service.handle(url.path.rstrip('/') or '/', parse_qs(url.query))
+            except Exception as e:
+                logger.exception(f"Error atendiendo {self.path}")
+                status, content_type, body = JobQueryService._json(500, {'error': str(e)})
+
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+            service.metrics.increment('api_requests_total')
+            service.metrics.observe('api_request_seconds', time.perf_counter() - start, API_LATENCY_BUCKETS)
+
+        def log_message(self, format, *args):
+            logger.debug(f"{self.address_string()} - {format % args}")
+
+    return JobQueryHandler
+
+
+def create_server(host: str = API_HOST, port: int = API_PORT, data_dir: str = PROCESSED_DATA_DIR,
+                  cache_size: int = API_CACHE_SIZE) -> ThreadingHTTPServer:
+    """Crea el servidor y carga el dataset más reciente (sin empezar a atender requests)"""
+    store = DatasetStore(data_dir)
+    service = JobQueryService(store, cache_size)
+    store.get()
+    if store.processor is None:
+        logger.warning(f"No hay datasets procesados en {data_dir}; se cargarán cuando se publiquen")
+
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(host: str = API_HOST, port: int = API_PORT, data_dir: str = PROCESSED_DATA_DIR):
+    """Atiende requests hasta Ctrl+C"""
+    server = create_server(host, port, data_dir)
+    logger.info(f"API escuchando en http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -3,17 +3,19 @@ Configuración y constantes para el proyecto de análisis de empleos Big Tech en
 """
 
 import os
-from dotenv import load_dotenv
 
-# Cargar variables de entorno
-load_dotenv()
+# Cargar variables de entorno desde .env (python-dotenv solo se importa si el archivo existe)
+ENV_FILE = os.getenv('DOTENV_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+if os.path.exists(ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
 
 # Credenciales API Adzuna
 ADZUNA_APP_ID = os.getenv('ADZUNA_APP_ID', '24b6ac00')
 ADZUNA_API_KEY = os.getenv('ADZUNA_API_KEY', 'dde84ccd4d8545294d7009fed74ec5ab')
 
 # URLs base de la API
-ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+ADZUNA_BASE_URL = os.getenv('ADZUNA_BASE_URL', "https://api.adzuna.com/v1/api/jobs")
 ADZUNA_COUNTRY = "mx"  # México
 
 # Empresas Big Tech a buscar
@@ -46,12 +48,81 @@ MAX_REQUESTS_PER_MINUTE = int(os.getenv('MAX_REQUESTS_PER_MINUTE', 10))
 DELAY_BETWEEN_REQUESTS = int(os.getenv('DELAY_BETWEEN_REQUESTS', 6))
 MAX_RESULTS_PER_PAGE = 50
 MAX_PAGES_PER_SEARCH = 5
+MAX_RETRIES_ON_429 = int(os.getenv('MAX_RETRIES_ON_429', 3))  # Reintentos cuando la API responde 429
+# Presupuesto máximo de requests por ejecución (0 = sin límite)
+MAX_REQUESTS_PER_RUN = int(os.getenv('MAX_REQUESTS_PER_RUN', 0))
+
+# Planificador adaptativo de consultas
+QUERY_STATS_FILE = os.getenv('QUERY_STATS_FILE', 'data/raw/query_stats.json')
+MIN_NEW_ID_RATE = float(os.getenv('MIN_NEW_ID_RATE', 0.05))  # Tasa mínima de IDs nuevos para no omitir una consulta
+PAGE_SATURATION_RATE = float(os.getenv('PAGE_SATURATION_RATE', 0.1))  # Debajo de esta tasa se deja de paginar
+MIN_QUERY_RUNS = int(os.getenv('MIN_QUERY_RUNS', 2))  # Ejecuciones antes de poder omitir una consulta
+QUERY_REPROBE_EVERY = int(os.getenv('QUERY_REPROBE_EVERY', 10))  # Cada N ejecuciones se prueban todas las consultas
+QUERY_STATS_DECAY = float(os.getenv('QUERY_STATS_DECAY', 0.7))  # Peso del historial en el promedio exponencial
 
 # Directorios de datos
 DATA_OUTPUT_DIR = os.getenv('DATA_OUTPUT_DIR', 'data/raw')
 PROCESSED_DATA_DIR = os.getenv('PROCESSED_DATA_DIR', 'data/processed')
 RESULTS_DIR = os.getenv('RESULTS_DIR', 'results')
 
+# Estadísticas acumuladas entre ejecuciones (sketches mergeables)
+STATS_SKETCH_FILE = os.getenv('STATS_SKETCH_FILE', os.path.join(PROCESSED_DATA_DIR, 'summary_sketch.json'))
+# Días (por fecha de publicación, respecto a la más reciente) que se recuerdan los IDs ya contados;
+# 0 los recuerda todos
+STATS_ID_RETENTION_DAYS = int(os.getenv('STATS_ID_RETENTION_DAYS', 365))
+
+# Características de texto por hashing (título + descripción)
+TEXT_FEATURES_ENABLED = os.getenv('TEXT_FEATURES_ENABLED', 'true').lower() == 'true'
+TEXT_HASH_FEATURES = int(os.getenv('TEXT_HASH_FEATURES', 2 ** 18))
+TEXT_NGRAM_MAX = int(os.getenv('TEXT_NGRAM_MAX', 2))
+TEXT_CHUNK_SIZE = int(os.getenv('TEXT_CHUNK_SIZE', 5000))
+TEXT_FEATURES_USE_IDF = os.getenv('TEXT_FEATURES_USE_IDF', 'true').lower() == 'true'
+TEXT_IDF_FILE = os.getenv('TEXT_IDF_FILE', os.path.join(PROCESSED_DATA_DIR, 'text_idf_stats.npz'))
+
+# Índice de empleos similares (LSH sobre vectores de texto + banderas de habilidades)
+SIMILARITY_INDEX_ENABLED = os.getenv('SIMILARITY_INDEX_ENABLED', 'true').lower() == 'true'
+SIMILARITY_INDEX_FILE = os.getenv('SIMILARITY_INDEX_FILE', os.path.join(PROCESSED_DATA_DIR, 'similarity_index.npz'))
+SIMILARITY_DIM = int(os.getenv('SIMILARITY_DIM', 128))  # Dimensiones de la proyección del texto
+SIMILARITY_TABLES = int(os.getenv('SIMILARITY_TABLES', 32))  # Tablas hash del LSH (recall@10 ~0.96, ver similarity_index.py)
+SIMILARITY_BITS = int(os.getenv('SIMILARITY_BITS', 10))  # Bits por tabla
+SIMILARITY_FLAG_WEIGHT = float(os.getenv('SIMILARITY_FLAG_WEIGHT', 0.5))  # Peso de las banderas de habilidades y modalidad
+
+# Archivo comprimido de respuestas crudas de la API (para reprocesar sin volver a descargar)
+RAW_ARCHIVE_ENABLED = os.getenv('RAW_ARCHIVE_ENABLED', 'true').lower() == 'true'
+RAW_ARCHIVE_DIR = os.getenv('RAW_ARCHIVE_DIR', os.path.join(DATA_OUTPUT_DIR, 'archive'))
+RAW_ARCHIVE_SEGMENT_MB = int(os.getenv('RAW_ARCHIVE_SEGMENT_MB', 64))  # Tamaño máximo por segmento
+RAW_ARCHIVE_LEVEL = int(os.getenv('RAW_ARCHIVE_LEVEL', 3))  # Nivel de compresión zstd
+
+# Ciclo de vida de las vacantes (primera/última vez vistas y cierre) entre crawls
+LIFECYCLE_ENABLED = os.getenv('LIFECYCLE_ENABLED', 'true').lower() == 'true'
+LIFECYCLE_FILE = os.getenv('LIFECYCLE_FILE', os.path.join(PROCESSED_DATA_DIR, 'posting_lifecycle.csv'))
+# Crawls consecutivos en los que una vacante debe faltar para considerarla cerrada. Solo cuentan
+# los crawls en que su consulta de origen agotó sus resultados: las vacantes de consultas que el
+# planificador omitió, cortó por saturación o que llenaron su última página quedan abiertas
+LIFECYCLE_CLOSE_AFTER_MISSES = int(os.getenv('LIFECYCLE_CLOSE_AFTER_MISSES', 1))
+
+# Reporte estático de gráficas del EDA
+REPORT_DIR = os.getenv('REPORT_DIR', 'reports')
+REPORT_CLUSTERS = int(os.getenv('REPORT_CLUSTERS', 5))  # Clusters K-Means de las tendencias
+
+# API local de consultas sobre el dataset procesado
+API_HOST = os.getenv('API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('API_PORT', 8000))
+API_CACHE_SIZE = int(os.getenv('API_CACHE_SIZE', 256))  # Respuestas en la caché LRU
+API_RELOAD_CHECK_SECONDS = float(os.getenv('API_RELOAD_CHECK_SECONDS', 5))  # Cada cuánto buscar un dataset nuevo
+
+# Taxonomía canónica de habilidades y puestos (alias en español e inglés)
+TAXONOMY_FILE = os.getenv('TAXONOMY_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy.json'))
+TAXONOMY_CACHE_FILE = os.getenv('TAXONOMY_CACHE_FILE', os.path.join(PROCESSED_DATA_DIR, 'taxonomy_cache.json'))  # Patrones compilados
+
+# Series de tiempo (frecuencias de pandas y dimensiones de desglose)
+TIME_SERIES_FREQUENCIES = os.getenv('TIME_SERIES_FREQUENCIES', 'D,W,M').split(',')
+TIME_SERIES_DIMENSIONS = os.getenv('TIME_SERIES_DIMENSIONS', 'total,company,location,experience_level,tech').split(',')
+
+# Instrumentación de rendimiento
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(RESULTS_DIR, 'metrics'))
+METRICS_FORMAT = os.getenv('METRICS_FORMAT', 'both')  # 'json', 'prometheus' o 'both'
+
 # Headers para requests
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -8,12 +8,8 @@ import re
 from datetime import datetime, timedelta
 import logging
 from typing import List, Dict, Optional, Tuple
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.feature_extraction.text import TfidfVectorizer
-import warnings
-warnings.filterwarnings('ignore')
+
+from metrics import PipelineMetrics, timed_stage
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +17,12 @@ logger = logging.getLogger(__name__)
 class JobDataProcessor:
     """Clase para preprocesar y analizar datos de empleos"""
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, metrics: Optional[PipelineMetrics] = None):
         self.df = df.copy()
         self.original_shape = df.shape
+        self.metrics = metrics if metrics is not None else PipelineMetrics("processing")
         
+    @timed_stage('clean_data')
     def clean_data(self) -> pd.DataFrame:
         """Limpia y preprocesa los datos básicos"""
         logger.info("Iniciando limpieza de datos...")
@@ -56,13 +54,14 @@ class JobDataProcessor:
         logger.info(f"Limpieza completada. Shape: {self.original_shape} -> {self.df.shape}")
         return self.df
     
+    @timed_stage('feature_extraction')
     def _extract_job_features(self):
         """Extrae características adicionales de los textos"""
         
         # Niveles de experiencia
-        senior_patterns = r'\b(senior|sr\.|lead|principal|architect|manager|director)\b'
-        junior_patterns = r'\b(junior|jr\.|entry|trainee|intern|graduate)\b'
-        mid_patterns = r'\b(mid|middle|intermediate)\b'
+        senior_patterns = r'\b(?:senior|sr\.|lead|principal|architect|manager|director)\b'
+        junior_patterns = r'\b(?:junior|jr\.|entry|trainee|intern|graduate)\b'
+        mid_patterns = r'\b(?:mid|middle|intermediate)\b'
         
         self.df['is_senior'] = self.df['title'].str.lower().str.contains(senior_patterns, regex=True, na=False)
         self.df['is_junior'] = self.df['title'].str.lower().str.contains(junior_patterns, regex=True, na=False)
@@ -82,9 +81,9 @@ class JobDataProcessor:
         self.df['experience_level'] = self.df.apply(determine_level, axis=1)
         
         # Modalidad de trabajo
-        remote_patterns = r'\b(remote|remoto|home office|trabajo desde casa|wfh)\b'
-        hybrid_patterns = r'\b(hybrid|híbrido|mixto)\b'
-        onsite_patterns = r'\b(onsite|presencial|office|oficina)\b'
+        remote_patterns = r'\b(?:remote|remoto|home office|trabajo desde casa|wfh)\b'
+        hybrid_patterns = r'\b(?:hybrid|híbrido|mixto)\b'
+        onsite_patterns = r'\b(?:onsite|presencial|office|oficina)\b'
         
         full_text = (self.df['title'] + ' ' + self.df['description']).str.lower()
         
@@ -92,25 +91,16 @@ class JobDataProcessor:
         self.df['is_hybrid'] = full_text.str.contains(hybrid_patterns, regex=True, na=False)
         self.df['is_onsite'] = full_text.str.contains(onsite_patterns, regex=True, na=False)
         
-        # Tecnologías específicas
-        tech_patterns = {
-            'python': r'\bpython\b',
-            'java': r'\bjava\b',
-            'javascript': r'\b(javascript|js)\b',
-            'react': r'\breact\b',
-            'angular': r'\bangular\b',
-            'node': r'\b(node\.js|nodejs)\b',
-            'sql': r'\b(sql|mysql|postgresql|oracle)\b',
-            'cloud': r'\b(aws|azure|gcp|cloud)\b',
-            'machine_learning': r'\b(machine learning|ml|ai|artificial intelligence)\b',
-            'docker': r'\bdocker\b',
-            'kubernetes': r'\bkubernetes\b',
-            'agile': r'\b(agile|scrum|kanban)\b'
-        }
+        # Tecnologías específicas (una pasada de la taxonomía por texto)
+        from taxonomy import get_taxonomy
         
-        for tech, pattern in tech_patterns.items():
-            self.df[f'mentions_{tech}'] = full_text.str.contains(pattern, regex=True, na=False)
+        taxonomy = get_taxonomy()
+        matches = taxonomy.match_series(full_text)
+        for column, flags in taxonomy.group_flags(matches, len(self.df)).items():
+            self.df[column] = flags
+        self.df['skill_ids'] = taxonomy.join_ids(matches, len(self.df))
     
+    @timed_stage('create_time_features')
     def create_time_features(self) -> pd.DataFrame:
         """Crea características temporales para análisis de series de tiempo"""
         if 'created' in self.df.columns:
@@ -151,8 +141,52 @@ class JobDataProcessor:
         
         return stats
     
+    @timed_stage('update_summary_sketch')
+    def update_summary_sketch(self, accumulator: Optional['SummaryStatsAccumulator'] = None) -> 'SummaryStatsAccumulator':
+        """Agrega el dataset a un acumulador de estadísticas en streaming (mergeable entre lotes)"""
+        from sketches import SummaryStatsAccumulator
+        
+        if accumulator is None:
+            accumulator = SummaryStatsAccumulator()
+        return accumulator.update(self.df)
+    
+    @timed_stage('text_features')
+    def extract_text_features(self, use_idf: bool = False, idf_file: Optional[str] = None,
+                              n_jobs: Optional[int] = None):
+        """Convierte título + descripción en una matriz CSR por hashing (sin ajuste de vocabulario).
+        
+        Con ``use_idf`` las frecuencias de documento se acumulan en streaming; si se indica
+        ``idf_file`` se cargan las de ejecuciones anteriores y se guardan actualizadas. Los
+        empleos ya contados en ejecuciones anteriores no vuelven a sumar.
+        """
+        from text_features import HashedTextFeatures, build_job_texts
+        
+        vectorizer = HashedTextFeatures(use_idf=use_idf, n_jobs=n_jobs)
+        if use_idf and idf_file:
+            vectorizer.load_idf(idf_file)
+        
+        created = self.df['created'] if 'created' in self.df.columns else None
+        ids = self.df['id'] if 'id' in self.df.columns else None
+        matrix = vectorizer.transform(build_job_texts(self.df), ids=ids, created=created)
+        
+        if use_idf and idf_file:
+            vectorizer.save_idf(idf_file)
+        
+        logger.info(f"Características de texto: {matrix.shape[0]} x {matrix.shape[1]} ({matrix.nnz:,} no nulos)")
+        return matrix
+    
+    @timed_stage('job_vectors')
+    def build_job_vectors(self, text_matrix=None) -> np.ndarray:
+        """Vectores densos por empleo (texto proyectado + banderas) para el índice de similitud"""
+        from similarity_index import build_job_vectors
+        
+        return build_job_vectors(self.df, text_matrix)
+    
+    @timed_stage('prepare_for_modeling')
     def prepare_for_modeling(self) -> Tuple[pd.DataFrame, Dict]:
         """Prepara los datos para modelado de machine learning"""
+        from sklearn.preprocessing import LabelEncoder
+        
         logger.info("Preparando datos para modelado...")
         
         # Crear DataFrame de características
@@ -188,8 +222,13 @@ class JobDataProcessor:
         
         return feature_df, encoders
     
-    def create_time_series_data(self, freq: str = 'D') -> pd.DataFrame:
-        """Crea datos agregados para análisis de series de tiempo"""
+    @timed_stage('create_time_series_data')
+    def create_time_series_data(self, freq: str = 'D', lifecycle=None) -> pd.DataFrame:
+        """Crea datos agregados para análisis de series de tiempo.
+        
+        Con ``lifecycle`` (un ``PostingLifecycle``) agrega la columna ``open_postings``
+        con las vacantes abiertas al final de cada periodo.
+        """
         if 'created' not in self.df.columns:
             logger.warning("No hay columna de fecha para crear series de tiempo")
             return pd.DataFrame()
@@ -209,17 +248,45 @@ class JobDataProcessor:
         # Rellenar valores nulos
         time_series = time_series.fillna(0)
         
+        if lifecycle is not None:
+            from lifecycle import add_open_postings
+            time_series = add_open_postings(time_series, lifecycle, freq)
+        
         return time_series
+    
+    @timed_stage('create_time_series_set')
+    def create_time_series_set(self, freqs: List[str] = ('D', 'W'), dimensions: List[str] = ('total',),
+                               tidy: bool = False):
+        """Crea series de tiempo para varias frecuencias y dimensiones en una sola pasada.
+        
+        Dimensiones válidas: 'total', cualquier columna categórica (company, location,
+        experience_level, ...) y 'tech' (una serie por cada columna mentions_*).
+        """
+        if 'created' not in self.df.columns:
+            logger.warning("No hay columna de fecha para crear series de tiempo")
+            return pd.DataFrame() if tidy else {}
+        
+        from time_series import TimeSeriesBuilder
+        
+        return TimeSeriesBuilder(self.df).build(freqs, dimensions, tidy=tidy)
 
 
-def save_processed_data(df: pd.DataFrame, filename: str, output_dir: str = "data/processed"):
+def save_processed_data(df: pd.DataFrame, filename: str, output_dir: str = "data/processed",
+                        metrics: Optional[PipelineMetrics] = None):
     """Guarda datos procesados"""
     import os
     
     os.makedirs(output_dir, exist_ok=True)
     filepath = os.path.join(output_dir, filename)
     
-    df.to_csv(filepath, index=False, encoding='utf-8')
+    if metrics is None:
+        metrics = PipelineMetrics("processing")
+    # Escritura atómica: quien lea el directorio (p. ej. el API) nunca ve un CSV a medias
+    tmp_path = f"{filepath}.tmp"
+    with metrics.timer('csv_write', rows=len(df)):
+        df.to_csv(tmp_path, index=False, encoding='utf-8')
+        os.replace(tmp_path, filepath)
+    metrics.increment('bytes_written_total', os.path.getsize(filepath))
     logger.info(f"Datos procesados guardados: {filepath}")
     
     return filepath
@@ -229,8 +296,11 @@ def load_and_process_data(filepath: str) -> Tuple[pd.DataFrame, Dict]:
     """Carga y procesa datos desde un archivo CSV"""
     logger.info(f"Cargando datos desde: {filepath}")
     
-    df = pd.read_csv(filepath)
-    processor = JobDataProcessor(df)
+    metrics = PipelineMetrics("analysis")
+    with metrics.timer('csv_read'):
+        df = pd.read_csv(filepath)
+    metrics.add_rows('csv_read', len(df))
+    processor = JobDataProcessor(df, metrics=metrics)
     
     # Procesar datos
     cleaned_df = processor.clean_data()
@@ -238,5 +308,18 @@ def load_and_process_data(filepath: str) -> Tuple[pd.DataFrame, Dict]:
     
     # Obtener estadísticas
     stats = processor.get_summary_stats()
+    metrics.log_summary()
     
     return time_features_df, stats
+
+
+def load_processed_data(filepath: str) -> pd.DataFrame:
+    """Carga un dataset ya procesado (sin repetir la limpieza ni la extracción de características)"""
+    logger.info(f"Cargando datos procesados desde: {filepath}")
+    
+    df = pd.read_csv(filepath)
+    for col in ('created', 'scraped_at'):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    
+    return df
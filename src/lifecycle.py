@@ -0,0 +1,282 @@
+"""
+Ciclo de vida de las vacantes entre crawls
+
+La tabla de ciclo de vida, indexada por ``id``, guarda cuándo se vio cada vacante por
+primera y última vez y cuándo desapareció (``closed_at``). Se actualiza comparando el
+conjunto ordenado de IDs del crawl nuevo contra el de la tabla con búsqueda binaria, sin
+merges de DataFrames. Una vacante que vuelve a aparecer se reabre.
+
+Los crawls son parciales: el planificador de consultas omite las de bajo rendimiento y
+corta la paginación cuando una página está saturada, así que no ver una vacante no
+significa que se haya cerrado. Cada vacante recuerda la consulta que la encontró
+(``search_query``) y una ausencia solo cuenta cuando esa consulta se recorrió completa en
+el crawl (``crawled_queries``: paginada hasta agotar resultados, sin errores ni cortes).
+Sin ``crawled_queries`` el crawl se toma como foto completa.
+Las vacantes sin consulta registrada (tablas anteriores) no suman ausencias en crawls
+parciales hasta que se vuelven a ver.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config import LIFECYCLE_CLOSE_AFTER_MISSES
+from time_series import period_frequency, period_labels
+
+logger = logging.getLogger(__name__)
+
+DATE_COLUMNS = ['first_seen', 'last_seen', 'closed_at']
+DETAIL_COLUMNS = ['company', 'title']
+COLUMNS = ['id'] + DATE_COLUMNS + ['sightings', 'missed_crawls', 'search_query'] + DETAIL_COLUMNS
+
+
+def _empty_table() -> pd.DataFrame:
+    table = pd.DataFrame({column: pd.Series(dtype=object) for column in COLUMNS})
+    for column in DATE_COLUMNS:
+        table[column] = pd.Series(dtype='datetime64[ns]')
+    table['sightings'] = pd.Series(dtype=np.int64)
+    table['missed_crawls'] = pd.Series(dtype=np.int64)
+    return table
+
+
+def _naive_timestamp(value) -> pd.Timestamp:
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    return timestamp
+
+
+class PostingLifecycle:
+    """Tabla de ciclo de vida de vacantes: first_seen, last_seen y closed_at por ``id``"""
+
+    def __init__(self, table: Optional[pd.DataFrame] = None,
+                 close_after_misses: int = LIFECYCLE_CLOSE_AFTER_MISSES):
+        self.close_after_misses = max(close_after_misses, 1)
+        if table is None or table.empty:
+            self.table = _empty_table()
+        else:
+            table = table.assign(id=table['id'].astype(str)).reindex(columns=COLUMNS)
+            # Tablas guardadas antes de registrar la consulta de origen no tienen search_query
+            table['search_query'] = table['search_query'].astype(object)
+            self.table = table.sort_values('id', kind='stable').reset_index(drop=True)[COLUMNS]
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def is_open(self) -> pd.Series:
+        return self.table['closed_at'].isna()
+
+    def update(self, crawl_ids: Iterable, crawl_time=None, details: Optional[pd.DataFrame] = None,
+               crawled_queries: Optional[Iterable[str]] = None) -> Dict:
+        """Incorpora un crawl. Devuelve cuántas vacantes son nuevas, se reabrieron o se cerraron.
+
+        Las vacantes ausentes se cierran tras ``close_after_misses`` crawls consecutivos sin
+        verlas; ``closed_at`` es la fecha del crawl que las cierra. Con ``crawled_queries``
+        solo cuentan como ausentes las vacantes cuya ``search_query`` está en ese conjunto;
+        el resto conserva su contador (``unverified`` en el resumen). ``details`` (con
+        columna ``id``) aporta empresa, título y ``search_query``.
+        """
+        crawl_time = _naive_timestamp(crawl_time if crawl_time is not None else datetime.now())
+        crawl = np.unique(np.asarray([str(job_id) for job_id in crawl_ids], dtype=object))
+        known = self.table['id'].to_numpy(dtype=object)
+
+        # Ambos conjuntos están ordenados: cada ID del crawl se ubica con búsqueda binaria
+        positions = np.searchsorted(known, crawl)
+        found = np.zeros(len(crawl), dtype=bool)
+        if len(known):
+            in_range = positions < len(known)
+            found[in_range] = known[positions[in_range]] == crawl[in_range]
+        seen = np.zeros(len(known), dtype=bool)
+        seen[positions[found]] = True
+
+        lookup = None
+        if details is not None and 'id' in details.columns:
+            lookup = details.assign(id=details['id'].astype(str)).drop_duplicates('id').set_index('id')
+
+        last_seen = self.table['last_seen'].to_numpy(dtype='datetime64[ns]').copy()
+        closed_at = self.table['closed_at'].to_numpy(dtype='datetime64[ns]').copy()
+        sightings = self.table['sightings'].to_numpy(dtype=np.int64).copy()
+        missed = self.table['missed_crawls'].to_numpy(dtype=np.int64).copy()
+        search_query = self.table['search_query'].to_numpy(dtype=object).copy()
+        was_open = np.isnat(closed_at)
+
+        reopened = seen & ~was_open
+        last_seen[seen] = crawl_time.to_datetime64()
+        sightings[seen] += 1
+        missed[seen] = 0
+        closed_at[reopened] = np.datetime64('NaT')
+        if lookup is not None and 'search_query' in lookup.columns:
+            # La consulta más reciente que encontró la vacante
+            latest = lookup['search_query'].reindex(known[seen]).to_numpy(dtype=object)
+            has_query = pd.notna(latest)
+            search_query[np.flatnonzero(seen)[has_query]] = latest[has_query]
+
+        missing = ~seen & was_open
+        if crawled_queries is not None:
+            covered = pd.Series(search_query, dtype=object).isin(set(crawled_queries)).to_numpy()
+            unverified = missing & ~covered
+            missing &= covered
+        else:
+            unverified = np.zeros(len(known), dtype=bool)
+        missed[missing] += 1
+        closing = missing & (missed >= self.close_after_misses)
+        closed_at[closing] = crawl_time.to_datetime64()
+
+        self.table['last_seen'] = last_seen
+        self.table['closed_at'] = closed_at
+        self.table['sightings'] = sightings
+        self.table['missed_crawls'] = missed
+        self.table['search_query'] = search_query
+
+        new_ids = crawl[~found]
+        if len(new_ids):
+            new_rows = pd.DataFrame({
+                'id': new_ids,
+                'first_seen': crawl_time,
+                'last_seen': crawl_time,
+                'closed_at': pd.NaT,
+                'sightings': 1,
+                'missed_crawls': 0,
+            })
+            if lookup is not None:
+                for column in ['search_query'] + DETAIL_COLUMNS:
+                    if column in lookup.columns:
+                        new_rows[column] = lookup[column].reindex(new_ids).to_numpy()
+            new_rows = new_rows.reindex(columns=COLUMNS).astype(self.table.dtypes.to_dict())
+            if not self.table.empty:
+                new_rows = pd.concat([self.table, new_rows], ignore_index=True)
+            self.table = new_rows.sort_values('id', kind='stable').reset_index(drop=True)
+
+        summary = {
+            'crawl_time': crawl_time,
+            'crawl_size': len(crawl),
+            'new': len(new_ids),
+            'reopened': int(reopened.sum()),
+            'closed': int(closing.sum()),
+            'unverified': int(unverified.sum()),
+            'open': int(self.is_open.sum()),
+            'tracked': len(self.table),
+        }
+        logger.info(f"Ciclo de vida: {summary['new']} nuevas, {summary['reopened']} reabiertas, "
+                    f"{summary['closed']} cerradas, {summary['unverified']} sin verificar (consulta no "
+                    f"recorrida), {summary['open']} abiertas de {summary['tracked']}")
+        return summary
+
+    def update_from_dataframe(self, df: pd.DataFrame, crawled_queries: Optional[Iterable[str]] = None) -> Dict:
+        """Incorpora un crawl a partir del DataFrame del scraper (fecha del crawl = ``scraped_at``)"""
+        crawl_time = None
+        if 'scraped_at' in df.columns:
+            scraped_at = pd.to_datetime(df['scraped_at'], errors='coerce').dropna()
+            if not scraped_at.empty:
+                crawl_time = scraped_at.min()
+        return self.update(df['id'], crawl_time, details=df, crawled_queries=crawled_queries)
+
+    def open_postings(self, freq: str = 'D', start=None, end=None) -> pd.Series:
+        """Vacantes abiertas al final de cada periodo, con las etiquetas de periodo de ``resample``"""
+        if self.table.empty:
+            return pd.Series(dtype=int, name='open_postings')
+
+        first_seen = self.table['first_seen'].to_numpy(dtype='datetime64[ns]')
+        closed_at = self.table['closed_at'].to_numpy(dtype='datetime64[ns]')
+        closed_at = closed_at[~np.isnat(closed_at)]
+
+        start = _naive_timestamp(start) if start is not None else pd.Timestamp(first_seen.min())
+        if end is None:
+            end = pd.Timestamp(self.table['last_seen'].max())
+            if len(closed_at):
+                end = max(end, pd.Timestamp(closed_at.max()))
+        end = _naive_timestamp(end)
+
+        period_freq, label_start = period_frequency(freq)
+        periods = pd.period_range(start, end, freq=period_freq)
+        starts = periods.start_time.values
+        last_end = periods.end_time.values[-1]
+
+        # +1 en el periodo de apertura y -1 en el de cierre; la suma acumulada da las abiertas
+        def period_codes(dates):
+            codes = np.searchsorted(starts, dates, side='right') - 1
+            return codes[(codes >= 0) & (dates <= last_end)]
+
+        opened = np.bincount(period_codes(first_seen), minlength=len(periods))
+        closed = np.bincount(period_codes(closed_at), minlength=len(periods))
+        before = int((first_seen < starts[0]).sum()) - int((closed_at < starts[0]).sum())
+
+        counts = before + np.cumsum(opened - closed)
+        return pd.Series(counts, index=period_labels(periods, start=label_start), name='open_postings')
+
+    def time_to_fill(self, by: Optional[str] = None) -> Union[Dict, pd.DataFrame]:
+        """Días entre first_seen y closed_at de las vacantes cerradas (global o por columna)"""
+        closed = self.table[self.table['closed_at'].notna()]
+        days = (closed['closed_at'] - closed['first_seen']).dt.total_seconds() / 86400
+
+        if by is not None:
+            return days.groupby(closed[by]).agg(
+                closed_postings='count', mean_days='mean', median_days='median',
+                p90_days=lambda values: values.quantile(0.9),
+            ).sort_values('closed_postings', ascending=False)
+
+        return {
+            'tracked_postings': len(self.table),
+            'open_postings': int(self.is_open.sum()),
+            'closed_postings': len(closed),
+            'mean_days': float(days.mean()) if len(days) else 0,
+            'median_days': float(days.median()) if len(days) else 0,
+            'p90_days': float(days.quantile(0.9)) if len(days) else 0,
+        }
+
+    def save(self, filepath: str) -> str:
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{filepath}.tmp"
+        self.table.to_csv(tmp_path, index=False, encoding='utf-8')
+        os.replace(tmp_path, filepath)
+
+        logger.info(f"Tabla de ciclo de vida guardada: {filepath} ({len(self)} vacantes)")
+        return filepath
+
+    @classmethod
+    def load(cls, filepath: str, close_after_misses: int = LIFECYCLE_CLOSE_AFTER_MISSES) -> 'PostingLifecycle':
+        """Carga la tabla guardada; si no existe, devuelve una vacía"""
+        if not os.path.exists(filepath):
+            return cls(close_after_misses=close_after_misses)
+
+        table = pd.read_csv(filepath, dtype={'id': str, 'search_query': object, 'company': object, 'title': object},
+                            parse_dates=DATE_COLUMNS)
+        return cls(table, close_after_misses)
+
+
+def add_open_postings(time_series: pd.DataFrame, lifecycle: PostingLifecycle, freq: str = 'D') -> pd.DataFrame:
+    """Agrega la columna ``open_postings`` a una serie de tiempo total indexada por fecha.
+
+    El índice se extiende para cubrir también los periodos en que hubo crawls.
+    """
+    open_postings = lifecycle.open_postings(freq)
+    if open_postings.empty:
+        time_series = time_series.copy()
+        time_series['open_postings'] = 0
+        return time_series
+
+    index = time_series.index
+    tz = getattr(index, 'tz', None)
+    if tz is not None:
+        open_postings.index = open_postings.index.tz_localize(tz)
+    open_postings.index.name = index.name
+
+    combined = time_series.reindex(index.union(open_postings.index))
+    if 'cumulative_jobs' in combined.columns:
+        combined['cumulative_jobs'] = combined['cumulative_jobs'].ffill()
+    combined = combined.fillna(0)
+    for column in ('job_count', 'cumulative_jobs'):
+        if column in combined.columns:
+            combined[column] = combined[column].astype(int)
+
+    # Antes del primer crawl no hay información de vacantes abiertas
+    combined['open_postings'] = open_postings.reindex(combined.index).ffill().fillna(0).astype(int)
+    return combined
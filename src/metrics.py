@@ -0,0 +1,214 @@
+"""
+Instrumentación de rendimiento para el scraper y el pipeline de procesamiento
+
+Registra tiempos por etapa, contadores, gauges, histogramas de latencia, bytes transferidos,
+filas por segundo y memoria pico, y los exporta como reporte JSON o en formato de
+texto de Prometheus.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Límites (en segundos) de los buckets del histograma de latencia de requests
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PipelineMetrics:
+    """Registro de métricas de una ejecución del pipeline"""
+
+    def __init__(self, run_name: str = "pipeline"):
+        self.run_name = run_name
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.timers: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.rows: Dict[str, int] = {}
+        self.histograms: Dict[str, Dict] = {}
+
+    @contextmanager
+    def timer(self, stage: str, rows: Optional[int] = None):
+        """Mide el tiempo de una etapa; se acumula si la etapa se ejecuta varias veces"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(stage, time.perf_counter() - start, rows)
+
+    def record_time(self, stage: str, seconds: float, rows: Optional[int] = None):
+        """Registra una duración medida externamente"""
+        with self._lock:
+            entry = self.timers.setdefault(stage, {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            entry['calls'] += 1
+            entry['total_seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+            if rows is not None:
+                self.rows[stage] = self.rows.get(stage, 0) + rows
+
+    def add_rows(self, stage: str, rows: int):
+        """Agrega filas procesadas a una etapa para calcular filas por segundo"""
+        with self._lock:
+            self.rows[stage] = self.rows.get(stage, 0) + rows
+
+    def increment(self, name: str, value: float = 1):
+        """Incrementa un contador"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """Fija el valor actual de una métrica que no es acumulativa (proporciones, latencias)"""
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float, buckets: Iterable[float] = LATENCY_BUCKETS):
+        """Registra una observación en un histograma acumulativo"""
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                bounds = sorted(buckets)
+                hist = {'buckets': bounds, 'counts': [0] * len(bounds), 'count': 0, 'sum': 0.0}
+                self.histograms[name] = hist
+
+            for i, bound in enumerate(hist['buckets']):
+                if value <= bound:
+                    hist['counts'][i] += 1
+            hist['count'] += 1
+            hist['sum'] += value
+
+    @staticmethod
+    def peak_memory_mb() -> Optional[float]:
+        """Memoria residente pico del proceso en MB (None si no está disponible)"""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta KB, macOS reporta bytes
+        if os.uname().sysname == 'Darwin':
+            return peak / (1024 * 1024)
+        return peak / 1024
+
+    def report(self) -> Dict:
+        """Genera el reporte completo de la ejecución"""
+        with self._lock:
+            stages = {}
+            for stage, entry in self.timers.items():
+                stage_report = dict(entry)
+                rows = self.rows.get(stage)
+                if rows is not None:
+                    stage_report['rows'] = rows
+                    stage_report['rows_per_second'] = rows / entry['total_seconds'] if entry['total_seconds'] > 0 else None
+                stages[stage] = stage_report
+
+            return {
+                'run_name': self.run_name,
+                'started_at': self.started_at.isoformat(),
+                'elapsed_seconds': time.perf_counter() - self._start,
+                'peak_memory_mb': self.peak_memory_mb(),
+                'stages': stages,
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'histograms': {name: dict(hist) for name, hist in self.histograms.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """Serializa las métricas en formato de texto de Prometheus"""
+        report = self.report()
+        run = report['run_name']
+        lines = []
+
+        lines.append('# TYPE jalisco_stage_seconds_total counter')
+        for stage, entry in report['stages'].items():
+            lines.append(f'jalisco_stage_seconds_total{{run="{run}",stage="{stage}"}} {entry["total_seconds"]:.6f}')
+        lines.append('# TYPE jalisco_stage_calls_total counter')
+        for stage, entry in report['stages'].items():
+            lines.append(f'jalisco_stage_calls_total{{run="{run}",stage="{stage}"}} {entry["calls"]}')
+        lines.append('# TYPE jalisco_stage_rows_total counter')
+        for stage, entry in report['stages'].items():
+            if 'rows' in entry:
+                lines.append(f'jalisco_stage_rows_total{{run="{run}",stage="{stage}"}} {entry["rows"]}')
+
+        for name, value in report['counters'].items():
+            lines.append(f'# TYPE jalisco_{name} counter')
+            lines.append(f'jalisco_{name}{{run="{run}"}} {value}')
+
+        for name, value in report['gauges'].items():
+            lines.append(f'# TYPE jalisco_{name} gauge')
+            lines.append(f'jalisco_{name}{{run="{run}"}} {value}')
+
+        for name, hist in report['histograms'].items():
+            lines.append(f'# TYPE jalisco_{name} histogram')
+            for bound, count in zip(hist['buckets'], hist['counts']):
+                lines.append(f'jalisco_{name}_bucket{{run="{run}",le="{bound}"}} {count}')
+            lines.append(f'jalisco_{name}_bucket{{run="{run}",le="+Inf"}} {hist["count"]}')
+            lines.append(f'jalisco_{name}_sum{{run="{run}"}} {hist["sum"]:.6f}')
+            lines.append(f'jalisco_{name}_count{{run="{run}"}} {hist["count"]}')
+
+        lines.append('# TYPE jalisco_elapsed_seconds gauge')
+        lines.append(f'jalisco_elapsed_seconds{{run="{run}"}} {report["elapsed_seconds"]:.6f}')
+        if report['peak_memory_mb'] is not None:
+            lines.append('# TYPE jalisco_peak_memory_megabytes gauge')
+            lines.append(f'jalisco_peak_memory_megabytes{{run="{run}"}} {report["peak_memory_mb"]:.2f}')
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, output_dir: str, fmt: str = 'json', filename: Optional[str] = None) -> list:
+        """Exporta el reporte como JSON, Prometheus o ambos ('both'). Devuelve las rutas escritas"""
+        os.makedirs(output_dir, exist_ok=True)
+        if filename is None:
+            filename = f"{self.run_name}_metrics_{self.started_at.strftime('%Y%m%d_%H%M%S')}"
+
+        paths = []
+        if fmt in ('json', 'both'):
+            path = os.path.join(output_dir, f"{filename}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, indent=2, default=str)
+            paths.append(path)
+
+        if fmt in ('prometheus', 'both'):
+            path = os.path.join(output_dir, f"{filename}.prom")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            paths.append(path)
+
+        for path in paths:
+            logger.info(f"Reporte de métricas guardado: {path}")
+        return paths
+
+    def log_summary(self):
+        """Escribe en el log un resumen de las etapas ordenadas por tiempo total"""
+        report = self.report()
+        logger.info(f"Métricas de '{self.run_name}' ({report['elapsed_seconds']:.2f}s totales):")
+        for stage, entry in sorted(report['stages'].items(), key=lambda x: x[1]['total_seconds'], reverse=True):
+            line = f"  - {stage}: {entry['total_seconds']:.3f}s en {entry['calls']} llamadas"
+            if entry.get('rows_per_second'):
+                line += f" ({entry['rows_per_second']:,.0f} filas/s)"
+            logger.info(line)
+
+
+def timed_stage(stage: str):
+    """Decorador para métodos de objetos con atributos ``metrics`` y ``df``.
+
+    Mide la duración de la llamada y usa el número de filas de ``self.df`` para
+    calcular el rendimiento de la etapa.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer(stage, rows=len(self.df)):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,213 @@
+"""
+Planificador adaptativo de consultas para el scraper de Adzuna
+
+Registra, entre ejecuciones, cuántos IDs únicos aporta cada consulta (what, where)
+y usa esas estadísticas para priorizar las consultas más productivas, omitir las
+redundantes y detener la paginación cuando los resultados ya están saturados.
+
+El aporte de una consulta no depende de su posición en el plan: al cerrar la
+ejecución, cada ID se reparte en partes iguales entre las consultas que lo
+devolvieron. Así una consulta que corre al final no parece redundante solo
+porque las anteriores ya vieron sus IDs.
+"""
+
+import json
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import (
+    QUERY_STATS_FILE, MIN_NEW_ID_RATE, PAGE_SATURATION_RATE,
+    MIN_QUERY_RUNS, QUERY_REPROBE_EVERY, QUERY_STATS_DECAY
+)
+
+logger = logging.getLogger(__name__)
+
+# Consulta planificada: (what, where, max_pages)
+Query = Tuple[str, str, int]
+
+
+class QueryPlanner:
+    """Prioriza y poda consultas según su rendimiento histórico de IDs únicos"""
+
+    def __init__(self, stats_file: str = QUERY_STATS_FILE,
+                 min_new_id_rate: float = MIN_NEW_ID_RATE,
+                 saturation_rate: float = PAGE_SATURATION_RATE,
+                 min_runs: int = MIN_QUERY_RUNS,
+                 reprobe_every: int = QUERY_REPROBE_EVERY,
+                 decay: float = QUERY_STATS_DECAY):
+        self.stats_file = stats_file
+        self.min_new_id_rate = min_new_id_rate
+        self.saturation_rate = saturation_rate
+        self.min_runs = min_runs
+        self.reprobe_every = reprobe_every
+        self.decay = decay
+        self.run_count = 0
+        self.stats: Dict[str, Dict] = {}
+        self._current: Dict[str, Dict] = {}
+        self.load()
+
+    @staticmethod
+    def query_key(what: str, where: str) -> str:
+        """Clave estable para una consulta"""
+        return f"{what.strip().lower()}|{where.strip().lower()}"
+
+    def load(self):
+        """Carga las estadísticas de ejecuciones anteriores si existen"""
+        if not os.path.exists(self.stats_file):
+            return
+
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.run_count = data.get('run_count', 0)
+            self.stats = data.get('queries', {})
+            logger.info(f"Estadísticas de consultas cargadas: {len(self.stats)} consultas, "
+                        f"{self.run_count} ejecuciones previas")
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"No se pudieron cargar estadísticas de consultas ({e}). Se inicia desde cero.")
+            self.run_count = 0
+            self.stats = {}
+
+    def save(self):
+        """Persiste las estadísticas acumuladas"""
+        directory = os.path.dirname(self.stats_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {
+            'run_count': self.run_count,
+            'updated_at': datetime.now().isoformat(),
+            'queries': self.stats,
+        }
+        tmp_path = f"{self.stats_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.stats_file)
+
+        logger.info(f"Estadísticas de consultas guardadas: {self.stats_file}")
+
+    def expected_yield(self, what: str, where: str) -> float:
+        """Tasa esperada de IDs nuevos por resultado (1.0 si la consulta no tiene historial)"""
+        entry = self.stats.get(self.query_key(what, where))
+        if not entry or entry.get('runs', 0) == 0:
+            return 1.0
+        return entry.get('new_id_rate', 1.0)
+
+    def expected_new_per_request(self, what: str, where: str) -> float:
+        """IDs nuevos esperados por request a la API, usado para ordenar consultas"""
+        entry = self.stats.get(self.query_key(what, where))
+        if not entry or entry.get('runs', 0) == 0:
+            return float('inf')
+        return entry.get('new_per_request', 0.0)
+
+    def plan(self, queries: Iterable[Query]) -> List[Query]:
+        """Ordena las consultas por rendimiento esperado y omite las de bajo aporte"""
+        self.run_count += 1
+        self._current = {}
+        reprobe = self.reprobe_every > 0 and self.run_count % self.reprobe_every == 0
+
+        planned = []
+        skipped = 0
+        for position, (what, where, max_pages) in enumerate(queries):
+            entry = self.stats.get(self.query_key(what, where), {})
+            runs = entry.get('runs', 0)
+
+            if (not reprobe and runs >= self.min_runs
+                    and self.expected_yield(what, where) < self.min_new_id_rate):
+                skipped += 1
+                continue
+
+            planned.append((position, (what, where, max_pages)))
+
+        # Primero las consultas sin historial (exploración), luego por IDs nuevos por request;
+        # el orden original desempata
+        planned.sort(key=lambda item: (-self.expected_new_per_request(item[1][0], item[1][1]), item[0]))
+
+        logger.info(f"Plan de consultas: {len(planned)} a ejecutar, {skipped} omitidas por bajo rendimiento"
+                    + (" (ejecución de re-sondeo)" if reprobe else ""))
+        return [query for _, query in planned]
+
+    def _current_entry(self, what: str, where: str) -> Dict:
+        return self._current.setdefault(self.query_key(what, where),
+                                        {'requests': 0, 'results': 0, 'ids': set()})
+
+    def record_page(self, what: str, where: str, job_ids: List[str], seen_ids: set) -> int:
+        """Registra una página de resultados y devuelve cuántos IDs no se habían visto en la ejecución.
+
+        Los IDs nuevos se agregan a ``seen_ids``. El valor devuelto sirve para deduplicar y
+        detectar saturación; el aporte de la consulta se calcula en ``finish_run``.
+        """
+        current = self._current_entry(what, where)
+        new_ids = 0
+        for job_id in job_ids:
+            if job_id not in seen_ids:
+                seen_ids.add(job_id)
+                new_ids += 1
+
+        current['requests'] += 1
+        current['results'] += len(job_ids)
+        current['ids'].update(job_ids)
+        return new_ids
+
+    def record_request(self, what: str, where: str):
+        """Registra un request sin resultados utilizables (error o página vacía)"""
+        self._current_entry(what, where)['requests'] += 1
+
+    def is_saturated(self, page_results: int, page_new_ids: int) -> bool:
+        """Indica si una página aportó tan pocos IDs nuevos que no vale la pena seguir paginando"""
+        if page_results == 0:
+            return True
+        return page_new_ids / page_results < self.saturation_rate
+
+    def finish_run(self):
+        """Integra las estadísticas de la ejecución actual al historial y las guarda"""
+        # Cuántas consultas devolvieron cada ID; cada una se lleva 1/n del ID
+        returned_by = Counter(job_id for current in self._current.values() for job_id in current['ids'])
+
+        for key, current in self._current.items():
+            new_ids = sum(1 / returned_by[job_id] for job_id in current['ids'])
+
+            entry = self.stats.setdefault(key, {
+                'runs': 0, 'requests': 0, 'results': 0, 'new_ids': 0,
+                'new_id_rate': 1.0, 'new_per_request': 0.0,
+            })
+
+            run_rate = new_ids / current['results'] if current['results'] else 0.0
+            run_per_request = new_ids / current['requests'] if current['requests'] else 0.0
+
+            # Promedio exponencial para que el planificador se adapte a cambios del mercado
+            if entry['runs'] == 0:
+                entry['new_id_rate'] = run_rate
+                entry['new_per_request'] = run_per_request
+            else:
+                entry['new_id_rate'] = self.decay * entry['new_id_rate'] + (1 - self.decay) * run_rate
+                entry['new_per_request'] = (self.decay * entry['new_per_request']
+                                            + (1 - self.decay) * run_per_request)
+
+            entry['runs'] += 1
+            entry['requests'] += current['requests']
+            entry['results'] += current['results']
+            entry['new_ids'] = round(entry['new_ids'] + new_ids, 3)
+            entry['overlap_rate'] = 1 - entry['new_ids'] / entry['results'] if entry['results'] else 0.0
+            entry['last_run'] = datetime.now().isoformat()
+
+        total_requests = sum(c['requests'] for c in self._current.values())
+        total_new = len(returned_by)
+        if total_requests:
+            logger.info(f"Rendimiento de la ejecución: {total_new} IDs únicos en {total_requests} requests "
+                        f"({total_new / total_requests:.1f} por request)")
+
+        self._current = {}
+        self.save()
+
+    def summary(self, top: Optional[int] = 10) -> List[Dict]:
+        """Devuelve las consultas ordenadas por IDs nuevos por request"""
+        rows = []
+        for key, entry in self.stats.items():
+            what, where = key.split('|', 1)
+            rows.append({'what': what, 'where': where, **entry})
+        rows.sort(key=lambda row: row.get('new_per_request', 0.0), reverse=True)
+        return rows[:top] if top else rows
@@ -0,0 +1,260 @@
+"""
+Archivo comprimido de las respuestas crudas de la API de Adzuna y su reprocesamiento
+
+Cada página descargada se guarda como una línea JSONL comprimida en un frame
+independiente (zstd si ``zstandard`` está instalado, gzip en caso contrario) dentro de
+segmentos de solo-anexado. Un índice JSONL registra segmento, offset y longitud de cada
+página, lo que permite leer páginas sueltas y reprocesar segmentos en paralelo: cada
+proceso extrae, limpia y crea las características de un segmento completo y devuelve un
+DataFrame ya procesado.
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from config import RAW_ARCHIVE_DIR, RAW_ARCHIVE_SEGMENT_MB, RAW_ARCHIVE_LEVEL
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'index.jsonl'
+EXTENSIONS = {'zstd': 'jsonl.zst', 'gzip': 'jsonl.gz'}
+
+
+def _compress(data: bytes, codec: str, level: int) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=min(level, 9))
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ImportError("Se requiere 'zstandard' para leer segmentos zstd: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class RawPageArchive:
+    """Archivo de páginas crudas en segmentos comprimidos de solo-anexado con índice de offsets"""
+
+    def __init__(self, archive_dir: str = RAW_ARCHIVE_DIR, segment_max_bytes: int = RAW_ARCHIVE_SEGMENT_MB * 1024 * 1024,
+                 level: int = RAW_ARCHIVE_LEVEL, codec: Optional[str] = None):
+        self.archive_dir = archive_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.level = level
+        self.codec = codec or ('zstd' if zstandard is not None else 'gzip')
+        if self.codec == 'zstd' and zstandard is None:
+            raise ImportError("Se requiere 'zstandard' para el codec zstd: pip install zstandard")
+        if self.codec == 'gzip' and codec is None:
+            logger.warning("'zstandard' no está instalado; el archivo crudo usará gzip")
+
+        self.index_path = os.path.join(archive_dir, INDEX_FILENAME)
+        self._segment_file = None
+        self._segment_name = None
+        self._index_file = None
+        self.pages_written = 0
+        self.bytes_written = 0
+
+    def _open_segment(self):
+        """Abre el segmento actual o crea uno nuevo si el último alcanzó el tamaño máximo"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        extension = EXTENSIONS[self.codec]
+        segments = sorted(f for f in os.listdir(self.archive_dir) if f.endswith(extension))
+
+        number = 1
+        if segments:
+            last = segments[-1]
+            number = int(last.split('_')[1].split('.')[0])
+            if os.path.getsize(os.path.join(self.archive_dir, last)) >= self.segment_max_bytes:
+                number += 1
+
+        self._segment_name = f"segment_{number:06d}.{extension}"
+        self._segment_file = open(os.path.join(self.archive_dir, self._segment_name), 'ab')
+        if self._index_file is None:
+            self._index_file = open(self.index_path, 'a', encoding='utf-8')
+
+    def append_page(self, what: str, where: str, page: int, payload: bytes,
+                    fetched_at: Optional[str] = None) -> Dict:
+        """Agrega una respuesta cruda de la API. Devuelve la entrada de índice escrita"""
+        if self._segment_file is None or self._segment_file.tell() >= self.segment_max_bytes:
+            self.close()
+            self._open_segment()
+
+        # La respuesta se guarda tal cual; solo se re-serializa si trae saltos de línea
+        if b'\n' in payload:
+            payload = json.dumps(json.loads(payload), ensure_ascii=False).encode('utf-8')
+
+        fetched_at = fetched_at or datetime.now().isoformat()
+        meta = json.dumps({'what': what, 'where': where, 'page': page, 'fetched_at': fetched_at},
+                          ensure_ascii=False).encode('utf-8')
+        line = b'{"meta": ' + meta + b', "response": ' + payload + b'}\n'
+        frame = _compress(line, self.codec, self.level)
+
+        offset = self._segment_file.tell()
+        self._segment_file.write(frame)
+        self._segment_file.flush()
+
+        entry = {
+            'segment': self._segment_name, 'offset': offset, 'length': len(frame), 'codec': self.codec,
+            'what': what, 'where': where, 'page': page, 'fetched_at': fetched_at, 'raw_bytes': len(line),
+        }
+        # El índice se escribe después del frame, así nunca apunta a datos incompletos
+        self._index_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._index_file.flush()
+
+        self.pages_written += 1
+        self.bytes_written += len(frame)
+        return entry
+
+    def close(self):
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_index(self, since: Optional[str] = None) -> List[Dict]:
+        """Entradas del índice, opcionalmente solo las descargadas desde una fecha ISO"""
+        return read_index(self.archive_dir, since)
+
+    def read_page(self, entry: Dict) -> Dict:
+        """Lee una sola página usando su offset del índice"""
+        with open(os.path.join(self.archive_dir, entry['segment']), 'rb') as f:
+            f.seek(entry['offset'])
+            return json.loads(_decompress(f.read(entry['length']), entry['codec']))
+
+    def iter_pages(self, since: Optional[str] = None) -> Iterator[Dict]:
+        """Itera todas las páginas archivadas en orden de escritura"""
+        for segment, entries in _group_by_segment(self.read_index(since)).items():
+            yield from _read_segment_pages(self.archive_dir, segment, entries)
+
+
+def read_index(archive_dir: str, since: Optional[str] = None) -> List[Dict]:
+    """Entradas del índice de un archivo, opcionalmente solo las descargadas desde una fecha ISO"""
+    index_path = os.path.join(archive_dir, INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        return []
+
+    entries = []
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if since is None or entry['fetched_at'] >= since:
+                entries.append(entry)
+    return entries
+
+
+def _group_by_segment(entries: List[Dict]) -> Dict[str, List[Dict]]:
+    grouped = defaultdict(list)
+    for entry in entries:
+        grouped[entry['segment']].append(entry)
+    return dict(sorted(grouped.items()))
+
+
+def _read_segment_pages(archive_dir: str, segment: str, entries: List[Dict]) -> Iterator[Dict]:
+    """Lee las páginas de un segmento con una sola lectura secuencial del archivo"""
+    with open(os.path.join(archive_dir, segment), 'rb') as f:
+        data = f.read()
+    for entry in sorted(entries, key=lambda e: e['offset']):
+        frame = data[entry['offset']:entry['offset'] + entry['length']]
+        yield json.loads(_decompress(frame, entry['codec']))
+
+
+_worker_scraper = None
+
+
+def _replay_segment(args) -> pd.DataFrame:
+    """Extrae y procesa los empleos de un segmento (se ejecuta en un proceso del pool).
+
+    Las filas se convierten en DataFrame dentro del proceso, así que al proceso principal
+    solo regresa la tabla del segmento (limpia y con características si ``process``).
+    """
+    global _worker_scraper
+    archive_dir, segment, entries, process = args
+
+    if _worker_scraper is None:
+        from scraper import AdzunaJobScraper
+        _worker_scraper = AdzunaJobScraper()
+
+    rows = []
+    for page in _read_segment_pages(archive_dir, segment, entries):
+        fetched_at = page['meta']['fetched_at']
+        for job in page['response'].get('results', []):
+            details = _worker_scraper.extract_job_details(job)
+            if details:
+                details['scraped_at'] = fetched_at
+                rows.append(details)
+
+    df = _worker_scraper.build_dataset(rows)
+    if process and not df.empty:
+        from data_processor import JobDataProcessor
+
+        processor = JobDataProcessor(df, metrics=_worker_scraper.metrics)
+        processor.clean_data()
+        df = processor.create_time_features()
+    return df
+
+
+def iter_replay(archive_dir: str = RAW_ARCHIVE_DIR, since: Optional[str] = None,
+                n_jobs: Optional[int] = None, process: bool = True) -> Iterator[pd.DataFrame]:
+    """Reprocesa las páginas archivadas un segmento por proceso y entrega un DataFrame por segmento.
+
+    Los segmentos se entregan en orden de escritura, con ``scraped_at`` igual a la fecha de
+    descarga original y sin duplicados dentro de cada segmento. Con ``process`` cada
+    segmento ya pasó por ``clean_data`` y ``create_time_features``.
+    """
+    grouped = _group_by_segment(read_index(archive_dir, since))
+    if not grouped:
+        logger.warning(f"No hay páginas archivadas en {archive_dir}")
+        return
+
+    tasks = [(archive_dir, segment, entries, process) for segment, entries in grouped.items()]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+    logger.info(f"Reprocesando {sum(len(e) for e in grouped.values())} páginas de {len(tasks)} segmentos "
+                f"con {n_jobs} procesos")
+
+    if n_jobs == 1:
+        for task in tasks:
+            yield _replay_segment(task)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            yield from executor.map(_replay_segment, tasks)
+
+
+def replay_archive(archive_dir: str = RAW_ARCHIVE_DIR, since: Optional[str] = None,
+                   n_jobs: Optional[int] = None, process: bool = True) -> pd.DataFrame:
+    """Combina los segmentos de ``iter_replay`` en un solo DataFrame sin IDs duplicados.
+
+    Como en ``build_dataset``, cada empleo conserva su primera aparición en el archivo.
+    """
+    frames = [df for df in iter_replay(archive_dir, since, n_jobs, process) if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    combined = pd.concat(frames, ignore_index=True)
+    combined = combined.drop_duplicates(subset=['id'], keep='first', ignore_index=True)
+    logger.info(f"Reprocesamiento completado: {len(combined)} empleos únicos")
+    return combined
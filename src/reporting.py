@@ -0,0 +1,290 @@
+"""
+Reporte estático de las gráficas del EDA (PNG + índice HTML)
+
+Reproduce las gráficas de los notebooks (mapa de correlación, menciones de tecnologías,
+tipo de trabajo, mapa de ubicaciones y tendencias por cluster) sin intervención manual:
+los agregados se calculan una sola vez sobre el DataFrame y cada gráfica recibe solo
+sus datos resumidos. Las gráficas se dibujan con el backend ``Agg`` en un pool de
+procesos. El mapa interactivo con folium se genera solo si la librería está instalada.
+"""
+
+import html
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import REPORT_DIR, REPORT_CLUSTERS
+from metrics import PipelineMetrics
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = ['remote', 'hybrid', 'onsite']
+CLUSTER_KEY_TECHS = ['mentions_python', 'mentions_cloud', 'mentions_machine_learning']
+
+
+def _job_type(df: pd.DataFrame) -> pd.Series:
+    """Tipo de trabajo en una sola columna (remote > hybrid > onsite, como en el notebook de EDA)"""
+    conditions = [df[f'is_{job_type}'].fillna(False).astype(bool) if f'is_{job_type}' in df.columns
+                  else pd.Series(False, index=df.index) for job_type in JOB_TYPES[:2]]
+    return pd.Series(np.select(conditions, JOB_TYPES[:2], default='onsite'), index=df.index)
+
+
+def _assign_clusters(df: pd.DataFrame, tech_columns: List[str], n_clusters: int) -> Optional[np.ndarray]:
+    """Clusters con PCA (95% de varianza) + K-Means sobre tecnologías, salario y tipo de trabajo"""
+    job_type_columns = [f'is_{job_type}' for job_type in JOB_TYPES if f'is_{job_type}' in df.columns]
+    if not tech_columns or len(df) < n_clusters:
+        return None
+
+    from sklearn.cluster import KMeans
+    from sklearn.decomposition import PCA
+
+    features = df[tech_columns + job_type_columns].fillna(False).astype(float)
+    if 'salary_avg' in df.columns:
+        salary = pd.to_numeric(df['salary_avg'], errors='coerce')
+        salary = salary.fillna(salary.median()) if salary.notna().any() else salary.fillna(0)
+        std = salary.std()
+        features['salary_norm'] = (salary - salary.mean()) / std if std > 0 else 0.0
+
+    components = PCA(n_components=0.95).fit_transform(features.to_numpy())
+    return KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit_predict(components)
+
+
+def compute_report_data(df: pd.DataFrame, n_clusters: int = REPORT_CLUSTERS) -> Dict[str, Dict]:
+    """Calcula una sola vez los agregados de todas las gráficas. Devuelve {gráfica: datos}"""
+    data = {}
+    tech_columns = [col for col in df.columns if col.startswith('mentions_')]
+
+    numeric = df.select_dtypes(include=['int64', 'float64'])
+    if numeric.shape[1] >= 2:
+        data['correlation'] = {'matrix': numeric.corr()}
+
+    if tech_columns:
+        counts = df[tech_columns].fillna(False).astype(int).sum()
+        counts.index = counts.index.str.replace('mentions_', '', regex=False)
+        data['tech_mentions'] = {'counts': counts}
+
+    job_type = _job_type(df)
+    data['job_type'] = {'counts': job_type.value_counts().reindex(JOB_TYPES, fill_value=0)}
+
+    if {'latitude', 'longitude'} <= set(df.columns):
+        points = df[['latitude', 'longitude', 'company']].copy() if 'company' in df.columns \
+            else df[['latitude', 'longitude']].assign(company='')
+        points['latitude'] = pd.to_numeric(points['latitude'], errors='coerce')
+        points['longitude'] = pd.to_numeric(points['longitude'], errors='coerce')
+        points = points.dropna(subset=['latitude', 'longitude'])
+        if not points.empty:
+            # Un punto por coordenada con el número de empleos y la empresa más frecuente
+            by_company = points.groupby(['latitude', 'longitude', 'company'], sort=False, dropna=False).size()
+            by_company = by_company.rename('company_jobs').reset_index()
+            jobs = by_company.groupby(['latitude', 'longitude'], sort=False)['company_jobs'].transform('sum')
+            locations = (by_company.assign(jobs=jobs)
+                         .sort_values('company_jobs', ascending=False, kind='stable')
+                         .drop_duplicates(['latitude', 'longitude'])
+                         [['latitude', 'longitude', 'jobs', 'company']]
+                         .reset_index(drop=True))
+            data['job_map'] = {'locations': locations}
+
+    clusters = _assign_clusters(df, tech_columns, n_clusters)
+    if clusters is not None:
+        key_techs = [col for col in CLUSTER_KEY_TECHS if col in tech_columns]
+        if key_techs:
+            means = df[key_techs].fillna(False).astype(float).groupby(clusters).mean()
+            means.columns = means.columns.str.replace('mentions_', '', regex=False)
+            data['cluster_tech'] = {'means': means}
+
+        if 'created' in df.columns:
+            created = pd.to_datetime(df['created'], errors='coerce')
+            if created.dt.tz is not None:
+                created = created.dt.tz_convert(None)
+            weeks = created.dt.to_period('W')
+            valid = weeks.notna().to_numpy()
+            trends = pd.crosstab(weeks[valid], clusters[valid])
+            if not trends.empty:
+                trends.index = trends.index.start_time
+                data['cluster_trends'] = {'trends': trends}
+
+    return data
+
+
+def _plot_correlation(plt, data: Dict):
+    import seaborn as sns
+
+    matrix = data['matrix']
+    size = max(8, 0.6 * len(matrix))
+    fig, ax = plt.subplots(figsize=(size, size * 0.8))
+    sns.heatmap(matrix, annot=len(matrix) <= 15, fmt='.2f', cmap='coolwarm', center=0, ax=ax)
+    ax.set_title('Correlación entre variables numéricas')
+    return fig
+
+
+def _plot_tech_mentions(plt, data: Dict):
+    import seaborn as sns
+
+    counts = data['counts'].sort_values(ascending=False)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.barplot(x=counts.index, y=counts.values, ax=ax)
+    ax.set_xlabel('Tecnología')
+    ax.set_ylabel('Conteo')
+    ax.set_title('Menciones de tecnologías')
+    ax.tick_params(axis='x', rotation=45)
+    return fig
+
+
+def _plot_job_type(plt, data: Dict):
+    import seaborn as sns
+
+    counts = data['counts']
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.barplot(x=[job_type.title() for job_type in counts.index], y=counts.values, ax=ax)
+    ax.set_xlabel('Tipo de Trabajo')
+    ax.set_ylabel('Conteo')
+    ax.set_title('Empleos por tipo de trabajo')
+    return fig
+
+
+def _plot_job_map(plt, data: Dict):
+    locations = data['locations']
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sizes = 20 + 180 * locations['jobs'] / locations['jobs'].max()
+    ax.scatter(locations['longitude'], locations['latitude'], s=sizes, alpha=0.5, color='tab:blue')
+    ax.set_xlabel('Longitud')
+    ax.set_ylabel('Latitud')
+    ax.set_title('Ubicación de los empleos (tamaño = número de empleos)')
+    return fig
+
+
+def _plot_cluster_tech(plt, data: Dict):
+    means = data['means']
+    fig, axes = plt.subplots(1, means.shape[1], figsize=(4 * means.shape[1], 4), squeeze=False)
+    for ax, tech in zip(axes[0], means.columns):
+        means[tech].plot(kind='bar', color='skyblue', ax=ax)
+        ax.set_title(tech)
+        ax.set_xlabel('Cluster')
+        ax.tick_params(axis='x', rotation=0)
+    fig.suptitle('Tecnologías clave por cluster')
+    return fig
+
+
+def _plot_cluster_trends(plt, data: Dict):
+    fig, ax = plt.subplots(figsize=(12, 5))
+    data['trends'].plot(ax=ax)
+    ax.set_title('Tendencia semanal de publicaciones por cluster')
+    ax.set_ylabel('Número de empleos')
+    ax.set_xlabel('Semana')
+    ax.legend(title='Cluster')
+    return fig
+
+
+# Gráficas del reporte en orden de aparición: nombre -> (título, función de dibujo)
+CHARTS: Dict[str, Tuple[str, Callable]] = {
+    'correlation': ('Mapa de correlación', _plot_correlation),
+    'tech_mentions': ('Tecnologías más mencionadas', _plot_tech_mentions),
+    'job_type': ('Tipo de trabajo', _plot_job_type),
+    'job_map': ('Mapa de empleos', _plot_job_map),
+    'cluster_tech': ('Tecnologías clave por cluster', _plot_cluster_tech),
+    'cluster_trends': ('Tendencias por cluster', _plot_cluster_trends),
+}
+
+
+def _render_chart(args) -> Tuple[str, str, float]:
+    """Dibuja y guarda una gráfica como PNG (se ejecuta en un proceso del pool)"""
+    name, data, output_dir = args
+    start = time.perf_counter()
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig = CHARTS[name][1](plt, data)
+    filepath = os.path.join(output_dir, f"{name}.png")
+    fig.tight_layout()
+    fig.savefig(filepath, dpi=100)
+    plt.close(fig)
+    return name, filepath, time.perf_counter() - start
+
+
+def save_folium_map(locations: pd.DataFrame, filepath: str) -> Optional[str]:
+    """Mapa interactivo con folium (opcional). Devuelve la ruta o None si folium no está instalado"""
+    try:
+        import folium
+    except ImportError:
+        logger.info("folium no está instalado; se omite el mapa interactivo")
+        return None
+
+    job_map = folium.Map(location=[locations['latitude'].mean(), locations['longitude'].mean()], zoom_start=10)
+    for row in locations.itertuples(index=False):
+        label = f"{row.company} ({row.jobs} empleos)"
+        folium.CircleMarker(location=[row.latitude, row.longitude], radius=5 + min(row.jobs, 20),
+                            color='blue', fill=True, fill_color='blue', popup=label, tooltip=label).add_to(job_map)
+    job_map.save(filepath)
+    return filepath
+
+
+def _write_index(output_dir: str, charts: Dict[str, str], summary: Dict, map_path: Optional[str]) -> str:
+    """Escribe el índice HTML del reporte"""
+    rows = ''.join(f"<tr><th>{html.escape(str(key))}</th><td>{html.escape(str(value))}</td></tr>"
+                   for key, value in summary.items())
+    sections = ''.join(
+        f"<section><h2>{html.escape(CHARTS[name][0])}</h2>"
+        f"<img src=\"{html.escape(os.path.basename(path))}\" alt=\"{html.escape(name)}\"></section>"
+        for name, path in charts.items()
+    )
+    map_link = (f"<p><a href=\"{html.escape(os.path.basename(map_path))}\">Mapa interactivo</a></p>"
+                if map_path else '')
+
+    page = (
+        "<!DOCTYPE html>\n<html lang=\"es\"><head><meta charset=\"utf-8\">"
+        "<title>Empleos Big Tech en Jalisco</title>"
+        "<style>body{font-family:sans-serif;margin:2em}img{max-width:100%}"
+        "table{border-collapse:collapse}th,td{border:1px solid #ccc;padding:4px 8px;text-align:left}</style>"
+        "</head><body>"
+        f"<h1>Empleos Big Tech en Jalisco</h1><p>Generado: {datetime.now():%Y-%m-%d %H:%M}</p>"
+        f"<table>{rows}</table>{map_link}{sections}</body></html>\n"
+    )
+
+    filepath = os.path.join(output_dir, 'index.html')
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return filepath
+
+
+def generate_report(df: pd.DataFrame, output_dir: str = REPORT_DIR, n_jobs: Optional[int] = None,
+                    metrics: Optional[PipelineMetrics] = None) -> str:
+    """Genera el reporte completo (PNG por gráfica + index.html). Devuelve la ruta del índice"""
+    metrics = metrics if metrics is not None else PipelineMetrics("report")
+    os.makedirs(output_dir, exist_ok=True)
+
+    with metrics.timer('report_aggregates', rows=len(df)):
+        data = compute_report_data(df)
+
+    tasks = [(name, data[name], output_dir) for name in CHARTS if name in data]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, max(len(tasks), 1))
+    logger.info(f"Dibujando {len(tasks)} gráficas con {n_jobs} procesos")
+
+    with metrics.timer('report_render', rows=len(tasks)):
+        if n_jobs == 1:
+            results = [_render_chart(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(_render_chart, tasks))
+    for _, _, seconds in results:
+        metrics.observe('report_chart_seconds', seconds)
+
+    map_path = None
+    if 'job_map' in data:
+        map_path = save_folium_map(data['job_map']['locations'], os.path.join(output_dir, 'mapa_interactivo.html'))
+
+    summary = {
+        'Empleos': f"{len(df):,}",
+        'Empresas': f"{df['company'].nunique():,}" if 'company' in df.columns else '-',
+        'Ubicaciones': f"{df['location'].nunique():,}" if 'location' in df.columns else '-',
+    }
+    index_path = _write_index(output_dir, {name: path for name, path, _ in results}, summary, map_path)
+    logger.info(f"Reporte generado: {index_path} ({len(results)} gráficas)")
+    return index_path
@@ -7,36 +7,30 @@ import pandas as pd
 import json
 import time
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 import os
 from urllib.parse import urlencode
-import asyncio
-import aiohttp
 
 from config import (
     ADZUNA_APP_ID, ADZUNA_API_KEY, ADZUNA_BASE_URL, ADZUNA_COUNTRY,
     BIG_TECH_COMPANIES, TECH_KEYWORDS, JALISCO_LOCATIONS,
     MAX_REQUESTS_PER_MINUTE, DELAY_BETWEEN_REQUESTS, MAX_RESULTS_PER_PAGE,
-    MAX_PAGES_PER_SEARCH, DATA_OUTPUT_DIR, HEADERS
+    MAX_PAGES_PER_SEARCH, MAX_REQUESTS_PER_RUN, MAX_RETRIES_ON_429, DATA_OUTPUT_DIR, HEADERS
 )
+from query_planner import QueryPlanner
+from metrics import PipelineMetrics
+from raw_archive import RawPageArchive
+from taxonomy import get_taxonomy
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraping.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
 class AdzunaJobScraper:
     """Scraper para extraer datos de empleos usando la API de Adzuna"""
     
-    def __init__(self):
+    def __init__(self, planner: Optional[QueryPlanner] = None, max_requests: int = MAX_REQUESTS_PER_RUN,
+                 metrics: Optional[PipelineMetrics] = None, archive: Optional[RawPageArchive] = None):
         self.app_id = ADZUNA_APP_ID
         self.api_key = ADZUNA_API_KEY
         self.base_url = ADZUNA_BASE_URL
@@ -45,20 +39,35 @@ class AdzunaJobScraper:
         self.session.headers.update(HEADERS)
         self.request_count = 0
         self.start_time = time.time()
+        self.planner = planner if planner is not None else QueryPlanner()
+        self.max_requests = max_requests
+        self.total_requests = 0
+        self.metrics = metrics if metrics is not None else PipelineMetrics("scraping")
+        self.archive = archive
+        # Consultas recorridas completas: paginadas hasta agotar resultados (página vacía o
+        # incompleta) sin errores ni cortes por saturación o presupuesto
+        self.completed_queries = set()
+    
+    def budget_exhausted(self) -> bool:
+        """Indica si se alcanzó el presupuesto de requests de la ejecución"""
+        return self.max_requests > 0 and self.total_requests >= self.max_requests
     
     def _rate_limit(self):
         """Implementa rate limiting para no exceder límites de la API"""
         self.request_count += 1
+        self.total_requests += 1
         elapsed_time = time.time() - self.start_time
         
         if elapsed_time < 60 and self.request_count >= MAX_REQUESTS_PER_MINUTE:
             sleep_time = 60 - elapsed_time + 1
             logger.info(f"Rate limit alcanzado. Esperando {sleep_time:.2f} segundos...")
-            time.sleep(sleep_time)
+            with self.metrics.timer('rate_limit_sleep'):
+                time.sleep(sleep_time)
             self.request_count = 0
             self.start_time = time.time()
         
-        time.sleep(DELAY_BETWEEN_REQUESTS)
+        with self.metrics.timer('rate_limit_sleep'):
+            time.sleep(DELAY_BETWEEN_REQUESTS)
     
     def build_search_url(self, what: str = "", where: str = "", page: int = 1) -> str:
         """Construye la URL de búsqueda para la API de Adzuna"""
@@ -81,47 +90,130 @@ class AdzunaJobScraper:
         url = f"{self.base_url}/{self.country}/search/{page}?{urlencode(params)}"
         return url
     
-    def search_jobs(self, what: str = "", where: str = "", max_pages: int = MAX_PAGES_PER_SEARCH) -> List[Dict]:
-        """Busca empleos usando los parámetros especificados"""
+    def _get(self, url: str) -> requests.Response:
+        """Ejecuta el GET registrando métricas y reintentando cuando la API responde 429.
+        
+        El primer intento lo contabiliza quien llama (``_rate_limit``); cada reintento pasa
+        también por ``_rate_limit`` para que cuente en el límite por minuto y en el presupuesto.
+        """
+        for attempt in range(MAX_RETRIES_ON_429 + 1):
+            if attempt > 0:
+                self._rate_limit()
+            request_start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=30)
+            finally:
+                latency = time.perf_counter() - request_start
+                self.metrics.record_time('network', latency)
+                self.metrics.observe('request_latency_seconds', latency)
+                self.metrics.increment('http_requests_total')
+            
+            self.metrics.increment('bytes_received_total', len(response.content))
+            
+            if response.status_code != 429 or attempt == MAX_RETRIES_ON_429 or self.budget_exhausted():
+                return response
+            
+            self.metrics.increment('http_429_total')
+            try:
+                wait_time = float(response.headers.get('Retry-After', DELAY_BETWEEN_REQUESTS))
+            except ValueError:
+                wait_time = DELAY_BETWEEN_REQUESTS
+            wait_time *= 2 ** attempt
+            logger.warning(f"API respondió 429. Reintentando en {wait_time:.1f} segundos...")
+            with self.metrics.timer('rate_limit_sleep'):
+                time.sleep(wait_time)
+        
+        return response
+    
+    def search_jobs(self, what: str = "", where: str = "", max_pages: int = MAX_PAGES_PER_SEARCH,
+                    seen_ids: Optional[set] = None) -> List[Dict]:
+        """Busca empleos usando los parámetros especificados.
+        
+        Si se proporciona ``seen_ids``, cada página se registra en el planificador de consultas,
+        solo se devuelven empleos no vistos y la paginación se detiene al saturarse.
+        Las consultas que agotan sus resultados sin errores ni cortes se agregan a
+        ``completed_queries``; si la última página planeada llegó llena puede haber más.
+        """
         all_jobs = []
+        interrupted = False
+        exhausted = False
         
         logger.info(f"Buscando empleos: what='{what}', where='{where}'")
         
         for page in range(1, max_pages + 1):
+            if self.budget_exhausted():
+                logger.info(f"Presupuesto de {self.max_requests} requests agotado")
+                interrupted = True
+                break
+            
             try:
                 self._rate_limit()
                 
                 url = self.build_search_url(what=what, where=where, page=page)
                 logger.info(f"Solicitando página {page}: {url}")
                 
-                response = self.session.get(url, timeout=30)
+                response = self._get(url)
                 response.raise_for_status()
                 
-                data = response.json()
+                with self.metrics.timer('json_decode'):
+                    data = response.json()
                 
                 if 'results' not in data or not data['results']:
                     logger.info(f"No hay más resultados en la página {page}")
+                    if seen_ids is not None:
+                        self.planner.record_request(what, where)
+                    exhausted = True
                     break
                 
                 jobs = data['results']
-                all_jobs.extend(jobs)
                 
-                logger.info(f"Página {page}: {len(jobs)} empleos encontrados")
+                if self.archive is not None:
+                    entry = self.archive.append_page(what, where, page, response.content)
+                    self.metrics.increment('pages_archived_total')
+                    self.metrics.increment('bytes_archived_total', entry['length'])
+                
+                if seen_ids is None:
+                    all_jobs.extend(jobs)
+                    logger.info(f"Página {page}: {len(jobs)} empleos encontrados")
+                else:
+                    new_jobs = [job for job in jobs if job.get('id', '') not in seen_ids]
+                    new_count = self.planner.record_page(what, where, [job.get('id', '') for job in jobs], seen_ids)
+                    all_jobs.extend(new_jobs)
+                    logger.info(f"Página {page}: {len(jobs)} empleos encontrados, {new_count} nuevos")
+                    
+                    if self.planner.is_saturated(len(jobs), new_count):
+                        logger.info(f"Resultados saturados en la página {page}, se detiene la paginación")
+                        interrupted = True
+                        break
                 
                 # Si hay menos resultados que el máximo, probablemente sea la última página
                 if len(jobs) < MAX_RESULTS_PER_PAGE:
+                    exhausted = True
                     break
                     
             except requests.exceptions.RequestException as e:
                 logger.error(f"Error en la solicitud para página {page}: {e}")
+                interrupted = True
+                self.metrics.increment('http_errors_total')
+                if seen_ids is not None:
+                    self.planner.record_request(what, where)
                 continue
             except json.JSONDecodeError as e:
                 logger.error(f"Error decodificando JSON en página {page}: {e}")
+                interrupted = True
+                if seen_ids is not None:
+                    self.planner.record_request(what, where)
                 continue
             except Exception as e:
                 logger.error(f"Error inesperado en página {page}: {e}")
+                interrupted = True
+                if seen_ids is not None:
+                    self.planner.record_request(what, where)
                 continue
         
+        if exhausted and not interrupted:
+            self.completed_queries.add(self.planner.query_key(what, where))
+        
         logger.info(f"Búsqueda completada: {len(all_jobs)} empleos totales encontrados")
         return all_jobs
     
@@ -155,9 +247,11 @@ class AdzunaJobScraper:
             
             # Identificar tecnologías mencionadas
             full_text = f"{job_details['title']} {job_details['description']}".lower()
-            mentioned_keywords = [keyword for keyword in TECH_KEYWORDS if keyword.lower() in full_text]
-            job_details['mentioned_tech_keywords'] = ', '.join(mentioned_keywords)
-            job_details['tech_keywords_count'] = len(mentioned_keywords)
+            taxonomy = get_taxonomy()
+            skill_ids = taxonomy.match(full_text)
+            job_details['mentioned_tech_keywords'] = ', '.join(taxonomy.names(skill_ids))
+            job_details['tech_keywords_count'] = len(skill_ids)
+            job_details['skill_ids'] = ','.join(map(str, skill_ids))
             
             # Timestamp de scraping
             job_details['scraped_at'] = datetime.now().isoformat()
@@ -168,53 +262,65 @@ class AdzunaJobScraper:
             logger.error(f"Error extrayendo detalles del empleo {job.get('id', 'N/A')}: {e}")
             return {}
     
-    def scrape_big_tech_jobs_jalisco(self) -> pd.DataFrame:
-        """Función principal para extraer empleos de Big Tech en Jalisco"""
-        all_jobs_data = []
-        
-        logger.info("Iniciando scraping de empleos Big Tech en Jalisco")
+    def build_search_queries(self) -> List[Tuple[str, str, int]]:
+        """Construye la lista de consultas (what, where, max_pages) de las tres estrategias"""
+        queries = []
         
         # Estrategia 1: Buscar por empresas específicas
-        logger.info("=== Buscando por empresas Big Tech específicas ===")
         for company in BIG_TECH_COMPANIES[:10]:  # Limitamos a las primeras 10 para no hacer demasiadas requests
             for location in JALISCO_LOCATIONS[:3]:  # Limitamos a las 3 ubicaciones principales
-                jobs = self.search_jobs(what=company, where=location, max_pages=2)
-                
-                for job in jobs:
-                    job_details = self.extract_job_details(job)
-                    if job_details:
-                        all_jobs_data.append(job_details)
+                queries.append((company, location, 2))
         
         # Estrategia 2: Buscar por keywords técnicos en Jalisco
-        logger.info("=== Buscando por keywords técnicos ===")
         for keyword in TECH_KEYWORDS[:15]:  # Limitamos a los primeros 15 keywords
             for location in JALISCO_LOCATIONS[:2]:  # Solo Guadalajara y Zapopan
-                jobs = self.search_jobs(what=keyword, where=location, max_pages=2)
-                
-                for job in jobs:
-                    job_details = self.extract_job_details(job)
-                    if job_details:
-                        all_jobs_data.append(job_details)
+                queries.append((keyword, location, 2))
         
         # Estrategia 3: Búsqueda general de tecnología en Jalisco
-        logger.info("=== Búsqueda general de empleos tech ===")
         general_terms = ['software', 'technology', 'IT', 'developer', 'engineer']
         for term in general_terms:
             for location in JALISCO_LOCATIONS[:2]:
-                jobs = self.search_jobs(what=term, where=location, max_pages=3)
-                
+                queries.append((term, location, 3))
+        
+        return queries
+    
+    def scrape_big_tech_jobs_jalisco(self) -> pd.DataFrame:
+        """Función principal para extraer empleos de Big Tech en Jalisco"""
+        all_jobs_data = []
+        seen_ids = set()
+        
+        logger.info("Iniciando scraping de empleos Big Tech en Jalisco")
+        
+        queries = self.planner.plan(self.build_search_queries())
+        
+        for what, where, max_pages in queries:
+            if self.budget_exhausted():
+                logger.info(f"Presupuesto de {self.max_requests} requests agotado. Consultas restantes omitidas.")
+                break
+            
+            jobs = self.search_jobs(what=what, where=where, max_pages=max_pages, seen_ids=seen_ids)
+            search_query = self.planner.query_key(what, where)
+            
+            with self.metrics.timer('extract_job_details', rows=len(jobs)):
                 for job in jobs:
                     job_details = self.extract_job_details(job)
                     if job_details:
+                        job_details['search_query'] = search_query
                         all_jobs_data.append(job_details)
         
-        # Convertir a DataFrame y limpiar duplicados
-        df = pd.DataFrame(all_jobs_data)
+        self.planner.finish_run()
+        
+        return self.build_dataset(all_jobs_data)
+    
+    def build_dataset(self, jobs_data: List[Dict]) -> pd.DataFrame:
+        """Convierte los empleos extraídos en DataFrame, elimina duplicados y filtra Jalisco"""
+        df = pd.DataFrame(jobs_data)
         
         if not df.empty:
             # Eliminar duplicados basados en ID
             initial_count = len(df)
-            df = df.drop_duplicates(subset=['id'], keep='first')
+            with self.metrics.timer('dedup', rows=initial_count):
+                df = df.drop_duplicates(subset=['id'], keep='first')
             final_count = len(df)
             logger.info(f"Duplicados eliminados: {initial_count - final_count}")
             
@@ -238,7 +344,9 @@ class AdzunaJobScraper:
         os.makedirs(DATA_OUTPUT_DIR, exist_ok=True)
         
         filepath = os.path.join(DATA_OUTPUT_DIR, filename)
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        with self.metrics.timer('csv_write', rows=len(df)):
+            df.to_csv(filepath, index=False, encoding='utf-8')
+        self.metrics.increment('bytes_written_total', os.path.getsize(filepath))
         
         logger.info(f"Dataset guardado: {filepath}")
         logger.info(f"Estadísticas del dataset:")
@@ -252,6 +360,16 @@ class AdzunaJobScraper:
 
 def main():
     """Función principal para ejecutar el scraping"""
+    # Configurar logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('scraping.log'),
+            logging.StreamHandler()
+        ]
+    )
+    
     scraper = AdzunaJobScraper()
     
     try:
@@ -0,0 +1,454 @@
+"""
+Sketches mergeables para estadísticas resumidas en streaming
+
+- HyperLogLog: conteo aproximado de valores únicos (empresas, ubicaciones, IDs)
+- KLLSketch: cuantiles aproximados (mediana y percentiles de salario)
+- SeenIdSet: hashes de 64 bits de los IDs ya incorporados, acotados a una ventana de
+  días de publicación, para no volver a contar empleos al reprocesar el mismo crawl
+  (``process``, ``all`` o ``replay``)
+- SummaryStatsAccumulator: combina los sketches con contadores exactos y produce las
+  mismas llaves que ``JobDataProcessor.get_summary_stats``
+
+Todos se actualizan lote por lote y se serializan a JSON para persistir el estado entre
+corridas. Los sketches se combinan (``merge``) con cualquier otro; los acumuladores solo
+si cubren empleos distintos, porque sus contadores exactos no admiten restar traslapes.
+"""
+
+import base64
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import STATS_ID_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+class HyperLogLog:
+    """Estimador de cardinalidad HyperLogLog con registros de 8 bits"""
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision debe estar entre 4 y 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, values: Iterable):
+        """Agrega un lote de valores (se ignoran nulos y cadenas vacías)"""
+        series = pd.Series(values, dtype=object)
+        series = series[series.notna() & (series.astype(str) != '')]
+        if series.empty:
+            return
+
+        hashes = pd.util.hash_array(series.astype(str).to_numpy(dtype=object))
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+
+        # Rango = posición del primer bit en 1 de los bits restantes
+        remaining_bits = 64 - self.precision
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        # frexp es exacto porque rest < 2**53
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (remaining_bits - bit_length + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.precision != self.precision:
+            raise ValueError("No se pueden combinar HyperLogLog con distinta precisión")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Cardinalidad estimada (error estándar ~1.04/sqrt(m))"""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Corrección de rango pequeño (linear counting)
+            estimate = m * np.log(m / zeros)
+
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict:
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HyperLogLog':
+        sketch = cls(data['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return sketch
+
+
+class KLLSketch:
+    """Sketch de cuantiles KLL: memoria O(k log n), error de rango ~1.65/k"""
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compact(self):
+        """Compacta los niveles que exceden su capacidad promoviendo la mitad de sus elementos"""
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) <= self._capacity(level):
+                    continue
+
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                items = np.sort(self.levels[level])
+                leftover = items[-1:] if len(items) % 2 else items[:0]
+                items = items[:len(items) - len(leftover)]
+                promoted = items[self._rng.integers(2)::2]
+
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+                compacted = True
+                break
+
+    def update(self, values: Iterable[float]):
+        """Agrega un lote de valores numéricos (se ignoran nulos)"""
+        array = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+        array = array[~np.isnan(array)]
+        if array.size == 0:
+            return
+
+        self.n += array.size
+        self.levels[0] = np.concatenate((self.levels[0], array))
+        self._compact()
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.n += other.n
+        self._compact()
+        return self
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Cuantiles aproximados para cada q en [0, 1]"""
+        qs = list(qs)
+        if self.n == 0:
+            return [float('nan')] * len(qs)
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_), 2 ** level, dtype=float)
+                                  for level, items_ in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side='left')
+        positions = np.clip(positions, 0, len(items) - 1)
+        return [float(items[i]) for i in positions]
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def to_dict(self) -> Dict:
+        return {'k': self.k, 'n': self.n, 'levels': [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'KLLSketch':
+        sketch = cls(data['k'])
+        sketch.n = data['n']
+        sketch.levels = [np.asarray(level, dtype=float) for level in data['levels']] or [np.empty(0)]
+        return sketch
+
+
+# Día de los IDs sin fecha de publicación conocida: no caducan
+_NO_DAY = np.iinfo(np.int32).max
+
+
+def _publication_days(created: Iterable) -> np.ndarray:
+    """Día de publicación (días desde 1970) de cada fila; ``_NO_DAY`` si no se conoce"""
+    dates = pd.to_datetime(pd.Series(created), errors='coerce', utc=True)
+    days = np.full(len(dates), _NO_DAY, dtype=np.int32)
+    known = dates.notna().to_numpy()
+    days[known] = dates[known].dt.tz_localize(None).to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return days
+
+
+def _encode(array: np.ndarray) -> str:
+    return base64.b64encode(array.tobytes()).decode('ascii')
+
+
+def _decode(text: str, dtype) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(text), dtype=dtype).copy()
+
+
+class SeenIdSet:
+    """IDs ya incorporados: hashes de 64 bits ordenados con su día de publicación.
+
+    Para acotar la memoria se descartan los IDs publicados más de ``retention_days`` antes
+    del más reciente. Desde ese momento una fila de esa antigüedad no se distingue de una
+    ya contada, así que se trata como vista.
+    """
+
+    def __init__(self, retention_days: int = STATS_ID_RETENTION_DAYS):
+        self.retention_days = retention_days
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.days = np.empty(0, dtype=np.int32)
+        self.newest_day: Optional[int] = None
+        self.expired_before: Optional[int] = None  # Los IDs publicados antes de este día ya no se guardan
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def register(self, ids: pd.Series, created: Optional[Iterable] = None) -> np.ndarray:
+        """Máscara de las filas cuyo ID no se ha incorporado antes; registra los IDs nuevos.
+
+        Las filas sin ID no se pueden deduplicar y siempre se cuentan.
+        """
+        ids = pd.Series(ids).reset_index(drop=True)
+        valid = (ids.notna() & (ids.astype(str) != '')).to_numpy()
+        hashes = pd.util.hash_array(ids[valid].astype(str).to_numpy(dtype=object))
+        days = _publication_days(created)[valid] if created is not None else np.full(len(hashes), _NO_DAY, dtype=np.int32)
+
+        fresh = ~np.isin(hashes, self.hashes) & ~pd.Series(hashes).duplicated().to_numpy()
+        if self.expired_before is not None:
+            fresh &= days >= self.expired_before
+        self._insert(hashes[fresh], days[fresh])
+
+        mask = np.ones(len(ids), dtype=bool)
+        mask[valid] = fresh
+        return mask
+
+    def _insert(self, hashes: np.ndarray, days: np.ndarray):
+        if len(hashes) == 0:
+            return
+        known = days[days != _NO_DAY]
+        if known.size:
+            self.newest_day = int(known.max()) if self.newest_day is None else max(self.newest_day, int(known.max()))
+
+        hashes = np.concatenate((self.hashes, hashes))
+        days = np.concatenate((self.days, days))
+        order = np.argsort(hashes, kind='stable')
+        self.hashes, self.days = hashes[order], days[order]
+        self._expire()
+
+    def _expire(self):
+        """Descarta los IDs publicados fuera de la ventana de retención"""
+        if self.retention_days <= 0 or self.newest_day is None:
+            return
+        expired = self.days < self.newest_day - self.retention_days
+        if not expired.any():
+            return
+        expired_before = int(self.days[expired].max()) + 1
+        self.expired_before = max(self.expired_before or expired_before, expired_before)
+        self.hashes, self.days = self.hashes[~expired], self.days[~expired]
+
+    def merge(self, other: 'SeenIdSet') -> 'SeenIdSet':
+        """Une otro conjunto con IDs distintos; un traslape es un error"""
+        overlap = np.intersect1d(self.hashes, other.hashes, assume_unique=True).size
+        if overlap:
+            raise ValueError(f"Los conjuntos comparten {overlap} IDs; incorporar esos empleos con update()")
+        if other.expired_before is not None:
+            self.expired_before = max(self.expired_before or other.expired_before, other.expired_before)
+        self._insert(other.hashes, other.days)
+        return self
+
+    def to_dict(self) -> Dict:
+        return {
+            'hashes': _encode(self.hashes),
+            'days': _encode(self.days),
+            'newest_day': self.newest_day,
+            'expired_before': self.expired_before,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, retention_days: int = STATS_ID_RETENTION_DAYS) -> 'SeenIdSet':
+        seen = cls(retention_days)
+        seen.hashes = _decode(data['hashes'], np.uint64)
+        seen.days = _decode(data['days'], np.int32)
+        seen.newest_day = data.get('newest_day')
+        seen.expired_before = data.get('expired_before')
+        seen._expire()
+        return seen
+
+
+class SummaryStatsAccumulator:
+    """Estadísticas resumidas acumulables lote a lote y combinables entre ejecuciones"""
+
+    QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+    def __init__(self, precision: int = 14, k: int = 200, id_retention_days: int = STATS_ID_RETENTION_DAYS):
+        self.total_jobs = 0
+        self.big_tech_jobs = 0
+        self.jobs_with_salary = 0
+        self.salary_sum = 0.0
+        self.salary_count = 0
+        self.date_start: Optional[pd.Timestamp] = None
+        self.date_end: Optional[pd.Timestamp] = None
+        self.batches = 0
+        self.seen_ids = SeenIdSet(id_retention_days)
+        self.unique_ids = HyperLogLog(precision)
+        self.companies = HyperLogLog(precision)
+        self.locations = HyperLogLog(precision)
+        self.salary = KLLSketch(k)
+
+    def update(self, df: pd.DataFrame) -> 'SummaryStatsAccumulator':
+        """Incorpora un lote de empleos procesados.
+
+        Los contadores exactos y el sketch de salarios solo reciben los empleos cuyo ID
+        no se había visto; los HyperLogLog y el rango de fechas son idempotentes.
+        """
+        if 'id' in df.columns:
+            self.unique_ids.update(df['id'])
+            df = df[self.seen_ids.register(df['id'], df['created'] if 'created' in df.columns else None)]
+        if df.empty:
+            return self
+
+        self.batches += 1
+        self.total_jobs += len(df)
+
+        if 'company' in df.columns:
+            self.companies.update(df['company'])
+        if 'location' in df.columns:
+            self.locations.update(df['location'])
+        if 'is_big_tech' in df.columns:
+            self.big_tech_jobs += int(df['is_big_tech'].fillna(False).astype(bool).sum())
+        if 'salary_min' in df.columns:
+            self.jobs_with_salary += int(df['salary_min'].notna().sum())
+        if 'salary_avg' in df.columns:
+            salaries = pd.to_numeric(df['salary_avg'], errors='coerce').dropna()
+            self.salary_sum += float(salaries.sum())
+            self.salary_count += len(salaries)
+            self.salary.update(salaries)
+        if 'created' in df.columns:
+            dates = pd.to_datetime(df['created'], errors='coerce').dropna()
+            if not dates.empty:
+                self._update_dates(dates.min(), dates.max())
+
+        return self
+
+    def _update_dates(self, start, end):
+        if start is not None and (self.date_start is None or start < self.date_start):
+            self.date_start = start
+        if end is not None and (self.date_end is None or end > self.date_end):
+            self.date_end = end
+
+    def merge(self, other: 'SummaryStatsAccumulator') -> 'SummaryStatsAccumulator':
+        """Combina otro acumulador (de otra ejecución o proceso) en este.
+
+        Los contadores exactos se suman, así que los acumuladores deben cubrir empleos
+        distintos (por ejemplo, particiones del mismo crawl); si comparten IDs se lanza
+        ``ValueError`` sin modificar este acumulador. Las ejecuciones que se traslapan se
+        acumulan con ``update`` sobre el estado guardado.
+        """
+        self.seen_ids.merge(other.seen_ids)
+        self.total_jobs += other.total_jobs
+        self.big_tech_jobs += other.big_tech_jobs
+        self.jobs_with_salary += other.jobs_with_salary
+        self.salary_sum += other.salary_sum
+        self.salary_count += other.salary_count
+        self.batches += other.batches
+        self._update_dates(other.date_start, other.date_end)
+        self.unique_ids.merge(other.unique_ids)
+        self.companies.merge(other.companies)
+        self.locations.merge(other.locations)
+        self.salary.merge(other.salary)
+        return self
+
+    def to_stats(self) -> Dict:
+        """Estadísticas con las mismas llaves que ``JobDataProcessor.get_summary_stats``"""
+        quantiles = self.salary.quantiles(self.QUANTILES)
+        return {
+            'total_jobs': self.total_jobs,
+            'unique_jobs': self.unique_ids.count(),
+            'unique_companies': self.companies.count(),
+            'unique_locations': self.locations.count(),
+            'big_tech_jobs': self.big_tech_jobs,
+            'big_tech_percentage': self.big_tech_jobs / self.total_jobs * 100 if self.total_jobs else 0,
+            'jobs_with_salary': self.jobs_with_salary,
+            'avg_salary': self.salary_sum / self.salary_count if self.salary_count else 0,
+            'median_salary': quantiles[self.QUANTILES.index(0.5)] if self.salary.n else 0,
+            'salary_quantiles': dict(zip(self.QUANTILES, quantiles)) if self.salary.n else {},
+            'date_range': {
+                'start': self.date_start,
+                'end': self.date_end
+            },
+            'batches': self.batches,
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            'total_jobs': self.total_jobs,
+            'big_tech_jobs': self.big_tech_jobs,
+            'jobs_with_salary': self.jobs_with_salary,
+            'salary_sum': self.salary_sum,
+            'salary_count': self.salary_count,
+            'date_start': self.date_start.isoformat() if self.date_start is not None else None,
+            'date_end': self.date_end.isoformat() if self.date_end is not None else None,
+            'batches': self.batches,
+            'seen_ids': self.seen_ids.to_dict(),
+            'unique_ids': self.unique_ids.to_dict(),
+            'companies': self.companies.to_dict(),
+            'locations': self.locations.to_dict(),
+            'salary': self.salary.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SummaryStatsAccumulator':
+        accumulator = cls()
+        for key in ('total_jobs', 'big_tech_jobs', 'jobs_with_salary', 'salary_sum', 'salary_count', 'batches'):
+            setattr(accumulator, key, data.get(key, 0))
+        accumulator.date_start = pd.Timestamp(data['date_start']) if data.get('date_start') else None
+        accumulator.date_end = pd.Timestamp(data['date_end']) if data.get('date_end') else None
+        if isinstance(data.get('seen_ids'), dict):
+            accumulator.seen_ids = SeenIdSet.from_dict(data['seen_ids'], accumulator.seen_ids.retention_days)
+        elif data.get('seen_ids'):
+            # Formato anterior: solo hashes; se fechan con la publicación más reciente
+            newest = accumulator.date_end
+            seen = accumulator.seen_ids
+            hashes = np.sort(_decode(data['seen_ids'], np.uint64))
+            day = _publication_days([newest])[0] if newest is not None else _NO_DAY
+            seen._insert(hashes, np.full(len(hashes), day, dtype=np.int32))
+        accumulator.unique_ids = HyperLogLog.from_dict(data['unique_ids'])
+        accumulator.companies = HyperLogLog.from_dict(data['companies'])
+        accumulator.locations = HyperLogLog.from_dict(data['locations'])
+        accumulator.salary = KLLSketch.from_dict(data['salary'])
+        return accumulator
+
+    def save(self, filepath: str) -> str:
+        """Guarda el estado del acumulador como JSON"""
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': datetime.now().isoformat(), **self.to_dict()}, f)
+        os.replace(tmp_path, filepath)
+
+        logger.info(f"Estadísticas acumuladas guardadas: {filepath}")
+        return filepath
+
+    @classmethod
+    def load(cls, filepath: str) -> 'SummaryStatsAccumulator':
+        """Carga un acumulador guardado; si no existe, devuelve uno vacío"""
+        if not os.path.exists(filepath):
+            return cls()
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,225 @@
+"""
+Taxonomía canónica de habilidades y puestos con alias en español e inglés
+
+Cada entrada de ``taxonomy.json`` tiene un ID entero estable, un nombre canónico, un tipo
+(``skill`` o ``role``), un grupo opcional (las columnas ``mentions_*`` del procesador) y
+sus alias. Todos los alias de un tipo se compilan en una sola expresión regular con forma
+de trie (los prefijos comunes se comparten), así que cada texto se recorre una sola vez
+sin importar cuántos alias haya. El patrón compilado se guarda en caché en disco
+y solo se reconstruye cuando cambia el archivo de la taxonomía.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import TAXONOMY_FILE, TAXONOMY_CACHE_FILE
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('skill', 'role')
+CACHE_FORMAT = 1
+
+# Separadores entre palabras de un alias: "machine learning" también encuentra "machine-learning"
+_SEPARATOR = r'[\s\-]+'
+_WORD_CHAR = re.compile(r'\w')
+
+
+def normalize_alias(text: str) -> str:
+    """Forma canónica de un alias o de un texto encontrado: minúsculas y separadores simples"""
+    return re.sub(_SEPARATOR, ' ', text.strip().lower())
+
+
+def _strip_accents(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _trie_pattern(aliases: Iterable[str]) -> str:
+    """Expresión regular equivalente a un trie de los alias (alternativas con prefijos compartidos)"""
+    trie: Dict = {}
+    for alias in aliases:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        terminal = '' in node
+        branches = [(_SEPARATOR if char == ' ' else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        if len(branches) == 1:
+            return f'(?:{branches[0]})?' if terminal else branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if terminal else group
+
+    return build(trie)
+
+
+def _nested_ids(alias: str, aliases: Dict[str, int]) -> set:
+    """IDs de los alias contenidos en ``alias`` con límites de palabra, incluido él mismo.
+
+    Cada fragmento entre límites de palabra (los mismos ``(?<!\\w)``/``(?!\\w)`` del patrón) se
+    busca en el diccionario de alias, así que el costo depende del largo del alias y no del
+    número de alias de la taxonomía.
+    """
+    word = [bool(_WORD_CHAR.match(char)) for char in alias]
+    starts = [i for i in range(len(alias)) if i == 0 or not word[i - 1]]
+    ends = [j for j in range(1, len(alias) + 1) if j == len(alias) or not word[j]]
+    return {aliases[alias[i:j]] for i in starts for j in ends if j > i and alias[i:j] in aliases}
+
+
+def _compile_source(source: Dict) -> Dict:
+    """Valida la taxonomía y genera la tabla de alias y el patrón compilado"""
+    entries, aliases = {}, {}
+    for entry in source['entries']:
+        entry_id = int(entry['id'])
+        if entry_id in entries:
+            raise ValueError(f"ID de taxonomía duplicado: {entry_id}")
+        if entry['kind'] not in KINDS:
+            raise ValueError(f"Tipo desconocido '{entry['kind']}' en la entrada {entry_id}")
+        entries[entry_id] = {'name': entry['name'], 'kind': entry['kind'], 'group': entry.get('group')}
+
+        for alias in [entry['name']] + list(entry.get('aliases', [])):
+            for variant in {normalize_alias(alias), normalize_alias(_strip_accents(alias))}:
+                if aliases.get(variant, entry_id) != entry_id:
+                    raise ValueError(f"Alias '{variant}' asignado a las entradas {aliases[variant]} y {entry_id}")
+                aliases[variant] = entry_id
+
+    # Un solo patrón para todos los alias. Cuando un alias contiene a otros (p. ej. el puesto
+    # "python developer" contiene la habilidad "python") la coincidencia más larga se queda con
+    # el texto, así que cada alias guarda también los IDs de los alias que contiene.
+    expansions = {alias: sorted(_nested_ids(alias, aliases)) for alias in aliases}
+
+    pattern = r'(?<!\w)' + _trie_pattern(aliases) + r'(?!\w)'
+    return {'entries': entries, 'aliases': expansions, 'pattern': pattern}
+
+
+def _write_cache(cache_file: str, payload: Dict):
+    """Guarda la caché compilada de forma atómica; un fallo solo se registra.
+
+    Varios procesos (pools de ``replay`` o del reporte) pueden compilar a la vez con la caché
+    fría, así que cada uno escribe en su propio archivo temporal antes de reemplazar.
+    """
+    directory = os.path.dirname(cache_file) or '.'
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.taxonomy_cache_', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar la caché de taxonomía en {cache_file}: {e}")
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+class SkillTaxonomy:
+    """Motor de búsqueda de habilidades y puestos canónicos sobre textos de empleos"""
+
+    def __init__(self, compiled: Dict):
+        self.entries: Dict[int, Dict] = {int(entry_id): entry for entry_id, entry in compiled['entries'].items()}
+        self.aliases: Dict[str, List[int]] = compiled['aliases']
+        self.pattern = re.compile(compiled['pattern'])
+
+        # Grupos en el orden en que aparecen en la taxonomía (orden de las columnas mentions_*)
+        groups = []
+        for entry in self.entries.values():
+            if entry['group'] and entry['group'] not in groups:
+                groups.append(entry['group'])
+        self.groups: List[str] = groups
+        self._group_codes = np.full(max(self.entries) + 1, -1, dtype=np.int64)
+        for entry_id, entry in self.entries.items():
+            if entry['group']:
+                self._group_codes[entry_id] = groups.index(entry['group'])
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, source_file: str = TAXONOMY_FILE, cache_file: Optional[str] = TAXONOMY_CACHE_FILE) -> 'SkillTaxonomy':
+        """Carga la taxonomía usando la caché compilada si corresponde al mismo archivo fuente"""
+        with open(source_file, 'rb') as f:
+            raw = f.read()
+        source_hash = hashlib.sha256(raw).hexdigest()
+
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached.get('source_hash') == source_hash and cached.get('format') == CACHE_FORMAT:
+                    return cls(cached)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Caché de taxonomía inválida ({e}); se reconstruye")
+
+        compiled = _compile_source(json.loads(raw))
+        logger.info(f"Taxonomía compilada: {len(compiled['entries'])} entradas, {len(compiled['aliases'])} alias")
+
+        if cache_file:
+            _write_cache(cache_file, {'format': CACHE_FORMAT, 'source_hash': source_hash, **compiled})
+
+        return cls(compiled)
+
+    def match(self, text: str) -> List[int]:
+        """IDs canónicos (ordenados) de las habilidades y puestos mencionados en un texto"""
+        if not text:
+            return []
+        found = set()
+        for alias in self.pattern.findall(text.lower()):
+            ids = self.aliases.get(alias)  # Casi siempre el texto encontrado ya está normalizado
+            found.update(ids if ids is not None else self.aliases[normalize_alias(alias)])
+        return sorted(found)
+
+    def names(self, ids: Iterable[int]) -> List[str]:
+        return [self.entries[entry_id]['name'] for entry_id in ids]
+
+    def match_series(self, texts: pd.Series) -> pd.DataFrame:
+        """Coincidencias de una columna de textos: tabla larga (row, skill_id) sin duplicados.
+
+        ``row`` es la posición de la fila en ``texts``.
+        """
+        texts = texts.fillna('').astype(str).str.lower().reset_index(drop=True)
+        found = texts.str.findall(self.pattern).explode().dropna()
+        if found.empty:
+            return pd.DataFrame({'row': np.empty(0, dtype=np.int64), 'skill_id': np.empty(0, dtype=np.int64)})
+
+        ids = found.map(self.aliases)
+        if ids.isna().any():
+            ids = found.str.replace(_SEPARATOR, ' ', regex=True).map(self.aliases)
+        ids = ids.explode()
+        matches = pd.DataFrame({'row': ids.index.to_numpy(dtype=np.int64), 'skill_id': ids.to_numpy(dtype=np.int64)})
+        return matches.drop_duplicates().sort_values(['row', 'skill_id'], ignore_index=True)
+
+    def group_flags(self, matches: pd.DataFrame, n_rows: int) -> Dict[str, np.ndarray]:
+        """Banderas booleanas por grupo (``mentions_<grupo>``) a partir de ``match_series``"""
+        flags = np.zeros((n_rows, len(self.groups)), dtype=bool)
+        codes = self._group_codes[matches['skill_id'].to_numpy()]
+        grouped = codes >= 0
+        flags[matches['row'].to_numpy()[grouped], codes[grouped]] = True
+        return {f'mentions_{group}': flags[:, i] for i, group in enumerate(self.groups)}
+
+    def join_ids(self, matches: pd.DataFrame, n_rows: int) -> List[str]:
+        """IDs de cada fila como texto separado por comas (formato de la columna ``skill_ids``)"""
+        joined = matches['skill_id'].astype(str).groupby(matches['row']).agg(','.join)
+        return joined.reindex(range(n_rows), fill_value='').tolist()
+
+
+@functools.lru_cache(maxsize=None)
+def get_taxonomy() -> SkillTaxonomy:
+    """Taxonomía compartida del proceso (se carga una vez)"""
+    return SkillTaxonomy.load()
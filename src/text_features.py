@@ -0,0 +1,163 @@
+"""
+Características de texto dispersas (CSR) para título y descripción de empleos
+
+Usa un ``HashingVectorizer`` sin estado, por lo que no hace falta un paso de ajuste de
+vocabulario que mantenga todas las descripciones en memoria: los textos se procesan en
+bloques, en paralelo entre núcleos, y las estadísticas de IDF (frecuencia de documento
+por columna) se acumulan en streaming y se pueden persistir entre ejecuciones. Como en las
+estadísticas resumidas, cada empleo aporta a la frecuencia de documento una sola vez
+aunque se vuelva a procesar (``SeenIdSet``).
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from config import TEXT_HASH_FEATURES, TEXT_NGRAM_MAX, TEXT_CHUNK_SIZE
+from sketches import SeenIdSet
+
+logger = logging.getLogger(__name__)
+
+
+def _vectorizer(n_features: int, ngram_max: int) -> HashingVectorizer:
+    return HashingVectorizer(
+        n_features=n_features,
+        ngram_range=(1, ngram_max),
+        strip_accents='unicode',
+        lowercase=True,
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+
+
+def _transform_chunk(args: Tuple[List[str], int, int]) -> sparse.csr_matrix:
+    """Vectoriza un bloque de textos (función de módulo para poder usarse en procesos)"""
+    texts, n_features, ngram_max = args
+    return _vectorizer(n_features, ngram_max).transform(texts)
+
+
+def build_job_texts(df: pd.DataFrame) -> pd.Series:
+    """Texto de cada empleo: título + descripción"""
+    title = df['title'].fillna('').astype(str) if 'title' in df.columns else ''
+    description = df['description'].fillna('').astype(str) if 'description' in df.columns else ''
+    return title + ' ' + description
+
+
+class HashedTextFeatures:
+    """Vectorizador de texto por hashing con IDF opcional acumulado en streaming"""
+
+    def __init__(self, n_features: int = TEXT_HASH_FEATURES, ngram_max: int = TEXT_NGRAM_MAX,
+                 use_idf: bool = False, chunk_size: int = TEXT_CHUNK_SIZE, n_jobs: Optional[int] = None):
+        self.n_features = n_features
+        self.ngram_max = ngram_max
+        self.use_idf = use_idf
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.document_count = 0
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.seen_ids = SeenIdSet()
+
+    def _chunks(self, texts: List[str]) -> Iterable[Tuple[List[str], int, int]]:
+        for start in range(0, len(texts), self.chunk_size):
+            yield texts[start:start + self.chunk_size], self.n_features, self.ngram_max
+
+    def transform_counts(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """Conteos de términos por hashing (sin normalizar), procesando bloques en paralelo"""
+        texts = list(texts)
+        if not texts:
+            return sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+
+        n_chunks = (len(texts) + self.chunk_size - 1) // self.chunk_size
+        if n_chunks == 1 or self.n_jobs == 1:
+            blocks = [_transform_chunk(chunk) for chunk in self._chunks(texts)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, n_chunks)) as executor:
+                blocks = list(executor.map(_transform_chunk, self._chunks(texts)))
+
+        return sparse.vstack(blocks, format='csr')
+
+    def partial_fit(self, counts: sparse.csr_matrix) -> 'HashedTextFeatures':
+        """Acumula la frecuencia de documento de un bloque de conteos"""
+        self.document_count += counts.shape[0]
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        return self
+
+    @property
+    def idf(self) -> np.ndarray:
+        """IDF suavizado, igual que ``TfidfTransformer(smooth_idf=True)``"""
+        return (np.log((1 + self.document_count) / (1 + self.document_frequency)) + 1).astype(np.float32)
+
+    def transform(self, texts: Iterable[str], update_idf: bool = True, ids: Optional[pd.Series] = None,
+                  created: Optional[Iterable] = None) -> sparse.csr_matrix:
+        """Vectoriza textos: TF (o TF-IDF si ``use_idf``) normalizado con L2.
+
+        Con ``ids`` (y opcionalmente ``created``, la fecha de publicación) solo los empleos no
+        vistos en lotes o ejecuciones anteriores actualizan la frecuencia de documento.
+        """
+        counts = self.transform_counts(texts)
+
+        if self.use_idf:
+            if update_idf:
+                self.partial_fit(counts if ids is None else counts[self.seen_ids.register(ids, created)])
+            counts = counts @ sparse.diags(self.idf, format='csr')
+
+        return normalize(counts, norm='l2', copy=False)
+
+    def save_idf(self, filepath: str) -> str:
+        """Persiste las estadísticas de IDF para continuar acumulando en la siguiente ejecución"""
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(filepath, document_count=self.document_count,
+                            document_frequency=self.document_frequency,
+                            n_features=self.n_features, ngram_max=self.ngram_max,
+                            seen_ids=json.dumps(self.seen_ids.to_dict()))
+        logger.info(f"Estadísticas IDF guardadas: {filepath}")
+        return filepath
+
+    def load_idf(self, filepath: str) -> 'HashedTextFeatures':
+        """Carga estadísticas de IDF previas (si existen y son compatibles)"""
+        if not os.path.exists(filepath):
+            return self
+
+        data = np.load(filepath)
+        if int(data['n_features']) != self.n_features or int(data['ngram_max']) != self.ngram_max:
+            logger.warning(f"Estadísticas IDF en {filepath} incompatibles con la configuración actual; se ignoran")
+            return self
+
+        self.document_count = int(data['document_count'])
+        self.document_frequency = data['document_frequency'].astype(np.int64)
+        if 'seen_ids' in data:
+            self.seen_ids = SeenIdSet.from_dict(json.loads(str(data['seen_ids'])), self.seen_ids.retention_days)
+        return self
+
+
+def save_text_features(matrix: sparse.csr_matrix, ids: Iterable, filename: str,
+                       output_dir: str = "data/processed") -> str:
+    """Guarda la matriz CSR junto con los IDs de empleo de cada fila"""
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, filename)
+
+    matrix = matrix.tocsr()
+    np.savez_compressed(filepath, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                        shape=np.asarray(matrix.shape), ids=np.asarray(list(ids), dtype=str))
+
+    logger.info(f"Características de texto guardadas: {filepath} ({matrix.shape[0]} x {matrix.shape[1]}, "
+                f"{matrix.nnz:,} valores no nulos)")
+    return filepath
+
+
+def load_text_features(filepath: str) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Carga una matriz guardada con ``save_text_features``. Devuelve (matriz, ids)"""
+    data = np.load(filepath)
+    matrix = sparse.csr_matrix((data['data'], data['indices'], data['indptr']), shape=tuple(data['shape']))
+    return matrix, data['ids']
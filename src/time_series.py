@@ -0,0 +1,228 @@
+"""
+Construcción de series de tiempo en múltiples frecuencias y dimensiones en una sola pasada
+
+Los datos se ordenan una sola vez por fecha. Para cada frecuencia los límites de los
+periodos se obtienen con una búsqueda binaria sobre las fechas ordenadas, y las
+métricas de todos los grupos (empresa, ubicación, nivel, tecnología) se agregan con
+``np.bincount`` sobre códigos enteros, sin volver a hacer ``resample`` ni ``groupby``.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TOTAL = 'total'
+TECH = 'tech'
+METRIC_COLUMNS = ['job_count', 'big_tech_count', 'salary_avg', 'tech_keywords_count',
+                  'big_tech_percentage', 'cumulative_jobs']
+
+# Alias de pandas >= 2.2 para resample que no son válidos como frecuencia de Period
+PERIOD_ALIASES = {'ME': 'M', 'QE': 'Q', 'YE': 'Y', 'BME': 'BM', 'BQE': 'BQ', 'BYE': 'BY'}
+# Alias de inicio de periodo: mismos periodos que su contraparte, etiquetados con el primer día
+START_ALIASES = {'MS': 'M', 'QS': 'Q', 'YS': 'Y', 'AS': 'Y'}
+
+
+def period_frequency(freq: str) -> Tuple[str, bool]:
+    """Frecuencia de ``Period`` equivalente a un alias de ``resample`` y si se etiqueta con el inicio.
+
+    Lanza ``ValueError`` si la frecuencia no tiene un equivalente como ``Period``.
+    """
+    if freq in START_ALIASES:
+        return START_ALIASES[freq], True
+
+    period_freq = PERIOD_ALIASES.get(freq, freq)
+    try:
+        pd.Period('2000-01-01', freq=period_freq)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Frecuencia '{freq}' no soportada para series de tiempo "
+                         f"(usar D, W, ME/M, MS, QE/Q, QS, YE/Y o YS)") from e
+    return period_freq, False
+
+
+def period_labels(periods: pd.PeriodIndex, name: Optional[str] = None, start: bool = False) -> pd.DatetimeIndex:
+    """Etiquetas que ``resample`` asigna a cada periodo (``start`` para los alias MS, QS y YS)"""
+    # resample etiqueta con el fin del periodo las frecuencias semanales, mensuales, etc.
+    if not start and periods.freqstr.lstrip('0123456789')[0] in 'WMQYAB':
+        labels = periods.end_time.normalize()
+    else:
+        labels = periods.start_time
+    return pd.DatetimeIndex(labels, name=name)
+
+
+class TimeSeriesBuilder:
+    """Genera series de tiempo para varias frecuencias y dimensiones a partir de un solo ordenamiento"""
+
+    def __init__(self, df: pd.DataFrame, date_column: str = 'created'):
+        self.df = df
+        self.date_column = date_column
+
+        dates = pd.to_datetime(df[date_column], errors='coerce')
+        self.tz = dates.dt.tz
+        if self.tz is not None:
+            dates = dates.dt.tz_convert(None)
+
+        values = dates.to_numpy(dtype='datetime64[ns]')
+        valid = np.flatnonzero(~np.isnat(values))
+        order = np.argsort(values[valid], kind='stable')
+
+        self._positions = valid[order]
+        self._dates = values[self._positions]
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self._dates)
+
+    def _column(self, name: str, default: float = np.nan) -> np.ndarray:
+        """Columna numérica reordenada según las fechas (se calcula una vez y se reutiliza)"""
+        if name not in self._columns:
+            if name in self.df.columns:
+                values = pd.to_numeric(self.df[name], errors='coerce').to_numpy(dtype=float)
+                self._columns[name] = values[self._positions]
+            else:
+                self._columns[name] = np.full(len(self), default)
+        return self._columns[name]
+
+    def _bins(self, freq: str) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+        """Código de periodo de cada fila y etiquetas de los periodos (mismas que ``resample``)"""
+        period_freq, label_start = period_frequency(freq)
+        periods = pd.period_range(pd.Timestamp(self._dates[0]), pd.Timestamp(self._dates[-1]), freq=period_freq)
+
+        # Las fechas están ordenadas: los límites de cada periodo salen de una búsqueda binaria
+        starts = periods.start_time.values
+        boundaries = np.searchsorted(self._dates, starts[1:], side='left')
+        counts = np.diff(np.concatenate(([0], boundaries, [len(self)])))
+        codes = np.repeat(np.arange(len(periods)), counts)
+
+        labels = period_labels(periods, self.date_column, start=label_start)
+        if self.tz is not None:
+            labels = labels.tz_localize('UTC').tz_convert(self.tz)
+
+        return codes, labels
+
+    def _aggregate(self, codes: np.ndarray, size: int, rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Suma y promedia las métricas por código con ``np.bincount``"""
+        def take(values):
+            return values if rows is None else values[rows]
+
+        job_count = np.bincount(codes, minlength=size).astype(float)
+        big_tech = np.bincount(codes, weights=np.nan_to_num(take(self._column('is_big_tech', 0.0))), minlength=size)
+
+        result = {'job_count': job_count, 'big_tech_count': big_tech}
+        for name in ('salary_avg', 'tech_keywords_count'):
+            values = take(self._column(name))
+            present = ~np.isnan(values)
+            total = np.bincount(codes[present], weights=values[present], minlength=size)
+            n = np.bincount(codes[present], minlength=size)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[name] = np.where(n > 0, total / np.maximum(n, 1), np.nan)
+
+        return result
+
+    def _group_codes(self, dimension: str) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+        """Códigos de grupo (y filas que participan) para una dimensión"""
+        if dimension == TECH:
+            tech_columns = [col for col in self.df.columns if col.startswith('mentions_')]
+            rows, groups = [], []
+            for i, col in enumerate(tech_columns):
+                mask = self.df[col].fillna(False).astype(bool).to_numpy()[self._positions]
+                hit = np.flatnonzero(mask)
+                rows.append(hit)
+                groups.append(np.full(len(hit), i))
+            names = pd.Index([col.replace('mentions_', '') for col in tech_columns])
+            if not tech_columns:
+                return np.array([], dtype=int), np.array([], dtype=int), names
+            return np.concatenate(rows), np.concatenate(groups), names
+
+        codes, names = pd.factorize(self.df[dimension].to_numpy()[self._positions])
+        rows = np.flatnonzero(codes >= 0)
+        return rows, codes[rows], pd.Index(names)
+
+    def build_frequency(self, freq: str, dimensions: Iterable[Optional[str]]) -> Dict[str, pd.DataFrame]:
+        """Series para una frecuencia y varias dimensiones. Las claves son los nombres de dimensión"""
+        codes, labels = self._bins(freq)
+        n_periods = len(labels)
+        frames = {}
+
+        for dimension in dimensions:
+            dimension = dimension or TOTAL
+
+            if dimension == TOTAL:
+                metrics = self._aggregate(codes, n_periods)
+                frame = pd.DataFrame(metrics, index=labels)
+                frame['job_count'] = frame['job_count'].astype(int)
+                frame['big_tech_percentage'] = frame['big_tech_count'] / frame['job_count'] * 100
+                frame['cumulative_jobs'] = frame['job_count'].cumsum()
+                frames[dimension] = frame.fillna(0)[METRIC_COLUMNS]
+                continue
+
+            if dimension != TECH and dimension not in self.df.columns:
+                logger.warning(f"Dimensión '{dimension}' no encontrada; se omite")
+                continue
+
+            rows, group_codes, names = self._group_codes(dimension)
+            n_groups = max(len(names), 1)
+            combined = codes[rows] * n_groups + group_codes
+            metrics = self._aggregate(combined, n_periods * n_groups, rows)
+
+            # Solo combinaciones (periodo, grupo) con empleos
+            present = np.flatnonzero(metrics['job_count'] > 0)
+            frame = pd.DataFrame({name: values[present] for name, values in metrics.items()})
+            frame.insert(0, dimension, names.take(present % n_groups))
+            frame.insert(0, self.date_column, labels.take(present // n_groups))
+
+            frame = frame.sort_values([dimension, self.date_column], kind='stable')
+            frame['job_count'] = frame['job_count'].astype(int)
+            frame['big_tech_percentage'] = frame['big_tech_count'] / frame['job_count'] * 100
+            frame['cumulative_jobs'] = frame.groupby(dimension, sort=False)['job_count'].cumsum()
+            frames[dimension] = frame.fillna(0).reset_index(drop=True)
+
+        return frames
+
+    def build(self, freqs: Iterable[str] = ('D', 'W'), dimensions: Iterable[Optional[str]] = (TOTAL,),
+              tidy: bool = False) -> Union[Dict[Tuple[str, str], pd.DataFrame], pd.DataFrame]:
+        """Construye todas las combinaciones de frecuencia y dimensión.
+
+        Devuelve un diccionario ``{(freq, dimension): DataFrame}`` o, con ``tidy=True``,
+        una sola tabla larga con columnas ``freq``, ``dimension``, ``group``, fecha y métricas.
+        La dimensión ``'total'`` reproduce ``JobDataProcessor.create_time_series_data`` y
+        ``'tech'`` agrupa por cada columna ``mentions_*``.
+        """
+        freqs = list(freqs)
+        dimensions = list(dimensions)
+        if len(self) == 0:
+            logger.warning("No hay fechas válidas para crear series de tiempo")
+            return pd.DataFrame() if tidy else {}
+
+        result = {}
+        for freq in freqs:
+            for dimension, frame in self.build_frequency(freq, dimensions).items():
+                result[(freq, dimension)] = frame
+
+        logger.info(f"Series de tiempo generadas: {len(result)} combinaciones "
+                    f"({len(freqs)} frecuencias x {len(dimensions)} dimensiones) sobre {len(self)} empleos")
+
+        if not tidy:
+            return result
+        return to_tidy(result, self.date_column)
+
+
+def to_tidy(series: Dict[Tuple[str, str], pd.DataFrame], date_column: str = 'created') -> pd.DataFrame:
+    """Convierte el diccionario de series en una tabla larga"""
+    parts = []
+    for (freq, dimension), frame in series.items():
+        if dimension == TOTAL:
+            part = frame.reset_index()
+            part.insert(1, 'group', TOTAL)
+        else:
+            part = frame.rename(columns={dimension: 'group'})
+        part.insert(0, 'dimension', dimension)
+        part.insert(0, 'freq', freq)
+        parts.append(part[['freq', 'dimension', 'group', date_column] + METRIC_COLUMNS])
+
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
@@ -85,6 +85,66 @@ def check_dependencies():
         print("\n🎉 Todas las dependencias están instaladas")
         return True
 
+# Presupuesto de tiempo de importación para invocaciones cortas del CLI (segundos)
+IMPORT_TIME_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', 1.0))
+# 'stats' sí necesita pandas para leer el CSV, pero nada más pesado
+STATS_TIME_BUDGET = float(os.getenv('STATS_TIME_BUDGET', 1.5))
+HEAVY_MODULES = ['pandas', 'matplotlib', 'seaborn', 'sklearn', 'aiohttp']
+# Módulos que el procesador solo carga en los métodos que los usan
+DEFERRED_MODULES = ['matplotlib', 'seaborn', 'sklearn', 'scipy', 'taxonomy', 'sketches', 'time_series']
+
+def test_import_time():
+    """Verifica que el CLI arranque rápido y no importe dependencias pesadas"""
+    import subprocess
+    import time
+    
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    # Importar main.py no debe cargar pandas, matplotlib, sklearn, etc.
+    code = ("import sys, json; import main; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=project_dir,
+                            capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip().splitlines()[-1]
+    assert loaded == '[]', f"main.py importa módulos pesados al arrancar: {loaded}"
+    
+    # El procesador no debe cargar librerías de visualización, sklearn ni la taxonomía al importarse
+    code = ("import sys, json; sys.path.insert(0, 'src'); import data_processor; "
+            f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=project_dir,
+                            capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip().splitlines()[-1]
+    assert loaded == '[]', f"data_processor importa módulos innecesarios: {loaded}"
+    
+    # Tiempo total de una invocación corta del CLI
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py', '--help'], cwd=project_dir,
+                   capture_output=True, check=True)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  python main.py --help: {elapsed:.2f}s (presupuesto: {IMPORT_TIME_BUDGET:.2f}s)")
+    assert elapsed < IMPORT_TIME_BUDGET, f"El CLI tardó {elapsed:.2f}s en arrancar"
+    
+    # Consulta corta sobre un dataset procesado pequeño
+    import tempfile
+    import pandas as pd
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture = os.path.join(tmp_dir, 'jalisco_bigtech_jobs_processed_fixture.csv')
+        pd.DataFrame({
+            'id': ['1', '2', '3'], 'title': ['Python Developer', 'Data Engineer', 'QA'],
+            'company': ['Google', 'Oracle', 'Startup'], 'location': ['Guadalajara'] * 3,
+            'is_big_tech': [True, True, False], 'salary_min': [40000, None, 20000],
+            'salary_avg': [50000, None, 25000], 'created': ['2024-01-01', '2024-01-02', '2024-01-03'],
+            'experience_level': ['Mid', 'Mid', 'Junior'],
+        }).to_csv(fixture, index=False)
+        
+        start = time.perf_counter()
+        # Desde el directorio temporal para que el log de la ejecución no quede en el proyecto
+        subprocess.run([sys.executable, os.path.join(project_dir, 'main.py'), 'stats', fixture], cwd=tmp_dir,
+                       capture_output=True, check=True)
+        elapsed = time.perf_counter() - start
+    print(f"⏱️  python main.py stats: {elapsed:.2f}s (presupuesto: {STATS_TIME_BUDGET:.2f}s)")
+    assert elapsed < STATS_TIME_BUDGET, f"'main.py stats' tardó {elapsed:.2f}s"
+
 def check_api_config():
     """Verifica la configuración de la API"""
     print("\n🔑 VERIFICANDO CONFIGURACIÓN DE API")
@@ -118,6 +178,15 @@ def main():
     # Verificar configuración API
     api_ok = check_api_config()
     
+    # Verificar tiempo de arranque del CLI
+    print("\n⏱️  VERIFICANDO TIEMPO DE ARRANQUE")
+    print("=" * 35)
+    try:
+        test_import_time()
+        print("✅ Arranque rápido del CLI")
+    except AssertionError as e:
+        print(f"❌ {e}")
+    
     # Si todo está bien, hacer prueba de scraping
     if deps_ok and api_ok:
         print("\n" + "=" * 60)
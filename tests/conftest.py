@@ -0,0 +1,11 @@
+"""
+Configuración de pytest: los módulos de src/ se importan igual que entre ellos (``from config import X``)
+y la caché de la taxonomía se escribe fuera del repositorio
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('TAXONOMY_CACHE_FILE', os.path.join(tempfile.mkdtemp(prefix='taxonomy-cache-'), 'taxonomy_cache.json'))
@@ -0,0 +1,73 @@
+"""
+Pruebas de la caché del API de consultas
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from api_server import DATASET_PREFIX, DatasetStore, JobQueryService
+
+
+def publish(data_dir, name, companies):
+    path = os.path.join(data_dir, f'{DATASET_PREFIX}{name}.csv')
+    pd.DataFrame({
+        'id': [str(i) for i in range(len(companies))],
+        'title': ['Python Developer'] * len(companies),
+        'company': companies,
+        'created': pd.date_range('2024-01-01', periods=len(companies), freq='D'),
+        'mentions_python': [True] * len(companies),
+    }).to_csv(path, index=False)
+    return path
+
+
+def top(service):
+    status, _, body = service.handle('/top', {'field': ['company']})
+    assert status == 200
+    return {row['value']: row['jobs'] for row in json.loads(body)['top']}
+
+
+@pytest.fixture
+def service(tmp_path):
+    publish(str(tmp_path), '20240101_000000', ['Google', 'Google', 'IBM'])
+    # Sin espera entre revisiones del directorio
+    return JobQueryService(DatasetStore(str(tmp_path), check_seconds=0), cache_size=8)
+
+
+def test_repeated_query_is_served_from_cache(service):
+    assert top(service) == {'Google': 2, 'IBM': 1}
+    assert top(service) == {'Google': 2, 'IBM': 1}
+    assert service.cache.stats()['hits'] == 1
+    assert service.metrics.counters['api_cache_misses_total'] == 1
+
+
+def test_new_dataset_invalidates_cache(tmp_path, service):
+    top(service)
+    publish(str(tmp_path), '20240102_000000', ['Oracle'])
+
+    assert top(service) == {'Oracle': 1}
+    assert service.store.metrics.counters['api_dataset_reloads_total'] == 2
+    assert service.cache.stats()['size'] == 1
+
+
+def test_rewritten_dataset_invalidates_cache(tmp_path, service):
+    top(service)
+    path = publish(str(tmp_path), '20240101_000000', ['IBM'])
+    # Mismo archivo, otra fecha de modificación
+    mtime = os.stat(path).st_mtime_ns + 10 ** 9
+    os.utime(path, ns=(mtime, mtime))
+
+    assert top(service) == {'IBM': 1}
+
+
+def test_missing_dataset_and_bad_parameters(tmp_path):
+    service = JobQueryService(DatasetStore(str(tmp_path / 'empty'), check_seconds=0))
+    assert service.handle('/top', {})[0] == 503
+
+    publish(str(tmp_path), '20240101_000000', ['Google'])
+    service = JobQueryService(DatasetStore(str(tmp_path), check_seconds=0))
+    assert service.handle('/top', {'field': ['salary']})[0] == 400
+    assert service.handle('/jobs', {'limit': ['-1']})[0] == 400
+    assert service.handle('/unknown', {})[0] == 404
@@ -0,0 +1,55 @@
+"""
+Pruebas del ciclo de vida de vacantes con crawls parciales
+"""
+
+import pandas as pd
+
+from lifecycle import PostingLifecycle
+
+
+def crawl(ids_by_query, scraped_at):
+    rows = [{'id': job_id, 'search_query': query, 'company': 'Empresa', 'title': 'Dev', 'scraped_at': scraped_at}
+            for query, ids in ids_by_query.items() for job_id in ids]
+    return pd.DataFrame(rows)
+
+
+def test_query_skipped_keeps_posting_open():
+    lifecycle = PostingLifecycle(close_after_misses=1)
+    lifecycle.update_from_dataframe(crawl({'python|guadalajara': ['1', '2'], 'java|zapopan': ['3']},
+                                          '2024-01-01'))
+
+    # El planificador omitió 'java|zapopan': la vacante 3 no se volvió a buscar
+    summary = lifecycle.update_from_dataframe(crawl({'python|guadalajara': ['1', '2']}, '2024-01-02'),
+                                              crawled_queries={'python|guadalajara'})
+
+    table = lifecycle.table.set_index('id')
+    assert summary['closed'] == 0
+    assert summary['unverified'] == 1
+    assert pd.isna(table.loc['3', 'closed_at'])
+    assert table.loc['3', 'missed_crawls'] == 0
+    assert lifecycle.time_to_fill()['closed_postings'] == 0
+
+
+def test_completed_query_closes_missing_posting():
+    lifecycle = PostingLifecycle(close_after_misses=1)
+    lifecycle.update_from_dataframe(crawl({'python|guadalajara': ['1', '2']}, '2024-01-01'))
+
+    summary = lifecycle.update_from_dataframe(crawl({'python|guadalajara': ['1']}, '2024-01-05'),
+                                              crawled_queries={'python|guadalajara'})
+
+    table = lifecycle.table.set_index('id')
+    assert summary['closed'] == 1
+    assert table.loc['2', 'closed_at'] == pd.Timestamp('2024-01-05')
+    assert pd.isna(table.loc['1', 'closed_at'])
+
+
+def test_posting_found_by_another_query_updates_its_origin():
+    lifecycle = PostingLifecycle(close_after_misses=1)
+    lifecycle.update_from_dataframe(crawl({'java|zapopan': ['3']}, '2024-01-01'))
+    lifecycle.update_from_dataframe(crawl({'python|guadalajara': ['3']}, '2024-01-02'),
+                                    crawled_queries={'python|guadalajara'})
+
+    # Desde ahora la vacante depende de la consulta que la encontró por última vez
+    summary = lifecycle.update_from_dataframe(crawl({}, '2024-01-03').reindex(columns=['id', 'scraped_at']),
+                                              crawled_queries={'python|guadalajara'})
+    assert summary['closed'] == 1
@@ -0,0 +1,92 @@
+"""
+Pruebas de la instrumentación del pipeline
+"""
+
+import json
+
+import pytest
+
+from metrics import PipelineMetrics, timed_stage
+
+
+def test_timers_counters_and_gauges():
+    metrics = PipelineMetrics('test')
+    for _ in range(2):
+        with metrics.timer('clean', rows=100):
+            pass
+    metrics.record_time('fetch', 0.5)
+    metrics.increment('requests_total')
+    metrics.increment('requests_total', 2)
+    metrics.set_gauge('overlap_rate', 0.25)
+    metrics.set_gauge('overlap_rate', 0.5)
+
+    report = metrics.report()
+    assert report['stages']['clean']['calls'] == 2
+    assert report['stages']['clean']['rows'] == 200
+    assert report['stages']['fetch'] == {'calls': 1, 'total_seconds': 0.5, 'max_seconds': 0.5}
+    assert report['counters'] == {'requests_total': 3}
+    assert report['gauges'] == {'overlap_rate': 0.5}
+
+
+def test_timer_records_failed_stages():
+    metrics = PipelineMetrics('test')
+    with pytest.raises(RuntimeError):
+        with metrics.timer('load'):
+            raise RuntimeError
+    assert metrics.timers['load']['calls'] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = PipelineMetrics('test')
+    for value in (0.01, 0.2, 0.2, 3.0):
+        metrics.observe('latency', value, buckets=(1.0, 0.1))
+
+    hist = metrics.report()['histograms']['latency']
+    assert hist['buckets'] == [0.1, 1.0]
+    assert hist['counts'] == [1, 3]
+    assert hist['count'] == 4
+    assert hist['sum'] == pytest.approx(3.41)
+
+
+def test_prometheus_export():
+    metrics = PipelineMetrics('api')
+    metrics.record_time('load', 1.5, rows=10)
+    metrics.increment('requests_total', 4)
+    metrics.set_gauge('cache_hit_rate', 0.75)
+    metrics.observe('latency', 0.2, buckets=(0.1, 1.0))
+
+    lines = metrics.to_prometheus().splitlines()
+    assert 'jalisco_stage_seconds_total{run="api",stage="load"} 1.500000' in lines
+    assert 'jalisco_stage_rows_total{run="api",stage="load"} 10' in lines
+    assert '# TYPE jalisco_requests_total counter' in lines
+    assert 'jalisco_requests_total{run="api"} 4' in lines
+    assert '# TYPE jalisco_cache_hit_rate gauge' in lines
+    assert 'jalisco_cache_hit_rate{run="api"} 0.75' in lines
+    assert 'jalisco_latency_bucket{run="api",le="0.1"} 0' in lines
+    assert 'jalisco_latency_bucket{run="api",le="+Inf"} 1' in lines
+    assert 'jalisco_latency_count{run="api"} 1' in lines
+
+
+def test_export_both_formats(tmp_path):
+    metrics = PipelineMetrics('scraper')
+    metrics.increment('pages_total')
+    paths = metrics.export(str(tmp_path), fmt='both', filename='run')
+
+    assert [path.rsplit('.', 1)[1] for path in paths] == ['json', 'prom']
+    with open(paths[0], encoding='utf-8') as f:
+        assert json.load(f)['counters'] == {'pages_total': 1}
+
+
+def test_timed_stage_uses_dataframe_rows():
+    class Processor:
+        def __init__(self):
+            self.metrics = PipelineMetrics('test')
+            self.df = list(range(7))
+
+        @timed_stage('features')
+        def run(self):
+            return 'ok'
+
+    processor = Processor()
+    assert processor.run() == 'ok'
+    assert processor.metrics.report()['stages']['features']['rows'] == 7
@@ -0,0 +1,97 @@
+"""
+Pruebas del planificador adaptativo de consultas
+"""
+
+import pytest
+
+from query_planner import QueryPlanner
+
+
+def make_planner(tmp_path, **kwargs):
+    options = {'min_new_id_rate': 0.3, 'saturation_rate': 0.1, 'min_runs': 2, 'reprobe_every': 0, 'decay': 0.5}
+    options.update(kwargs)
+    return QueryPlanner(stats_file=str(tmp_path / 'query_stats.json'), **options)
+
+
+def run(planner, pages):
+    """Ejecuta el plan; ``pages`` asocia cada ``what`` con la lista de IDs de su página"""
+    queries = planner.plan([(what, 'Jalisco', 1) for what in pages])
+    seen_ids = set()
+    for what, where, _ in queries:
+        planner.record_page(what, where, pages[what], seen_ids)
+    planner.finish_run()
+    return [what for what, _, _ in queries]
+
+
+def ids(prefix, n):
+    return [f'{prefix}-{i}' for i in range(n)]
+
+
+def test_yield_does_not_depend_on_position(tmp_path):
+    shared = ids('shared', 10)
+    first = make_planner(tmp_path / 'a')
+    second = make_planner(tmp_path / 'b')
+    run(first, {'python': shared, 'java': shared})
+    run(second, {'java': shared, 'python': shared})
+
+    # Cada consulta se lleva la mitad de los IDs que comparte, sin importar quién corrió primero
+    for planner in (first, second):
+        assert planner.expected_yield('python', 'Jalisco') == planner.expected_yield('java', 'Jalisco') == 0.5
+        assert planner.expected_new_per_request('java', 'Jalisco') == 5.0
+
+
+def test_plan_orders_by_new_ids_per_request(tmp_path):
+    planner = make_planner(tmp_path)
+    run(planner, {'java': ids('java', 2), 'python': ids('python', 8)})
+
+    assert planner.plan([('java', 'Jalisco', 1), ('python', 'Jalisco', 1), ('rust', 'Jalisco', 1)]) == [
+        ('rust', 'Jalisco', 1), ('python', 'Jalisco', 1), ('java', 'Jalisco', 1),
+    ]
+
+
+def test_redundant_query_is_skipped_after_min_runs(tmp_path):
+    pages = {what: ids('dev', 10) for what in ('python', 'java', 'go', 'rust')}
+    pages['data'] = ids('data', 10)
+    planner = make_planner(tmp_path)
+
+    # Tasa de 0.25 (< 0.3) para las consultas redundantes, pero aún sin suficiente historial
+    assert len(run(planner, pages)) == 5
+    assert planner.expected_yield('python', 'Jalisco') == 0.25
+    assert len(run(planner, pages)) == 5
+    assert run(planner, pages) == ['data']
+
+    # Las estadísticas sobreviven entre ejecuciones
+    assert make_planner(tmp_path).plan([(what, 'Jalisco', 1) for what in pages]) == [('data', 'Jalisco', 1)]
+
+
+def test_reprobe_run_plans_every_query(tmp_path):
+    pages = {'python': ids('dev', 10), 'java': ids('dev', 10), 'go': ids('dev', 10), 'data': ids('data', 10)}
+    planner = make_planner(tmp_path, reprobe_every=3, min_new_id_rate=0.5, min_runs=1)
+    run(planner, pages)
+    assert run(planner, pages) == ['data']
+    assert len(run(planner, pages)) == 4
+
+
+def test_failed_requests_lower_new_ids_per_request(tmp_path):
+    planner = make_planner(tmp_path)
+    planner.plan([('python', 'Jalisco', 2)])
+    planner.record_page('python', 'Jalisco', ids('python', 10), set())
+    planner.record_request('python', 'Jalisco')
+    planner.finish_run()
+
+    assert planner.expected_yield('python', 'Jalisco') == 1.0
+    assert planner.expected_new_per_request('python', 'Jalisco') == 5.0
+
+
+@pytest.mark.parametrize('results, new_ids, saturated', [(0, 0, True), (50, 4, True), (50, 5, False), (10, 10, False)])
+def test_saturation(tmp_path, results, new_ids, saturated):
+    assert make_planner(tmp_path).is_saturated(results, new_ids) is saturated
+
+
+def test_record_page_deduplicates_within_the_run(tmp_path):
+    planner = make_planner(tmp_path)
+    planner.plan([('python', 'Jalisco', 1), ('java', 'Jalisco', 1)])
+    seen_ids = set()
+    assert planner.record_page('python', 'Jalisco', ['1', '2', '3'], seen_ids) == 3
+    assert planner.record_page('java', 'Jalisco', ['2', '3', '4'], seen_ids) == 1
+    assert seen_ids == {'1', '2', '3', '4'}
@@ -0,0 +1,72 @@
+"""
+Pruebas del archivo de respuestas crudas y su reprocesamiento
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from raw_archive import RawPageArchive, read_index, replay_archive
+
+
+def job(job_id, title='Python Developer', location='Guadalajara, Jalisco'):
+    return {
+        'id': job_id, 'title': title, 'description': 'Backend con Python y Docker, trabajo remoto',
+        'company': {'display_name': 'Google'}, 'location': {'display_name': location, 'area': ['México']},
+        'salary_min': 40000, 'salary_max': 60000, 'created': '2024-01-15T10:00:00Z',
+    }
+
+
+def payload(jobs):
+    return json.dumps({'results': jobs, 'count': len(jobs)}).encode('utf-8')
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    archive_dir = str(tmp_path / 'archive')
+    # Segmentos diminutos para que cada página quede en uno distinto
+    with RawPageArchive(archive_dir, segment_max_bytes=1, codec='gzip') as archive:
+        archive.append_page('python', 'Guadalajara', 1, payload([job('1'), job('2')]),
+                            fetched_at='2024-01-20T08:00:00')
+        archive.append_page('python', 'Guadalajara', 2, payload([job('2'), job('3', location='Monterrey')]),
+                            fetched_at='2024-01-21T08:00:00')
+        archive.append_page('java', 'Zapopan', 1, payload([job('4', title='Java Engineer')]),
+                            fetched_at='2024-01-22T08:00:00')
+    return archive_dir
+
+
+def test_read_page_by_offset(archive_dir):
+    archive = RawPageArchive(archive_dir, codec='gzip')
+    entries = archive.read_index()
+    assert len(entries) == 3
+    assert len({entry['segment'] for entry in entries}) == 3
+
+    page = archive.read_page(entries[1])
+    assert page['meta'] == {'what': 'python', 'where': 'Guadalajara', 'page': 2, 'fetched_at': '2024-01-21T08:00:00'}
+    assert [job['id'] for job in page['response']['results']] == ['2', '3']
+    assert read_index(archive_dir, since='2024-01-22') == entries[2:]
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_replay_round_trip(archive_dir, n_jobs):
+    df = replay_archive(archive_dir, n_jobs=n_jobs)
+
+    # Sin duplicados (primera aparición) y solo Jalisco
+    assert df['id'].tolist() == ['1', '2', '4']
+    assert df['scraped_at'].tolist() == list(pd.to_datetime(['2024-01-20T08:00:00'] * 2 + ['2024-01-22T08:00:00']))
+    # Los procesos ya limpiaron y crearon características
+    assert df['is_remote'].all()
+    assert df['mentions_java'].tolist() == [False, False, True]
+    assert set(df['year']) == {2024}
+
+
+def test_replay_without_processing_returns_extracted_rows(archive_dir):
+    df = replay_archive(archive_dir, n_jobs=1, process=False, since='2024-01-21')
+    assert df['id'].tolist() == ['2', '4']
+    assert 'year' not in df.columns
+    assert df['scraped_at'].tolist() == ['2024-01-21T08:00:00', '2024-01-22T08:00:00']
+
+
+def test_replay_of_empty_archive(tmp_path):
+    assert replay_archive(str(tmp_path / 'missing'), n_jobs=1).empty
@@ -0,0 +1,64 @@
+"""
+Pruebas del reporte gráfico sin interfaz
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from reporting import compute_report_data, generate_report
+
+
+@pytest.fixture
+def jobs():
+    rng = np.random.default_rng(5)
+    n = 60
+    remote = rng.random(n) < 0.3
+    return pd.DataFrame({
+        'company': rng.choice(['Google', 'Oracle', 'IBM'], n),
+        'location': rng.choice(['Guadalajara', 'Zapopan'], n),
+        'created': pd.Timestamp('2024-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 60, n), unit='D'),
+        'salary_avg': rng.normal(50000, 10000, n),
+        'latitude': rng.choice([20.67, 20.72], n),
+        'longitude': rng.choice([-103.35, -103.39], n),
+        'is_remote': remote,
+        'is_hybrid': ~remote & (rng.random(n) < 0.5),
+        'mentions_python': rng.random(n) < 0.5,
+        'mentions_cloud': rng.random(n) < 0.3,
+        'mentions_machine_learning': rng.random(n) < 0.2,
+    })
+
+
+def test_report_data(jobs):
+    data = compute_report_data(jobs, n_clusters=3)
+
+    assert set(data) == {'correlation', 'tech_mentions', 'job_type', 'job_map', 'cluster_tech', 'cluster_trends'}
+    assert data['job_type']['counts'].sum() == len(jobs)
+    assert data['job_type']['counts']['remote'] == jobs['is_remote'].sum()
+    assert data['tech_mentions']['counts']['python'] == jobs['mentions_python'].sum()
+    locations = data['job_map']['locations']
+    assert locations['jobs'].sum() == len(jobs)
+    assert not locations.duplicated(['latitude', 'longitude']).any()
+    assert data['cluster_trends']['trends'].to_numpy().sum() == len(jobs)
+
+
+def test_generate_report_headless(tmp_path, jobs):
+    output_dir = str(tmp_path / 'report')
+    index_path = generate_report(jobs, output_dir=output_dir, n_jobs=1)
+
+    charts = sorted(f for f in os.listdir(output_dir) if f.endswith('.png'))
+    assert charts == ['cluster_tech.png', 'cluster_trends.png', 'correlation.png', 'job_map.png',
+                      'job_type.png', 'tech_mentions.png']
+    with open(index_path, encoding='utf-8') as f:
+        page = f.read()
+    assert all(f'src="{chart}"' in page for chart in charts)
+    assert '<td>60</td>' in page
+
+
+def test_report_without_optional_columns(tmp_path):
+    df = pd.DataFrame({'company': ['Google', 'IBM'], 'is_remote': [True, False]})
+    generate_report(df, output_dir=str(tmp_path), n_jobs=1)
+
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith('.png')) == ['job_type.png']
@@ -0,0 +1,77 @@
+"""
+Pruebas de la paginación del scraper contra respuestas simuladas de la API
+"""
+
+import json
+
+import pytest
+
+from config import MAX_RESULTS_PER_PAGE
+from query_planner import QueryPlanner
+from scraper import AdzunaJobScraper
+
+
+class FakeResponse:
+    def __init__(self, results):
+        self.status_code = 200
+        self.headers = {}
+        self.content = json.dumps({'results': results}).encode('utf-8')
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    """Devuelve ``page_sizes[n]`` resultados en la página n + 1 y nada después"""
+
+    def __init__(self, page_sizes):
+        self.page_sizes = page_sizes
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        page = int(url.split('/search/')[1].split('?')[0])
+        self.requested.append(page)
+        size = self.page_sizes[page - 1] if page <= len(self.page_sizes) else 0
+        return FakeResponse([{'id': f'{page}-{i}'} for i in range(size)])
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    scraper = AdzunaJobScraper(planner=QueryPlanner(stats_file=str(tmp_path / 'query_stats.json')))
+    monkeypatch.setattr(scraper, '_rate_limit', lambda: None)
+    return scraper
+
+
+def test_full_last_page_does_not_complete_query(scraper):
+    scraper.session = FakeSession([MAX_RESULTS_PER_PAGE] * 5)
+    jobs = scraper.search_jobs('python', 'Guadalajara', max_pages=2, seen_ids=set())
+
+    # Quedan más páginas: sus vacantes no vistas pueden seguir abiertas
+    assert len(jobs) == 2 * MAX_RESULTS_PER_PAGE
+    assert scraper.session.requested == [1, 2]
+    assert scraper.completed_queries == set()
+
+
+@pytest.mark.parametrize('page_sizes', [[MAX_RESULTS_PER_PAGE, 3], [MAX_RESULTS_PER_PAGE]])
+def test_exhausted_results_complete_query(scraper, page_sizes):
+    scraper.session = FakeSession(page_sizes)
+    scraper.search_jobs('python', 'Guadalajara', max_pages=3, seen_ids=set())
+
+    assert scraper.completed_queries == {QueryPlanner.query_key('python', 'Guadalajara')}
+
+
+def test_unexpected_errors_count_as_requests(scraper):
+    class BrokenSession(FakeSession):
+        def get(self, url, timeout=None):
+            raise ValueError('respuesta inesperada')
+
+    scraper.session = BrokenSession([])
+    assert scraper.search_jobs('python', 'Guadalajara', max_pages=2, seen_ids=set()) == []
+    scraper.planner.finish_run()
+
+    entry = scraper.planner.stats[QueryPlanner.query_key('python', 'Guadalajara')]
+    assert (entry['requests'], entry['results']) == (2, 0)
+    assert scraper.completed_queries == set()
@@ -0,0 +1,76 @@
+"""
+Pruebas del índice LSH de empleos similares
+"""
+
+import numpy as np
+import pytest
+
+from similarity_index import JobSimilarityIndex
+
+
+@pytest.fixture
+def clustered():
+    """Vectores agrupados alrededor de 20 centros, como empleos parecidos entre sí"""
+    rng = np.random.default_rng(7)
+    centers = rng.standard_normal((20, 32)).astype(np.float32)
+    labels = rng.integers(0, 20, 2000)
+    vectors = centers[labels] + 0.2 * rng.standard_normal((2000, 32)).astype(np.float32)
+    return [f'job-{i}' for i in range(2000)], vectors, labels
+
+
+def test_query_id_returns_neighbours_from_the_same_cluster(clustered):
+    ids, vectors, labels = clustered
+    index = JobSimilarityIndex(32, n_tables=8, n_bits=8)
+    assert index.add(ids[:1500], vectors[:1500]) == 1500
+    assert index.add(ids[1000:], vectors[1000:]) == 500  # Los IDs ya indexados se ignoran
+    assert len(index) == 2000
+
+    neighbours = index.query_id('job-3', k=5)
+    assert len(neighbours) == 5
+    assert 'job-3' not in [job_id for job_id, _ in neighbours]
+    assert all(labels[int(job_id.split('-')[1])] == labels[3] for job_id, _ in neighbours)
+    assert [score for _, score in neighbours] == sorted((score for _, score in neighbours), reverse=True)
+
+    with pytest.raises(KeyError):
+        index.query_id('job-unknown')
+
+
+def test_save_load_round_trip(tmp_path, clustered):
+    ids, vectors, _ = clustered
+    index = JobSimilarityIndex(32, n_tables=8, n_bits=8)
+    index.add(ids[:1200], vectors[:1200])
+    path = str(tmp_path / 'similarity_index.npz')
+    index.save(path)
+
+    loaded = JobSimilarityIndex.load(path)
+    assert (loaded.dim, loaded.n_tables, loaded.n_bits, len(loaded)) == (32, 8, 8, 1200)
+    assert loaded.query_id('job-10') == index.query_id('job-10')
+
+    # Tras cargar se sigue insertando de forma incremental
+    loaded.add(ids[1200:], vectors[1200:])
+    index.add(ids[1200:], vectors[1200:])
+    assert loaded.query_id('job-1500') == index.query_id('job-1500')
+
+
+def test_rehash_keeps_jobs_with_new_tables(clustered):
+    ids, vectors, _ = clustered
+    index = JobSimilarityIndex(32, n_tables=4, n_bits=12)
+    index.add(ids, vectors)
+
+    rehashed = index.rehash(16, 6)
+    assert (rehashed.n_tables, rehashed.n_bits, len(rehashed)) == (16, 6, len(index))
+    assert rehashed.evaluate(n_queries=50)['recall_at_k'] >= index.evaluate(n_queries=50)['recall_at_k']
+
+
+def test_load_index_saved_without_tables(tmp_path, clustered):
+    ids, vectors, _ = clustered
+    index = JobSimilarityIndex(32, n_tables=8, n_bits=8)
+    index.add(ids[:500], vectors[:500])
+    path = str(tmp_path / 'similarity_index.npz')
+    np.savez(path, ids=np.asarray(index.ids, dtype=str), vectors=index.vectors,
+             params=np.asarray([index.dim, index.n_tables, index.n_bits, index.seed]))
+
+    # Las tablas se recalculan al cargar; los vectores se renormalizan (diferencias de redondeo)
+    loaded, expected = JobSimilarityIndex.load(path).query_id('job-1'), index.query_id('job-1')
+    assert [job_id for job_id, _ in loaded] == [job_id for job_id, _ in expected]
+    assert np.allclose([score for _, score in loaded], [score for _, score in expected])
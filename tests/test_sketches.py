@@ -0,0 +1,112 @@
+"""
+Pruebas del acumulador de estadísticas en streaming
+"""
+
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sketches import SeenIdSet, SummaryStatsAccumulator
+
+
+def make_jobs(ids):
+    return pd.DataFrame({
+        'id': [str(job_id) for job_id in ids],
+        'company': [f'empresa {job_id % 7}' for job_id in ids],
+        'location': ['Guadalajara'] * len(ids),
+        'is_big_tech': [job_id % 3 == 0 for job_id in ids],
+        'salary_min': [30000.0 + job_id for job_id in ids],
+        'salary_avg': [35000.0 + job_id for job_id in ids],
+        'created': pd.date_range('2024-01-01', periods=len(ids), freq='D'),
+    })
+
+
+def counters(accumulator):
+    return (accumulator.total_jobs, accumulator.big_tech_jobs, accumulator.jobs_with_salary,
+            accumulator.salary_sum, accumulator.salary_count, accumulator.salary.n, accumulator.batches)
+
+
+def test_same_frame_twice_leaves_counters_unchanged(tmp_path):
+    df = make_jobs(range(100))
+    accumulator = SummaryStatsAccumulator().update(df)
+    before = counters(accumulator)
+
+    accumulator.update(df)
+    assert counters(accumulator) == before
+
+    # También entre ejecuciones: el estado guardado recuerda los IDs incorporados
+    path = str(tmp_path / 'stats_sketch.json')
+    accumulator.save(path)
+    reloaded = SummaryStatsAccumulator.load(path).update(df)
+    assert counters(reloaded) == before
+    assert reloaded.to_stats()['total_jobs'] == 100
+
+
+def test_overlapping_batches_count_only_new_postings():
+    accumulator = SummaryStatsAccumulator()
+    accumulator.update(make_jobs(range(0, 60)))
+    accumulator.update(make_jobs(range(40, 100)))
+
+    expected = make_jobs(range(100))
+    assert accumulator.total_jobs == 100
+    assert accumulator.big_tech_jobs == int(expected['is_big_tech'].sum())
+    assert np.isclose(accumulator.salary_sum, expected['salary_avg'].sum())
+
+
+def test_duplicates_within_a_batch_are_counted_once():
+    df = make_jobs([1, 2, 3])
+    accumulator = SummaryStatsAccumulator().update(pd.concat([df, df], ignore_index=True))
+    assert accumulator.total_jobs == 3
+
+
+def test_merge_of_disjoint_accumulators_matches_single_pass():
+    left = SummaryStatsAccumulator().update(make_jobs(range(0, 50)))
+    right = SummaryStatsAccumulator().update(make_jobs(range(50, 100)))
+    single = SummaryStatsAccumulator().update(make_jobs(range(100)))
+
+    merged = left.merge(right)
+    assert counters(merged)[:5] == counters(single)[:5]
+    assert len(merged.seen_ids) == 100
+
+
+def test_merge_refuses_overlapping_accumulators():
+    left = SummaryStatsAccumulator().update(make_jobs(range(0, 60)))
+    right = SummaryStatsAccumulator().update(make_jobs(range(40, 100)))
+    before = counters(left)
+
+    with pytest.raises(ValueError):
+        left.merge(right)
+    assert counters(left) == before
+
+
+def test_seen_ids_are_bounded_by_retention_window():
+    df = make_jobs(range(400))  # Publicados en 400 días consecutivos
+    accumulator = SummaryStatsAccumulator(id_retention_days=30).update(df)
+    assert accumulator.total_jobs == 400
+    assert len(accumulator.seen_ids) == 31
+
+    # Los empleos ya olvidados tampoco se vuelven a contar
+    accumulator.update(df)
+    assert accumulator.total_jobs == 400
+
+
+def test_seen_ids_without_dates_never_expire():
+    seen = SeenIdSet(retention_days=1)
+    assert seen.register(pd.Series(['a', 'b', None])).tolist() == [True, True, True]
+    assert seen.register(pd.Series(['a', 'c'])).tolist() == [False, True]
+    assert len(seen) == 3
+
+
+def test_loads_state_saved_with_hashes_only(tmp_path):
+    df = make_jobs(range(10))
+    state = SummaryStatsAccumulator().update(df).to_dict()
+    hashes = pd.util.hash_array(df['id'].to_numpy(dtype=object))
+    state['seen_ids'] = base64.b64encode(np.sort(hashes).tobytes()).decode('ascii')
+    path = tmp_path / 'stats_sketch.json'
+    path.write_text(json.dumps(state))
+
+    accumulator = SummaryStatsAccumulator.load(str(path)).update(df)
+    assert accumulator.total_jobs == 10
@@ -0,0 +1,65 @@
+"""
+Pruebas de la taxonomía de habilidades y puestos
+"""
+
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from taxonomy import SkillTaxonomy, _compile_source
+
+
+@pytest.fixture(scope='module')
+def taxonomy():
+    return SkillTaxonomy.load(cache_file=None)
+
+
+def names(taxonomy, text):
+    return taxonomy.names(taxonomy.match(text.lower()))
+
+
+def test_role_alias_also_matches_nested_skill(taxonomy):
+    assert names(taxonomy, 'Senior Python Developer') == ['python', 'python developer']
+    assert names(taxonomy, 'python-developer remoto') == ['python', 'python developer']
+
+
+def test_short_and_spaced_aliases(taxonomy):
+    assert names(taxonomy, 'JS and React') == ['javascript', 'react']
+    assert 'node.js' in names(taxonomy, 'Experiencia con Node JS')
+    assert 'node.js' in names(taxonomy, 'experiencia con nodejs')
+    # "js" no es un alias suelto dentro de otra palabra
+    assert names(taxonomy, 'jsonschema') == []
+
+
+def test_match_series_agrees_with_match(taxonomy):
+    texts = pd.Series(['Python Developer', None, 'JS and React', 'Node JS backend'])
+    matches = taxonomy.match_series(texts)
+    for row, text in enumerate(texts):
+        expected = taxonomy.match((text or '').lower())
+        assert matches.loc[matches['row'] == row, 'skill_id'].tolist() == expected
+
+
+def test_cache_round_trip(tmp_path, taxonomy):
+    cache_file = str(tmp_path / 'taxonomy_cache.json')
+    built = SkillTaxonomy.load(cache_file=cache_file)
+    cached = SkillTaxonomy.load(cache_file=cache_file)
+    assert cached.aliases == built.aliases == taxonomy.aliases
+    assert cached.match('desarrollador node.js') == built.match('desarrollador node.js')
+
+
+def test_duplicate_alias_is_rejected():
+    source = {'entries': [{'id': 1, 'name': 'go', 'kind': 'skill'},
+                          {'id': 2, 'name': 'golang', 'kind': 'skill', 'aliases': ['go']}]}
+    with pytest.raises(ValueError):
+        _compile_source(source)
+
+
+def test_compile_scales_with_many_aliases():
+    entries = [{'id': i, 'name': f'skill{i}', 'kind': 'skill', 'aliases': [f'skill{i} dev', f'tool {i}']}
+               for i in range(1, 2001)]
+    start = time.perf_counter()
+    compiled = _compile_source(json.loads(json.dumps({'entries': entries})))
+    assert time.perf_counter() - start < 5
+    assert compiled['aliases']['skill7 dev'] == [7]
@@ -0,0 +1,49 @@
+"""
+Pruebas de las características de texto por hashing con IDF en streaming
+"""
+
+import numpy as np
+import pandas as pd
+
+from text_features import HashedTextFeatures
+
+
+def make_texts(ids):
+    return pd.DataFrame({
+        'id': [str(job_id) for job_id in ids],
+        'text': [f'python developer {job_id % 5} guadalajara' for job_id in ids],
+        'created': pd.date_range('2024-01-01', periods=len(ids), freq='D'),
+    })
+
+
+def fit(vectorizer, df):
+    return vectorizer.transform(df['text'], ids=df['id'], created=df['created'])
+
+
+def test_reprocessed_jobs_do_not_update_document_frequency(tmp_path):
+    df = make_texts(range(50))
+    vectorizer = HashedTextFeatures(n_features=2 ** 12, use_idf=True, n_jobs=1)
+    first = fit(vectorizer, df)
+    document_frequency = vectorizer.document_frequency.copy()
+
+    second = fit(vectorizer, df)
+    assert vectorizer.document_count == 50
+    assert np.array_equal(vectorizer.document_frequency, document_frequency)
+    assert np.allclose(first.toarray(), second.toarray())
+
+    # Entre ejecuciones, a través del archivo de IDF
+    path = str(tmp_path / 'text_idf_stats.npz')
+    vectorizer.save_idf(path)
+    reloaded = HashedTextFeatures(n_features=2 ** 12, use_idf=True, n_jobs=1).load_idf(path)
+    fit(reloaded, make_texts(range(25, 75)))
+    assert reloaded.document_count == 75
+
+
+def test_idf_matches_single_pass_over_unique_jobs():
+    streamed = HashedTextFeatures(n_features=2 ** 12, use_idf=True, n_jobs=1)
+    fit(streamed, make_texts(range(0, 30)))
+    fit(streamed, make_texts(range(20, 60)))
+
+    single = HashedTextFeatures(n_features=2 ** 12, use_idf=True, n_jobs=1)
+    fit(single, make_texts(range(60)))
+    assert np.array_equal(streamed.idf, single.idf)
@@ -0,0 +1,64 @@
+"""
+Pruebas de las series de tiempo en una sola pasada contra ``resample``
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series import TOTAL, TimeSeriesBuilder, period_frequency
+
+FREQUENCIES = ['D', 'W', 'ME', 'M', 'MS', 'QE', 'Q', 'QS', 'YE', 'Y', 'YS']
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    rng = np.random.default_rng(3)
+    n = 3000
+    created = pd.Timestamp('2022-11-03') + pd.to_timedelta(rng.integers(0, 500 * 24, n), unit='h')
+    salary = rng.normal(50000, 10000, n)
+    salary[rng.random(n) < 0.3] = np.nan
+    return pd.DataFrame({
+        'created': created,
+        'is_big_tech': rng.random(n) < 0.4,
+        'salary_avg': salary,
+        'tech_keywords_count': rng.integers(0, 6, n),
+        'company': rng.choice(['Google', 'Oracle', 'IBM'], n),
+    })
+
+
+def resampled(df, freq):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)  # 'M', 'Q' y 'Y' están obsoletos en resample
+        return df.set_index('created').resample(freq).agg({
+            'is_big_tech': 'sum', 'salary_avg': 'mean', 'tech_keywords_count': 'mean', 'company': 'count',
+        })
+
+
+@pytest.mark.parametrize('freq', FREQUENCIES)
+def test_totals_match_resample(jobs, freq):
+    series = TimeSeriesBuilder(jobs).build([freq], [TOTAL])[(freq, TOTAL)]
+    expected = resampled(jobs, freq)
+
+    assert series.index.equals(expected.index.rename('created'))
+    assert series['job_count'].tolist() == expected['company'].tolist()
+    assert series['big_tech_count'].tolist() == expected['is_big_tech'].tolist()
+    assert np.allclose(series['salary_avg'], expected['salary_avg'].fillna(0))
+    assert np.allclose(series['tech_keywords_count'], expected['tech_keywords_count'].fillna(0))
+    assert series['cumulative_jobs'].iloc[-1] == len(jobs)
+
+
+@pytest.mark.parametrize('freq', ['MS', 'W'])
+def test_dimension_breakdown_matches_groupby(jobs, freq):
+    frame = TimeSeriesBuilder(jobs).build([freq], ['company'])[(freq, 'company')]
+    expected = jobs.groupby(['company', pd.Grouper(key='created', freq=freq)]).size()
+    expected = expected[expected > 0]
+
+    assert frame.set_index(['company', 'created'])['job_count'].to_dict() == expected.to_dict()
+
+
+def test_unsupported_frequency_is_a_clear_error():
+    with pytest.raises(ValueError, match="BMS"):
+        period_frequency('BMS')